@@ -11,6 +11,10 @@ a = Analysis(
         'project_creator',
         'project_creator.config',
         'project_creator.templates',
+        'project_creator.templates.react',
+        'project_creator.templates.django',
+        'project_creator.templates.python',
+        'project_creator.templates.fullstack',
         'project_creator.generators',
         'project_creator.utils',
         'yaml',
@@ -26,7 +30,7 @@ a = Analysis(
         'matplotlib', 'numpy', 'pandas', 'scipy', 'PIL.ImageQt', 'PyQt5', 'PyQt6', 'PySide2', 'PySide6',
         'IPython', 'jupyter', 'notebook', 'qtpy', 'wx', 'pytest', 'unittest', 'doctest',
         'email', 'html', 'http', 'urllib3', 'requests', 'urllib', 'xml', 'xmlrpc',
-        'multiprocessing', 'concurrent', 'asyncio', 'threading', 'queue',
+        'multiprocessing', 'asyncio',
         'sqlite3', 'dbm', 'pickle', 'shelve', 'marshal',
         'distutils', 'setuptools', 'pkg_resources', 'pkg_resources._vendor',
         'pydoc', 'doctest', 'test', 'tests', 'testing',
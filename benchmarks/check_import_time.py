@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for CLI and GUI startup
+
+Runs each entry point under `python -X importtime`, sums the import time and
+fails when it exceeds its budget or when modules that should load lazily
+show up during startup.
+"""
+from pathlib import Path
+from typing import Dict, List, Tuple
+import subprocess
+import sys
+
+import click
+
+ROOT = Path(__file__).parent.parent
+
+# Modules only the creation pipeline needs
+PIPELINE_MODULES = [
+    'yaml',
+    'project_creator.main',
+    'project_creator.batch',
+    'project_creator.generators',
+    'project_creator.templates.react',
+    'project_creator.templates.django',
+    'project_creator.templates.python',
+    'project_creator.templates.fullstack',
+]
+
+# name -> (code, default budget in ms, modules that must not be imported)
+ENTRY_POINTS: Dict[str, Tuple[str, float, List[str]]] = {
+    'cli --help': (
+        "import sys; sys.argv = ['create-project', '--help']\n"
+        "from project_creator.cli import cli\n"
+        "try:\n    cli()\nexcept SystemExit:\n    pass",
+        150.0, PIPELINE_MODULES),
+    'cli validation error': (
+        "import sys; sys.argv = ['create-project', 'create', '1-invalid-name']\n"
+        "from project_creator.cli import cli\n"
+        "try:\n    cli()\nexcept SystemExit:\n    pass",
+        150.0, PIPELINE_MODULES),
+    'gui window': (
+        "import project_creator.gui",
+        250.0, [module for module in PIPELINE_MODULES if module != 'yaml'] + ['project_creator.gui_worker']),
+    'gui light window': (
+        "import project_creator.gui_light",
+        200.0, PIPELINE_MODULES + ['project_creator.gui_worker']),
+}
+
+def measure(code: str) -> Tuple[float, Dict[str, float]]:
+    """Run code under -X importtime, returning total ms and cumulative ms per module"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=ROOT, capture_output=True, text=True)
+    total_us = 0
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        modules[name.strip()] = int(cumulative_us) / 1000
+    if result.returncode:
+        raise click.ClickException(f"Entry point failed:\n{result.stderr[-2000:]}")
+    return total_us / 1000, modules
+
+@click.command()
+@click.option('--runs', '-n', default=5, show_default=True,
+              help='Measurements per entry point; the fastest one counts')
+@click.option('--scale', default=1.0, show_default=True,
+              help='Multiply every budget, e.g. 2.0 on slow CI hosts')
+def main(runs, scale):
+    """Check CLI and GUI startup against import-time budgets"""
+    failures = []
+    for name, (code, budget, forbidden) in ENTRY_POINTS.items():
+        if name.startswith('gui'):
+            try:
+                import tkinter  # noqa: F401
+            except ImportError:
+                click.echo(f"  {name:<22} skipped (no tkinter)")
+                continue
+        
+        measurements = [measure(code) for _ in range(runs)]
+        total, modules = min(measurements, key=lambda measurement: measurement[0])
+        limit = budget * scale
+        loaded = [module for module in forbidden
+                  if any(m == module or m.startswith(module + '.') for m in modules)]
+        
+        status = "ok"
+        if total > limit:
+            status = "over budget"
+            failures.append(f"{name}: {total:.1f}ms > {limit:.1f}ms")
+        if loaded:
+            status = "eager imports"
+            failures.append(f"{name}: imports {', '.join(loaded)} at startup")
+        click.echo(f"  {name:<22} {total:7.1f}ms / {limit:7.1f}ms  {status}")
+    
+    if failures:
+        click.echo("\n❌ Import-time budget exceeded:", err=True)
+        for failure in failures:
+            click.echo(f"  {failure}", err=True)
+        sys.exit(1)
+    click.echo("\n✅ Startup within budget")
+
+if __name__ == "__main__":
+    main()
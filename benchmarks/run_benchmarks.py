@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmarks for every registered template
+
+Runs ProjectCreator.create_project repeatedly per template, against local
+stand-in tools by default (or the real ones with --real-tools), reports
+per-step and total timings and compares them with stored baselines.
+"""
+from contextlib import redirect_stdout
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Optional, Tuple
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+
+import click
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from project_creator.config.simple_settings import SimpleConfig
+from project_creator.main import ProjectCreator
+from project_creator.templates import _TEMPLATES
+from project_creator.utils.tracing import Tracer
+from benchmarks.stand_ins import TOOLS, create_stand_ins, set_latencies
+
+DEFAULT_BASELINES = Path(__file__).parent / "baselines.json"
+
+def parse_latencies(specs: List[str], default: float) -> Dict[str, float]:
+    """Parse tool=seconds pairs on top of a default latency"""
+    latencies = {tool: default for tool in TOOLS}
+    for spec in specs:
+        tool, _, seconds = spec.partition('=')
+        if tool not in latencies or not seconds:
+            raise click.BadParameter(f"Expected one of {', '.join(TOOLS)} as tool=seconds, got '{spec}'")
+        latencies[tool] = float(seconds)
+    return latencies
+
+def write_config(workdir: Path, tool_paths: Optional[Dict[str, str]], warm_cache: bool, run_id: str,
+                 installers: Dict[str, str]) -> SimpleConfig:
+    """Write an isolated configuration for one run"""
+    cache_dir = workdir / "cache" if warm_cache else workdir / f"cache-{run_id}"
+    settings = {
+        'default_project_path': str(workdir / "projects"),
+        'cache_dir': str(cache_dir),
+        'logging_level': 'WARNING',
+        'tool_paths': tool_paths or {},
+        **installers
+    }
+    config_path = workdir / f"config-{run_id}.json"
+    config_path.write_text(json.dumps(settings, indent=2))
+    return SimpleConfig(config_path)
+
+def run_once(template: str, workdir: Path, config: SimpleConfig, run: int) -> Tuple[Dict[str, float], List[str]]:
+    """Create one project and return per-step and total wall times plus the installers used"""
+    project_path = workdir / "projects" / f"{template}-{run}"
+    shutil.rmtree(project_path, ignore_errors=True)
+    
+    tracer = Tracer()
+    creator = ProjectCreator(config, output_callback=lambda line: None, tracer=tracer)
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        creator.create_project(name=f"{template}-{run}", project_type=template, path=project_path)
+    total = time.perf_counter() - start
+    
+    spans = sorted(tracer.spans, key=lambda span: span.start_ns)
+    timings = {span.name: span.wall_time for span in spans if span.category == "task"}
+    timings['total'] = total
+    installers = sorted({span.args['installer'] for span in spans if span.category == "install"})
+    shutil.rmtree(project_path, ignore_errors=True)
+    return timings, installers
+
+def summarize(runs: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Reduce repeated runs to min/median/max per step"""
+    steps = {}
+    for timings in runs:
+        for step, seconds in timings.items():
+            steps.setdefault(step, []).append(seconds)
+    return {step: {'min': min(values), 'median': median(values), 'max': max(values)}
+            for step, values in steps.items()}
+
+def print_report(template: str, summary: Dict[str, Dict[str, float]], baseline: Optional[dict],
+                 installers: List[str]) -> None:
+    """Print one template's timings"""
+    click.echo(f"\n{template}" + (f"  (installers: {', '.join(installers)})" if installers else ""))
+    for step, stats in summary.items():
+        line = f"  {step:<12} median {stats['median']:8.3f}s  min {stats['min']:8.3f}s  max {stats['max']:8.3f}s"
+        if baseline and step in baseline:
+            reference = baseline[step]
+            change = (stats['median'] - reference) / reference * 100 if reference else 0.0
+            line += f"  baseline {reference:8.3f}s ({change:+.1f}%)"
+        click.echo(line)
+
+@click.command()
+@click.option('--template', '-t', 'templates', multiple=True,
+              help='Template to benchmark (default: all registered templates)')
+@click.option('--runs', '-n', default=5, show_default=True, help='Repetitions per template')
+@click.option('--latency', 'latency_specs', multiple=True,
+              help='Stand-in latency as tool=seconds (tools: python, pip, uv, npm, pnpm, yarn, git)')
+@click.option('--default-latency', default=0.05, show_default=True,
+              help='Latency for stand-ins without an explicit --latency')
+@click.option('--real-tools', is_flag=True, help='Use the real python/pip/npm/git instead of stand-ins')
+@click.option('--python-installer', type=click.Choice(['auto', 'pip', 'uv']), default='pip', show_default=True,
+              help='Python installer backend')
+@click.option('--node-installer', type=click.Choice(['auto', 'npm', 'pnpm', 'yarn']), default='npm',
+              show_default=True, help='Node.js installer backend')
+@click.option('--warm-cache', is_flag=True, help='Share caches between runs instead of starting cold')
+@click.option('--workdir', type=click.Path(file_okay=False),
+              default=str(Path.home() / ".create_project" / "bench"), show_default=True,
+              help='Directory to create the scratch directory for generated projects and caches in')
+@click.option('--baselines', 'baselines_file', type=click.Path(dir_okay=False),
+              default=str(DEFAULT_BASELINES), show_default=True, help='Baseline file')
+@click.option('--save-baseline', is_flag=True, help='Store this run as the new baseline')
+@click.option('--threshold', default=0.25, show_default=True,
+              help='Allowed relative slowdown of the median total before failing')
+@click.option('--min-delta', default=0.05, show_default=True,
+              help='Ignore regressions smaller than this many seconds')
+def main(templates, runs, latency_specs, default_latency, real_tools, python_installer, node_installer,
+         warm_cache, workdir, baselines_file, save_baseline, threshold, min_delta):
+    """Benchmark project creation for every template"""
+    # Only ever delete a directory the benchmark created itself, never --workdir
+    root = Path(workdir).expanduser()
+    root.mkdir(parents=True, exist_ok=True)
+    workdir = Path(tempfile.mkdtemp(prefix="run-", dir=root))
+    
+    mode = "real" if real_tools else "stand-in"
+    tool_paths = None
+    if not real_tools:
+        tool_paths = create_stand_ins(workdir / "bin")
+        set_latencies(parse_latencies(latency_specs, default_latency))
+    
+    baselines_path = Path(baselines_file)
+    baselines = json.loads(baselines_path.read_text()) if baselines_path.exists() else {}
+    mode_baselines = baselines.get(mode, {})
+    
+    installers = {'python_installer': python_installer, 'preferred_package_manager': node_installer}
+    results = {}
+    regressions = []
+    for template in templates or list(_TEMPLATES):
+        measured = []
+        used = set()
+        for run in range(runs):
+            config = write_config(workdir, tool_paths, warm_cache, f"{template}-{run}", installers)
+            timings, run_installers = run_once(template, workdir, config, run)
+            measured.append(timings)
+            used.update(run_installers)
+        summary = summarize(measured)
+        baseline = mode_baselines.get(template)
+        print_report(template, summary, baseline, sorted(used))
+        
+        results[template] = {step: stats['median'] for step, stats in summary.items()}
+        if baseline and 'total' in baseline:
+            allowed = baseline['total'] * (1 + threshold)
+            current = summary['total']['median']
+            if current > allowed and current - baseline['total'] > min_delta:
+                regressions.append(f"{template}: {current:.3f}s vs baseline {baseline['total']:.3f}s")
+    
+    shutil.rmtree(workdir, ignore_errors=True)
+    
+    if save_baseline:
+        baselines[mode] = dict(mode_baselines, **results)
+        baselines_path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        click.echo(f"\nBaseline saved to {baselines_path}")
+    
+    if regressions:
+        click.echo("\n❌ Regressions beyond threshold:", err=True)
+        for regression in regressions:
+            click.echo(f"  {regression}", err=True)
+        sys.exit(1)
+    click.echo("\n✅ No regressions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Local stand-in executables for hermetic benchmarks
+
+Each stand-in sleeps for BENCH_LATENCY_<TOOL> seconds and leaves behind
+the same kind of files the real tool would, without touching the network.
+"""
+from pathlib import Path
+from typing import Dict
+import os
+import stat
+import sys
+
+TOOLS = ['python', 'pip', 'uv', 'npm', 'pnpm', 'yarn', 'git']
+
+_PRELUDE = '''#!{python}
+import os, sys, time
+from pathlib import Path
+time.sleep(float(os.environ.get("BENCH_LATENCY_{tool}", "0")))
+args = sys.argv[1:]
+'''
+
+_BODIES = {
+    'python': '''
+if args[:2] == ["-m", "venv"]:
+    venv = Path(args[2])
+    (venv / "bin").mkdir(parents=True, exist_ok=True)
+    (venv / "pyvenv.cfg").write_text("home = /stand-in\\ncommand = stand-in -m venv " + str(venv.resolve()) + "\\n")
+''',
+    'pip': '''
+if args and args[0] == "install" and "--report" in args:
+    import hashlib, json
+    names = Path(args[args.index("-r") + 1]).read_text().split()
+    report = {"install": [{
+        "metadata": {"name": name, "version": "1.0"},
+        "download_info": {"archive_info": {"hashes": {"sha256": hashlib.sha256(name.encode()).hexdigest()}}}
+    } for name in names]}
+    Path(args[args.index("--report") + 1]).write_text(json.dumps(report))
+elif args and args[0] == "install":
+    Path("venv/lib/site-packages").mkdir(parents=True, exist_ok=True)
+''',
+    'uv': '''
+if args[:2] == ["pip", "install"]:
+    Path("venv/lib/site-packages").mkdir(parents=True, exist_ok=True)
+''',
+    'npm': '''
+if args and args[0] in ("install", "ci"):
+    Path("node_modules/.package-lock.json").parent.mkdir(exist_ok=True)
+    Path("node_modules/.package-lock.json").write_text("{}")
+    if not Path("package-lock.json").exists():
+        Path("package-lock.json").write_text('{"lockfileVersion": 3}')
+''',
+    'pnpm': '''
+if args and args[0] == "import":
+    Path("pnpm-lock.yaml").write_text("lockfileVersion: '9.0'\\n")
+elif args and args[0] == "install":
+    Path("node_modules/.modules.yaml").parent.mkdir(exist_ok=True)
+    Path("node_modules/.modules.yaml").write_text("nodeLinker: hoisted\\n")
+    if not Path("pnpm-lock.yaml").exists():
+        Path("pnpm-lock.yaml").write_text("lockfileVersion: '9.0'\\n")
+''',
+    'yarn': '''
+if args == ["--version"]:
+    print("1.22.22")
+elif args and args[0] == "import":
+    Path("yarn.lock").write_text("# yarn lockfile v1\\n")
+elif args and args[0] == "install":
+    Path("node_modules/.yarn-integrity").parent.mkdir(exist_ok=True)
+    Path("node_modules/.yarn-integrity").write_text("{}")
+    if not Path("yarn.lock").exists():
+        Path("yarn.lock").write_text("# yarn lockfile v1\\n")
+''',
+    'git': '''
+if args and args[0] == "init":
+    Path(".git/objects").mkdir(parents=True, exist_ok=True)
+    Path(".git/HEAD").write_text("ref: refs/heads/master\\n")
+elif args[:2] == ["status", "--porcelain"]:
+    print("?? README.md")
+''',
+}
+
+def create_stand_ins(bin_dir: Path) -> Dict[str, str]:
+    """Write stand-in executables, returning a tool_paths mapping"""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    tool_paths = {}
+    for tool in TOOLS:
+        path = bin_dir / tool
+        path.write_text(_PRELUDE.format(python=sys.executable, tool=tool.upper()) + _BODIES[tool])
+        path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        tool_paths[tool] = str(path)
+    return tool_paths
+
+def set_latencies(latencies: Dict[str, float]) -> None:
+    """Export per-tool latencies for the stand-ins"""
+    for tool, seconds in latencies.items():
+        os.environ[f"BENCH_LATENCY_{tool.upper()}"] = str(seconds)
@@ -2,7 +2,7 @@
 """
 Project Creator - CLI entry point
 """
-from project_creator.cli import create_project
+from project_creator.cli import cli
 
 if __name__ == "__main__":
-    create_project()
\ No newline at end of file
+    cli()
\ No newline at end of file
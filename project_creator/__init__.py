@@ -5,7 +5,14 @@ Project Creator - Automatisk projekt setup med AI-konfiguration
 __version__ = "1.0.0"
 __author__ = "Your Name"
 
-from .main import ProjectCreator
-from .templates import get_template, list_templates
-
 __all__ = ["ProjectCreator", "get_template", "list_templates"]
+
+def __getattr__(name):
+    """Import the public API on first use to keep CLI and GUI startup fast"""
+    if name == "ProjectCreator":
+        from .main import ProjectCreator
+        return ProjectCreator
+    if name in ("get_template", "list_templates"):
+        from . import templates
+        return getattr(templates, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,116 @@
+"""
+Batch creation of many projects from a manifest
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import os
+import time
+
+import yaml
+
+from .config.settings import Config
+from .main import ProjectCreator
+from .templates import get_template, list_templates
+from .utils.exceptions import ValidationError
+
+_DEFAULT_SPEC = {
+    'type': 'python',
+    'install_deps': True,
+    'init_git': True,
+    'force': False
+}
+
+# Per-worker state, loaded once by _init_worker and reused for every project
+_worker_config: Optional[Config] = None
+
+def load_manifest(manifest_path: Path, config: Config) -> List[Dict[str, Any]]:
+    """Load project specs from a batch manifest, applying defaults"""
+    with open(manifest_path) as f:
+        manifest = yaml.safe_load(f) or {}
+    
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('projects'), list):
+        raise ValidationError(f"Manifest '{manifest_path}' must contain a 'projects' list")
+    
+    defaults = dict(_DEFAULT_SPEC)
+    defaults['path'] = config.get('default_project_path')
+    defaults.update(manifest.get('defaults') or {})
+    
+    specs = []
+    for entry in manifest['projects']:
+        if isinstance(entry, str):
+            entry = {'name': entry}
+        if not isinstance(entry, dict) or not entry.get('name'):
+            raise ValidationError(f"Invalid project entry in manifest: {entry!r}")
+        
+        spec = dict(defaults)
+        spec.update(entry)
+        base_path = Path(str(spec['path'])).expanduser()
+        if not base_path.is_absolute():
+            base_path = manifest_path.parent.resolve() / base_path
+        spec['path'] = str(base_path / spec['name'])
+        specs.append(spec)
+    
+    return specs
+
+def run_batch(specs: List[Dict[str, Any]],
+              config_path: Optional[Path] = None,
+              max_workers: Optional[int] = None,
+              on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    """Create all projects on a process pool, continuing past failures"""
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(specs) or 1))
+    
+    # Warm templates in the parent so forked workers inherit them
+    _load_templates()
+    
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(config_path,)) as pool:
+        futures = [pool.submit(_create_one, spec) for spec in specs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+    
+    order = {spec['name']: index for index, spec in enumerate(specs)}
+    results.sort(key=lambda result: order[result['name']])
+    return results
+
+def _load_templates() -> None:
+    """Import every registered template and precompute its artifacts"""
+    for name in list_templates():
+        get_template(name).artifacts
+
+def _init_worker(config_path: Optional[Path]) -> None:
+    """Load configuration and templates once per worker process"""
+    global _worker_config
+    _worker_config = Config(config_path)
+    _load_templates()
+
+def _create_one(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Create a single project, capturing failure instead of raising"""
+    result = {
+        'name': spec['name'],
+        'type': spec['type'],
+        'path': spec['path'],
+        'ok': False,
+        'error': None
+    }
+    
+    start = time.perf_counter()
+    try:
+        creator = ProjectCreator(_worker_config)
+        creator.create_project(
+            name=spec['name'],
+            project_type=spec['type'],
+            path=Path(spec['path']),
+            install_deps=bool(spec['install_deps']),
+            init_git=bool(spec['init_git']),
+            force=bool(spec['force'])
+        )
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+    result['seconds'] = time.perf_counter() - start
+    return result
@@ -0,0 +1,66 @@
+"""
+Local caches shared between project creations
+"""
+from pathlib import Path
+from typing import Any, Optional
+import json
+import os
+import time
+
+from .locking import FileLock
+
+STATS_FILE = "stats.json"
+
+def get_cache_root(config: Any) -> Path:
+    """Get the cache root directory from configuration"""
+    cache_dir = config.get('cache_dir') or Path.home() / ".create_project" / "cache"
+    return Path(cache_dir).expanduser()
+
+def mark_used(path: Path) -> None:
+    """Set an entry's access time to now; LRU eviction orders entries by it"""
+    try:
+        os.utime(path, (time.time(), path.stat().st_mtime))
+    except OSError:
+        pass
+
+def record_access(root: Path, cache: str, entry: Optional[Path], saved: int = 0) -> None:
+    """Count a hit (entry given, saving that many bytes of work) or a miss for a cache"""
+    if entry is not None:
+        mark_used(entry)
+    try:
+        with FileLock(root / "stats.lock"):
+            stats = load_stats(root)
+            counts = stats.setdefault(cache, {'hits': 0, 'misses': 0, 'bytes_saved': 0})
+            counts['hits' if entry is not None else 'misses'] += 1
+            counts['bytes_saved'] += saved if entry is not None else 0
+            tmp_file = root / f".tmp-{STATS_FILE}-{os.getpid()}"
+            with open(tmp_file, 'w') as f:
+                json.dump(stats, f, indent=2)
+            tmp_file.replace(root / STATS_FILE)
+    except OSError:
+        # Statistics never fail a creation
+        pass
+
+def load_stats(root: Path) -> dict:
+    """Load hit, miss and bytes saved counters per cache"""
+    try:
+        with open(root / STATS_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def tree_size(path: Path) -> int:
+    """Get the bytes in the files under a directory, or of a single file"""
+    if not path.is_dir():
+        try:
+            return path.lstat().st_size
+        except OSError:
+            return 0
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
@@ -0,0 +1,113 @@
+"""
+Read-only base environments that project venvs layer on top of
+"""
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+import hashlib
+import json
+import os
+import platform
+import shutil
+import stat
+import sys
+import sysconfig
+import time
+
+from . import record_access, tree_size
+from .locking import FileLock
+
+class BaseEnvironments:
+    """Install each package set once into a shared venv and expose it to project venvs through a .pth file"""
+    
+    METADATA_FILE = "base.json"
+    PTH_FILE = "_create_project_base.pth"
+    MAX_SCRIPT_SIZE = 1024 * 1024
+    
+    def __init__(self, root: Path):
+        # Absolute, since project venvs point at it
+        self.root = (root / "base-envs").absolute()
+    
+    def get_key(self, packages: Iterable[str]) -> str:
+        """Get key for interpreter version plus package set"""
+        identity = {
+            'python': sys.version,
+            'executable': os.path.realpath(sys.executable),
+            'platform': f"{sys.platform}-{platform.machine()}",
+            'packages': sorted(set(packages))
+        }
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:32]
+    
+    def lookup(self, packages: Iterable[str]) -> Optional[Path]:
+        """Get the base venv for a package set if it has been built"""
+        entry = self.root / self.get_key(packages)
+        intact = (entry / self.METADATA_FILE).exists() and (entry / "venv" / "pyvenv.cfg").exists()
+        record_access(self.root.parent, "base-envs", entry / self.METADATA_FILE if intact else None,
+                      self._size(entry))
+        return entry / "venv" if intact else None
+    
+    def ensure(self, packages: Iterable[str], build: Callable[[Path], None]) -> Path:
+        """Get the base venv for a package set, building it once with build(entry) if missing"""
+        packages = sorted(set(packages))
+        entry = self.root / self.get_key(packages)
+        with FileLock(self.root / f"{entry.name}.lock"):
+            if not ((entry / self.METADATA_FILE).exists() and (entry / "venv" / "pyvenv.cfg").exists()):
+                # Built in place: venv scripts and pyvenv.cfg hold absolute paths
+                shutil.rmtree(entry, ignore_errors=True)
+                entry.mkdir(parents=True)
+                try:
+                    build(entry)
+                    self._make_read_only(entry / "venv")
+                except BaseException:
+                    shutil.rmtree(entry, ignore_errors=True)
+                    raise
+                with open(entry / self.METADATA_FILE, 'w') as f:
+                    json.dump({'packages': packages, 'python': sys.version, 'size': tree_size(entry / "venv"),
+                               'created': time.time()}, f, indent=2)
+        return entry / "venv"
+    
+    def link(self, base_venv: Path, venv_path: Path) -> None:
+        """Layer a project venv on a base venv: its packages on sys.path, its console scripts in bin"""
+        site_packages = self._site_packages(venv_path)
+        site_packages.mkdir(parents=True, exist_ok=True)
+        (site_packages / self.PTH_FILE).write_text(f"{self._site_packages(base_venv)}\n")
+        
+        base_bin = base_venv / ("Scripts" if os.name == 'nt' else "bin")
+        venv_bin = venv_path / ("Scripts" if os.name == 'nt' else "bin")
+        base_python = str(base_bin / "python").encode()
+        for script in base_bin.iterdir():
+            target = venv_bin / script.name
+            if (target.exists() or script.is_symlink() or not script.is_file()
+                    or script.stat().st_size > self.MAX_SCRIPT_SIZE):
+                continue
+            content = script.read_bytes()
+            if not content.startswith(b"#!") or base_python not in content:
+                # Activation scripts and binaries stay per project
+                continue
+            # Console scripts run with the project python so they see its packages too
+            target.write_bytes(content.replace(base_python, str(venv_bin / "python").encode()))
+            target.chmod(0o755)
+    
+    def _size(self, entry: Path) -> int:
+        """Get the installed size recorded for a base environment"""
+        try:
+            with open(entry / self.METADATA_FILE) as f:
+                return json.load(f).get('size', 0)
+        except (OSError, ValueError):
+            return 0
+    
+    @staticmethod
+    def _site_packages(venv_path: Path) -> Path:
+        """Get a venv's purelib directory"""
+        scheme = 'venv' if 'venv' in sysconfig.get_scheme_names() else (
+            'nt' if os.name == 'nt' else 'posix_prefix')
+        return Path(sysconfig.get_path('purelib', scheme, vars={'base': str(venv_path),
+                                                                'platbase': str(venv_path)}))
+    
+    @staticmethod
+    def _make_read_only(venv_path: Path) -> None:
+        """Drop write permission from every file so projects cannot change the shared packages"""
+        for root, _, files in os.walk(venv_path):
+            for name in files:
+                path = Path(root) / name
+                if not path.is_symlink():
+                    path.chmod(stat.S_IMODE(path.stat().st_mode) & ~0o222)
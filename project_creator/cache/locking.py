@@ -0,0 +1,31 @@
+"""
+Cross-process file locking for shared caches
+"""
+from pathlib import Path
+import os
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+class FileLock:
+    """Advisory lock on a file, shared or exclusive"""
+    
+    def __init__(self, path: Path, shared: bool = False):
+        self.path = path
+        self.shared = shared
+        self._fd = None
+    
+    def __enter__(self) -> "FileLock":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
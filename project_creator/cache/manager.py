@@ -0,0 +1,452 @@
+"""
+Size budgets, LRU eviction and integrity checks across every cache
+"""
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import hashlib
+import json
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+
+from . import get_cache_root, load_stats, tree_size
+from .locking import FileLock
+from .node_store import NodeModulesStore
+from .python_locks import PythonLockCache
+
+MB = 1024 * 1024
+
+# Budgets in megabytes; 0 means unlimited
+DEFAULT_LIMITS_MB = {
+    'venvs': 4096,
+    'node': 4096,
+    'npm-locks': 64,
+    'python-locks': 64,
+    'wheelhouse': 2048,
+    'template-repos': 1024,
+}
+
+class CacheEntry(NamedTuple):
+    """One evictable unit of a cache"""
+    name: str
+    path: Path
+    size: int
+    last_used: float
+
+class ManagedCache:
+    """A cache directory whose entries can be listed, evicted least recently used first, and verified"""
+    
+    prunable = True
+    
+    def __init__(self, name: str, path: Path, description: str):
+        self.name = name
+        self.path = path
+        self.description = description
+    
+    def entries(self) -> List[CacheEntry]:
+        """Get the cache's entries"""
+        return [CacheEntry(path.name, path, tree_size(path), self._last_used(path))
+                for path in self._entry_paths()]
+    
+    def size(self) -> int:
+        """Get the bytes the cache takes on disk"""
+        return tree_size(self.path) if self.path.exists() else 0
+    
+    def lock(self, entry: Optional[CacheEntry] = None) -> Any:
+        """Lock the cache, or one entry, against the creations that use it"""
+        return nullcontext()
+    
+    def evict(self, entry: CacheEntry) -> None:
+        """Remove an entry, moving it aside first so no reader sees half of it"""
+        with self.lock(entry):
+            if entry.path.is_dir():
+                doomed = entry.path.with_name(f".evict-{entry.name}-{os.getpid()}")
+                try:
+                    os.rename(entry.path, doomed)
+                except FileNotFoundError:
+                    return
+                shutil.rmtree(doomed, ignore_errors=True)
+            else:
+                entry.path.unlink(missing_ok=True)
+    
+    def prune(self, limit: int) -> Tuple[int, int]:
+        """Evict least recently used entries until the cache fits in limit bytes, returning (entries, bytes)"""
+        total = self.size()
+        removed = freed = 0
+        for entry in sorted(self.entries(), key=lambda entry: entry.last_used):
+            if total <= limit:
+                break
+            self.evict(entry)
+            total -= entry.size
+            removed += 1
+            freed += entry.size
+        return removed, freed
+    
+    def check(self, entry: CacheEntry) -> Optional[str]:
+        """Get what is wrong with an entry, None when it is intact"""
+        return None
+    
+    def _entry_paths(self) -> List[Path]:
+        """Get the paths of the cache's entries"""
+        if not self.path.is_dir():
+            return []
+        return [path for path in self.path.iterdir()
+                if not path.name.startswith('.') and path.suffix != '.lock']
+    
+    def _last_used(self, path: Path) -> float:
+        """Get when an entry was last used, from the access time hits set on it"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return 0.0
+        return max(stat.st_atime, stat.st_mtime)
+
+class DirectoryCache(ManagedCache):
+    """Cache of one directory per entry, each with a marker file written when it is complete"""
+    
+    def __init__(self, name: str, path: Path, description: str, marker: str):
+        super().__init__(name, path, description)
+        self.marker = marker
+    
+    def _entry_paths(self) -> List[Path]:
+        return [path for path in super()._entry_paths() if path.is_dir()]
+    
+    def _last_used(self, path: Path) -> float:
+        marker = path / self.marker
+        return super()._last_used(marker if marker.exists() else path)
+    
+    def check(self, entry: CacheEntry) -> Optional[str]:
+        if not (entry.path / self.marker).exists():
+            return f"missing {self.marker}"
+        return None
+
+class VenvSnapshots(DirectoryCache):
+    """Virtual environment snapshots"""
+    
+    def check(self, entry: CacheEntry) -> Optional[str]:
+        problem = super().check(entry)
+        if problem is None:
+            problem = _check_json(entry.path / self.marker, ('prefix', 'packages'))
+        if problem is None and not (entry.path / "venv" / "pyvenv.cfg").exists():
+            problem = "missing venv/pyvenv.cfg"
+        return problem
+
+class BaseEnvs(DirectoryCache):
+    """Read-only base environments; evicting one breaks the layered projects built on it"""
+    
+    prunable = False
+    
+    def lock(self, entry: Optional[CacheEntry] = None) -> Any:
+        return FileLock(self.path / f"{entry.name}.lock") if entry else nullcontext()
+    
+    def check(self, entry: CacheEntry) -> Optional[str]:
+        problem = super().check(entry)
+        if problem is None and not (entry.path / "venv" / "pyvenv.cfg").exists():
+            problem = "missing venv/pyvenv.cfg"
+        return problem
+
+class WarmPoolEntries(ManagedCache):
+    """Daemon pool slots, cleared and refilled by the daemon itself"""
+    
+    prunable = False
+
+class FileCache(ManagedCache):
+    """Cache of one file per entry"""
+    
+    def __init__(self, name: str, path: Path, description: str, pattern: str):
+        super().__init__(name, path, description)
+        self.pattern = pattern
+    
+    def _entry_paths(self) -> List[Path]:
+        if not self.path.is_dir():
+            return []
+        return [path for path in self.path.glob(self.pattern)
+                if not path.name.startswith('.') and path.is_file()]
+
+class NpmLocks(FileCache):
+    """Pinned npm versions and lockfiles"""
+    
+    def check(self, entry: CacheEntry) -> Optional[str]:
+        return _check_json(entry.path, ('versions', 'lock'))
+
+class PythonLocks(FileCache):
+    """Hash-pinned Python requirement locks"""
+    
+    def check(self, entry: CacheEntry) -> Optional[str]:
+        try:
+            with open(entry.path) as f:
+                header = f.readline()
+        except (OSError, UnicodeDecodeError) as e:
+            return f"unreadable: {e}"
+        if not header.startswith(PythonLockCache.HEADER):
+            return "not a create-project lock"
+        return None
+
+class WheelhouseFiles(FileCache):
+    """Built wheels; evicting one makes the requirement sets that used it populate again"""
+    
+    def lock(self, entry: Optional[CacheEntry] = None) -> Any:
+        return FileLock(self.path.parent / "wheelhouse.lock")
+    
+    def evict(self, entry: CacheEntry) -> None:
+        with self.lock(entry):
+            entry.path.unlink(missing_ok=True)
+            (self.path / "index.json").unlink(missing_ok=True)
+    
+    def check(self, entry: CacheEntry) -> Optional[str]:
+        try:
+            with zipfile.ZipFile(entry.path) as archive:
+                bad = archive.testzip()
+        except (OSError, zipfile.BadZipFile) as e:
+            return f"bad wheel: {e}"
+        return f"corrupt member {bad}" if bad else None
+
+class TemplateRepos(ManagedCache):
+    """Bare template repository mirrors and per-commit archives"""
+    
+    def _entry_paths(self) -> List[Path]:
+        archives = self.path / "archives"
+        paths = [path for path in super()._entry_paths() if path.suffix == '.git']
+        if archives.is_dir():
+            paths += [path for path in archives.glob("*.tar") if not path.name.startswith('.')]
+        return paths
+    
+    def _last_used(self, path: Path) -> float:
+        return super()._last_used(path / "HEAD" if path.suffix == '.git' else path)
+    
+    def lock(self, entry: Optional[CacheEntry] = None) -> Any:
+        if entry is not None and entry.path.suffix == '.git':
+            return FileLock(self.path / f"{entry.path.stem}.lock")
+        return nullcontext()
+    
+    def check(self, entry: CacheEntry) -> Optional[str]:
+        if entry.path.suffix == '.git':
+            return None if (entry.path / "HEAD").exists() else "missing HEAD"
+        try:
+            with tarfile.open(entry.path) as archive:
+                archive.getmembers()
+        except (OSError, tarfile.TarError) as e:
+            return f"bad archive: {e}"
+        return None
+
+class SharedPipCopies(DirectoryCache):
+    """Extracted pip wheels shared by in-process venvs; evicting one breaks the venvs pointing at it"""
+    
+    prunable = False
+
+class NodeStore(ManagedCache):
+    """Content-addressed node_modules store: dependency set manifests over shared objects"""
+    
+    def __init__(self, name: str, path: Path, description: str):
+        super().__init__(name, path, description)
+        self.sets = path / "sets"
+        self.objects = path / "objects"
+        # Objects check() found corrupt, deleted with their set so a later store cannot reuse them
+        self._damaged: List[Path] = []
+    
+    def entries(self) -> List[CacheEntry]:
+        entries = []
+        for manifest_path in self._entry_paths():
+            manifest = _load_json(manifest_path) or {}
+            size = manifest.get('size')
+            if size is None:
+                size = sum(self._object_size(digest) for _, digest in manifest.get('files', []))
+            entries.append(CacheEntry(manifest_path.stem, manifest_path, size, self._last_used(manifest_path)))
+        return entries
+    
+    def _entry_paths(self) -> List[Path]:
+        if not self.sets.is_dir():
+            return []
+        return [path for path in self.sets.glob("*.json") if not path.name.startswith('.')]
+    
+    def lock(self, entry: Optional[CacheEntry] = None) -> Any:
+        # Exclusive: stores and links hold it shared, and objects are shared between sets
+        return FileLock(self.path.parent / NodeModulesStore.LOCK_FILE)
+    
+    def prune(self, limit: int) -> Tuple[int, int]:
+        """Drop least recently used sets, deleting objects once no remaining set links them"""
+        with self.lock():
+            return self._prune(limit)
+    
+    def _prune(self, limit: int) -> Tuple[int, int]:
+        """Drop sets and their unshared objects while holding the store lock"""
+        manifests = {entry.path: _load_json(entry.path) or {} for entry in self.entries()}
+        refcounts: Dict[str, int] = {}
+        for manifest in manifests.values():
+            for digest in {digest for _, digest in manifest.get('files', [])}:
+                refcounts[digest] = refcounts.get(digest, 0) + 1
+        
+        total = self.size()
+        # Objects no set links, e.g. from an interrupted store
+        removed, freed = 0, self._collect(refcounts)
+        total -= freed
+        for entry in sorted(self.entries(), key=lambda entry: entry.last_used):
+            if total <= limit:
+                break
+            size = tree_size(entry.path)
+            entry.path.unlink(missing_ok=True)
+            removed += 1
+            released = []
+            for digest in {digest for _, digest in manifests.get(entry.path, {}).get('files', [])}:
+                refcounts[digest] -= 1
+                if refcounts[digest] == 0:
+                    released.append(digest)
+            size += sum(self._remove_object(digest) for digest in released)
+            total -= size
+            freed += size
+        return removed, freed
+    
+    def evict(self, entry: CacheEntry) -> None:
+        with self.lock(entry):
+            entry.path.unlink(missing_ok=True)
+            while self._damaged:
+                self._damaged.pop().unlink(missing_ok=True)
+    
+    def check(self, entry: CacheEntry) -> Optional[str]:
+        manifest = _load_json(entry.path)
+        if manifest is None or 'files' not in manifest:
+            return "unreadable manifest"
+        for rel, digest in manifest['files']:
+            path = self.objects / digest[:2] / digest[2:]
+            if not path.exists():
+                return f"missing object for {rel}"
+            if _sha256(path) != digest.rstrip('x'):
+                self._damaged.append(path)
+                return f"object for {rel} does not match its digest"
+        return None
+    
+    def _collect(self, refcounts: Dict[str, int]) -> int:
+        """Delete objects no manifest references, returning the bytes freed"""
+        if not self.objects.is_dir():
+            return 0
+        freed = 0
+        for bucket in self.objects.iterdir():
+            if not bucket.is_dir():
+                continue
+            for path in bucket.iterdir():
+                digest = bucket.name + path.name
+                if not path.name.startswith('.') and digest not in refcounts:
+                    freed += self._remove_object(digest)
+        return freed
+    
+    def _object_size(self, digest: str) -> int:
+        """Get an object's size, 0 when it is missing"""
+        try:
+            return (self.objects / digest[:2] / digest[2:]).stat().st_size
+        except OSError:
+            return 0
+    
+    def _remove_object(self, digest: str) -> int:
+        """Delete an object, returning its size"""
+        size = self._object_size(digest)
+        (self.objects / digest[:2] / digest[2:]).unlink(missing_ok=True)
+        return size
+
+class CacheManager:
+    """Budgets, statistics and maintenance for every cache under one root"""
+    
+    PRUNE_STAMP = "last-prune"
+    
+    def __init__(self, root: Path, limits_mb: Optional[Dict[str, int]] = None):
+        self.root = root
+        self.limits_mb = dict(DEFAULT_LIMITS_MB, **(limits_mb or {}))
+        self.caches = [
+            VenvSnapshots('venvs', root / "venvs", "virtual environment snapshots", "snapshot.json"),
+            BaseEnvs('base-envs', root / "base-envs", "layered base environments", "base.json"),
+            NodeStore('node', root / "node", "node_modules package store"),
+            NpmLocks('npm-locks', root / "npm-locks", "npm lockfiles", "*.json"),
+            PythonLocks('python-locks', root / "python-locks", "Python requirement locks", "*.txt"),
+            WheelhouseFiles('wheelhouse', root / "wheelhouse", "built wheels", "*.whl"),
+            TemplateRepos('template-repos', root / "template-repos", "git template mirrors and archives"),
+            SharedPipCopies('pip', root / "pip", "shared pip copies", "pip/__init__.py"),
+            WarmPoolEntries('pool', root / "pool", "daemon warm pool"),
+        ]
+    
+    @classmethod
+    def from_config(cls, config: Any) -> "CacheManager":
+        """Create a manager for the configured cache root and budgets"""
+        return cls(get_cache_root(config), config.get('cache_limits_mb'))
+    
+    def get(self, name: str) -> ManagedCache:
+        """Get a cache by name"""
+        for cache in self.caches:
+            if cache.name == name:
+                return cache
+        raise KeyError(name)
+    
+    def limit(self, cache: ManagedCache) -> Optional[int]:
+        """Get a cache's budget in bytes, None when unlimited"""
+        # YAML reads '1e-3' as a string
+        limit_mb = float(self.limits_mb.get(cache.name) or 0)
+        return int(limit_mb * MB) if limit_mb else None
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get hit, miss and bytes saved counters per cache"""
+        return load_stats(self.root)
+    
+    def prune(self, names: Optional[Iterable[str]] = None,
+              everything: bool = False) -> List[Tuple[str, int, int]]:
+        """Shrink caches to their budgets, or empty them, returning (cache, entries, bytes) per cache"""
+        selected = [self.get(name) for name in names] if names else self.caches
+        results = []
+        with FileLock(self.root / "prune.lock"):
+            for cache in selected:
+                limit = 0 if everything else self.limit(cache)
+                if not cache.prunable or limit is None:
+                    continue
+                removed, freed = cache.prune(limit)
+                results.append((cache.name, removed, freed))
+            (self.root / self.PRUNE_STAMP).touch()
+        return results
+    
+    def maybe_prune(self, interval: float) -> Optional[List[Tuple[str, int, int]]]:
+        """Prune when the last prune is more than interval seconds old"""
+        try:
+            if time.time() - (self.root / self.PRUNE_STAMP).stat().st_mtime < interval:
+                return None
+        except FileNotFoundError:
+            pass
+        return self.prune()
+    
+    def verify(self, names: Optional[Iterable[str]] = None,
+               fix: bool = False) -> List[Tuple[str, CacheEntry, str]]:
+        """Check every entry's integrity, evicting broken ones when fix is set"""
+        selected = [self.get(name) for name in names] if names else self.caches
+        problems = []
+        for cache in selected:
+            for entry in cache.entries():
+                problem = cache.check(entry)
+                if problem is None:
+                    continue
+                problems.append((cache.name, entry, problem))
+                if fix and cache.prunable:
+                    cache.evict(entry)
+        return problems
+
+def _load_json(path: Path) -> Optional[Dict[str, Any]]:
+    """Load a JSON object, None when it is unreadable"""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+def _check_json(path: Path, keys: Iterable[str]) -> Optional[str]:
+    """Check a JSON metadata file parses and has the given keys"""
+    data = _load_json(path)
+    if data is None:
+        return f"unreadable {path.name}"
+    missing = [key for key in keys if key not in data]
+    return f"{path.name} lacks {', '.join(missing)}" if missing else None
+
+def _sha256(path: Path) -> str:
+    """Hash a file's content"""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(MB), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
@@ -0,0 +1,182 @@
+"""
+Content-addressed store for node_modules trees
+"""
+from pathlib import Path
+from typing import Any, List, Mapping, Optional
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sys
+import time
+
+from . import record_access
+from .locking import FileLock
+from ..utils.file_ops import _reflink_file
+
+class NodeModulesStore:
+    """Keep package files once by content hash and link them into new projects"""
+    
+    CHUNK_SIZE = 1024 * 1024
+    # Files outside node_modules that belong to an installed dependency set
+    EXTRA_FILES = ("package-lock.json", "pnpm-lock.yaml", "yarn.lock")
+    LOCK_FILE = "node.lock"
+    
+    def __init__(self, root: Path):
+        self.root = root / "node"
+        self.objects = self.root / "objects"
+        self.sets = self.root / "sets"
+    
+    def lock(self, shared: bool = True) -> FileLock:
+        """Lock the store: shared while linking or storing, exclusive while pruning"""
+        return FileLock(self.root.parent / self.LOCK_FILE, shared=shared)
+    
+    def get_key(self, dependencies: Mapping[str, Any]) -> str:
+        """Get cache key for the Node.js runtime plus dependency set"""
+        node = shutil.which("node")
+        identity = {
+            'node': os.path.realpath(node) if node else None,
+            'platform': f"{sys.platform}-{platform.machine()}",
+            'dependencies': {kind: sorted(set(packages)) for kind, packages in dependencies.items()}
+        }
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:32]
+    
+    def lookup(self, dependencies: Mapping[str, Any]) -> Optional[Path]:
+        """Get the manifest for a dependency set if it exists"""
+        manifest = self.sets / f"{self.get_key(dependencies)}.json"
+        return manifest if manifest.exists() else None
+    
+    def materialize(self, dependencies: Mapping[str, Any], project_path: Path) -> bool:
+        """Link a stored node_modules tree into project_path, returning False on a miss"""
+        if (project_path / "node_modules").exists():
+            return False
+        with self.lock():
+            return self._materialize(dependencies, project_path)
+    
+    def _materialize(self, dependencies: Mapping[str, Any], project_path: Path) -> bool:
+        """Link a stored tree while holding the store lock"""
+        manifest_path = self.lookup(dependencies)
+        manifest = None
+        if manifest_path is not None:
+            try:
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                # Damaged manifest: drop it so the next install stores the set again
+                manifest_path.unlink(missing_ok=True)
+        if manifest is None:
+            record_access(self.root.parent, "node", None)
+            return False
+        
+        methods = ['hardlink', 'reflink', 'copy'] if os.name == 'posix' else ['hardlink', 'copy']
+        # Lockfiles get rewritten per project, so they never share the store's inode
+        copy_methods = ['reflink', 'copy'] if os.name == 'posix' else ['copy']
+        try:
+            for rel in manifest['dirs']:
+                (project_path / rel).mkdir(parents=True, exist_ok=True)
+            for rel, digest in manifest['files']:
+                self._link(self._object_path(digest), project_path / rel,
+                           copy_methods if rel in self.EXTRA_FILES else methods)
+            for rel, target in manifest['symlinks']:
+                os.symlink(target, project_path / rel)
+        except OSError as e:
+            # A missing object or a full disk turns into an ordinary npm install
+            shutil.rmtree(project_path / "node_modules", ignore_errors=True)
+            for name in self.EXTRA_FILES:
+                (project_path / name).unlink(missing_ok=True)
+            if isinstance(e, FileNotFoundError):
+                # An object was evicted or lost: store the set again after the install
+                manifest_path.unlink(missing_ok=True)
+            return False
+        record_access(self.root.parent, "node", manifest_path, manifest.get('size', 0))
+        return True
+    
+    def store(self, dependencies: Mapping[str, Any], project_path: Path) -> None:
+        """Add an installed node_modules tree to the store"""
+        manifest_path = self.sets / f"{self.get_key(dependencies)}.json"
+        if manifest_path.exists() or not (project_path / "node_modules").is_dir():
+            # Nothing installed into node_modules, e.g. a Plug'n'Play install: storing it would hide the deps
+            return
+        with self.lock():
+            self._store(manifest_path, dependencies, project_path)
+    
+    def _store(self, manifest_path: Path, dependencies: Mapping[str, Any], project_path: Path) -> None:
+        """Ingest a tree and publish its manifest while holding the store lock"""
+        files: List[List[str]] = []
+        symlinks: List[List[str]] = []
+        dirs: List[str] = []
+        size = 0
+        methods = ['hardlink', 'copy']
+        
+        for root, dir_names, file_names in os.walk(project_path / "node_modules"):
+            rel_root = Path(root).relative_to(project_path)
+            dirs.append(rel_root.as_posix())
+            for name in dir_names + file_names:
+                path = Path(root) / name
+                rel = (rel_root / name).as_posix()
+                if path.is_symlink():
+                    symlinks.append([rel, os.readlink(path)])
+                elif name in file_names:
+                    files.append([rel, self._ingest(path, methods)])
+                    size += path.stat().st_size
+        for name in self.EXTRA_FILES:
+            path = project_path / name
+            if path.is_file():
+                files.append([name, self._ingest(path, methods)])
+                size += path.stat().st_size
+        
+        self.sets.mkdir(parents=True, exist_ok=True)
+        staging = self.sets / f".tmp-{manifest_path.stem}-{os.getpid()}"
+        with open(staging, 'w') as f:
+            json.dump({
+                'dependencies': {kind: list(packages) for kind, packages in dependencies.items()},
+                'created': time.time(),
+                'size': size,
+                'dirs': dirs,
+                'files': files,
+                'symlinks': symlinks
+            }, f)
+        # Publish atomically so concurrent runs never see a partial manifest
+        os.replace(staging, manifest_path)
+    
+    def _object_path(self, digest: str) -> Path:
+        """Get the store path for a content digest"""
+        return self.objects / digest[:2] / digest[2:]
+    
+    def _ingest(self, path: Path, methods: List[str]) -> str:
+        """Add a file to the object store, returning its digest"""
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b''):
+                sha.update(chunk)
+        # Hardlinks share permissions, so executables are stored separately
+        digest = sha.hexdigest() + ("x" if os.access(path, os.X_OK) else "")
+        
+        target = self._object_path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            staging = target.with_name(f".tmp-{target.name}-{os.getpid()}")
+            staging.unlink(missing_ok=True)
+            self._link(path, staging, methods)
+            os.replace(staging, target)
+        return digest
+    
+    def _link(self, source: Path, target: Path, methods: List[str]) -> None:
+        """Link or copy a file, downgrading methods once for the whole run"""
+        while True:
+            method = methods[0]
+            try:
+                if method == 'hardlink':
+                    os.link(source, target)
+                elif method == 'reflink':
+                    _reflink_file(source, target)
+                else:
+                    shutil.copy2(source, target)
+                return
+            except FileNotFoundError:
+                raise
+            except OSError:
+                if method == 'copy':
+                    raise
+                methods.pop(0)
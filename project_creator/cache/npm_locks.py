@@ -0,0 +1,93 @@
+"""
+Resolved npm versions and lockfiles per dependency set
+"""
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+import hashlib
+import json
+import os
+import time
+
+from . import record_access
+
+class NpmLockCache:
+    """Remember exact versions and package-lock.json for each frontend dependency set"""
+    
+    def __init__(self, root: Path):
+        self.root = root / "npm-locks"
+    
+    def get_key(self, dependencies: Mapping[str, Any]) -> str:
+        """Get key for a dependency set"""
+        identity = {kind: sorted(set(packages)) for kind, packages in dependencies.items()}
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:32]
+    
+    def lookup(self, dependencies: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get the cached entry with 'versions' and 'lock' for a dependency set"""
+        entry = self._load(dependencies)
+        record_access(self.root.parent, "npm-locks",
+                      self.root / f"{self.get_key(dependencies)}.json" if entry else None)
+        return entry
+    
+    def pinned(self, dependencies: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Get the dependency set as name@version specs when a lock is cached"""
+        entry = self._load(dependencies)
+        if entry is None:
+            return dependencies
+        versions = entry['versions']
+        return {kind: [f"{name}@{versions[name]}" for name in packages]
+                for kind, packages in dependencies.items()}
+    
+    def record(self, dependencies: Mapping[str, Any], lock: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Pin a resolved package-lock.json, returning None when it lacks a direct dependency"""
+        versions = {}
+        for packages in dependencies.values():
+            for name in packages:
+                version = self._locked_version(lock, name)
+                if version is None:
+                    return None
+                versions[name] = version
+        
+        # Keep the lock's root entry in sync with the pinned package.json
+        root_package = lock.get('packages', {}).get('')
+        if root_package is not None:
+            for field in ('dependencies', 'devDependencies'):
+                for name in root_package.get(field, {}):
+                    if name in versions:
+                        root_package[field][name] = versions[name]
+        
+        entry = {
+            'dependencies': {kind: sorted(set(packages)) for kind, packages in dependencies.items()},
+            'versions': versions,
+            'lock': lock,
+            'resolved': time.time()
+        }
+        self.root.mkdir(parents=True, exist_ok=True)
+        entry_file = self.root / f"{self.get_key(dependencies)}.json"
+        tmp_file = entry_file.with_name(f".tmp-{entry_file.name}-{os.getpid()}")
+        with open(tmp_file, 'w') as f:
+            json.dump(entry, f, indent=2)
+        tmp_file.replace(entry_file)
+        return entry
+    
+    def _load(self, dependencies: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """Read the entry for a dependency set, discarding it when damaged"""
+        entry_file = self.root / f"{self.get_key(dependencies)}.json"
+        if not entry_file.exists():
+            return None
+        try:
+            with open(entry_file) as f:
+                entry = json.load(f)
+            if 'versions' in entry and 'lock' in entry:
+                return entry
+        except (OSError, ValueError, TypeError):
+            pass
+        entry_file.unlink(missing_ok=True)
+        return None
+    
+    @staticmethod
+    def _locked_version(lock: Dict[str, Any], name: str) -> Optional[str]:
+        """Get the installed version of a top-level package from a lockfile"""
+        if 'packages' in lock:
+            return lock['packages'].get(f"node_modules/{name}", {}).get('version')
+        # lockfileVersion 1
+        return lock.get('dependencies', {}).get(name, {}).get('version')
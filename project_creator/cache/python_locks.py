@@ -0,0 +1,101 @@
+"""
+Resolved, hash-pinned Python requirement locks per package set
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+import hashlib
+import json
+import os
+import platform
+import sys
+from urllib.parse import unquote, urlparse
+
+from . import record_access
+
+class PythonLockCache:
+    """Remember pip's resolution of a package set as a --require-hashes lock"""
+    
+    HEADER = "# Resolved by create-project"
+    
+    def __init__(self, root: Path):
+        self.root = root / "python-locks"
+    
+    def get_key(self, requirements: Iterable[str]) -> str:
+        """Get key for a requirement set on this interpreter and platform"""
+        identity = {
+            'python': f"{sys.implementation.name}{sys.version_info[0]}{sys.version_info[1]}",
+            'platform': f"{sys.platform}-{platform.machine()}",
+            'requirements': sorted(set(requirements))
+        }
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:32]
+    
+    def lookup(self, requirements: Iterable[str]) -> Optional[str]:
+        """Get the cached lock file content for a requirement set"""
+        lock_file = self.root / f"{self.get_key(requirements)}.txt"
+        try:
+            content = lock_file.read_text()
+        except (OSError, UnicodeDecodeError):
+            content = None
+        if content is not None and not content.startswith(self.HEADER):
+            # Truncated or foreign file: resolve again
+            lock_file.unlink(missing_ok=True)
+            content = None
+        record_access(self.root.parent, "python-locks", lock_file if content is not None else None)
+        return content
+    
+    def header(self, requirements: Iterable[str]) -> str:
+        """Get the first line of the lock for a requirement set"""
+        return f"{self.HEADER} for: {' '.join(sorted(set(requirements)))}"
+    
+    def matches(self, content: str, requirements: Iterable[str]) -> bool:
+        """Check a lock was resolved for exactly this requirement set"""
+        return content.split('\n', 1)[0] == self.header(requirements)
+    
+    def record_report(self, requirements: Iterable[str], report: Dict[str, Any]) -> Optional[str]:
+        """Build and cache a lock from a pip installation report, None if a hash is unknown"""
+        requirements = sorted(set(requirements))
+        lines = [self.header(requirements)]
+        for item in sorted(report.get('install', []), key=lambda item: item['metadata']['name'].lower()):
+            digest = self._sha256(item.get('download_info', {}))
+            if digest is None:
+                return None
+            metadata = item['metadata']
+            lines.append(f"{metadata['name']}=={metadata['version']} \\")
+            lines.append(f"    --hash=sha256:{digest}")
+        content = '\n'.join(lines) + '\n'
+        
+        self.root.mkdir(parents=True, exist_ok=True)
+        lock_file = self.root / f"{self.get_key(requirements)}.txt"
+        tmp_file = lock_file.with_name(f".tmp-{lock_file.name}-{os.getpid()}")
+        tmp_file.write_text(content)
+        tmp_file.replace(lock_file)
+        return content
+    
+    def discard(self, requirements: Iterable[str]) -> None:
+        """Forget the lock for a requirement set so it is resolved again"""
+        (self.root / f"{self.get_key(requirements)}.txt").unlink(missing_ok=True)
+    
+    @staticmethod
+    def _sha256(download_info: Dict[str, Any]) -> Optional[str]:
+        """Get the archive sha256 from report download info, hashing local files"""
+        archive_info = download_info.get('archive_info')
+        if archive_info is None:
+            # Directories and VCS checkouts cannot be hash-pinned
+            return None
+        digest = archive_info.get('hashes', {}).get('sha256')
+        if digest is None and archive_info.get('hash', '').startswith('sha256='):
+            digest = archive_info['hash'][len('sha256='):]
+        if digest is not None:
+            return digest
+        
+        url = urlparse(download_info.get('url', ''))
+        if url.scheme != 'file':
+            return None
+        sha = hashlib.sha256()
+        try:
+            with open(unquote(url.path), 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    sha.update(chunk)
+        except OSError:
+            return None
+        return sha.hexdigest()
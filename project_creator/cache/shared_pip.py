@@ -0,0 +1,107 @@
+"""
+One shared copy of pip for virtual environments created in-process
+"""
+from pathlib import Path
+from typing import Optional
+import ensurepip
+import os
+import shutil
+import sys
+import sysconfig
+import threading
+import venv
+import zipfile
+
+from . import record_access
+
+class _PiplessEnvBuilder(venv.EnvBuilder):
+    """EnvBuilder that puts the shared pip on the new environment's path instead of installing it"""
+    
+    def __init__(self, pip_path: Path):
+        super().__init__(with_pip=False, symlinks=True)
+        self.pip_path = pip_path
+    
+    def post_setup(self, context) -> None:
+        scheme = 'venv' if 'venv' in sysconfig.get_scheme_names() else 'posix_prefix'
+        site_packages = Path(sysconfig.get_path('purelib', scheme, vars={'base': context.env_dir,
+                                                                        'platbase': context.env_dir}))
+        site_packages.mkdir(parents=True, exist_ok=True)
+        (site_packages / SharedPip.PTH_FILE).write_text(f"{self.pip_path}\n")
+        
+        script = (f"#!{context.env_exe}\n"
+                  "import sys\n"
+                  "from pip._internal.cli.main import main\n"
+                  "if __name__ == '__main__':\n"
+                  "    sys.exit(main())\n")
+        version = sys.version_info
+        for name in ("pip", f"pip{version[0]}", f"pip{version[0]}.{version[1]}"):
+            path = Path(context.bin_path) / name
+            path.write_text(script)
+            path.chmod(0o755)
+
+class SharedPip:
+    """Extract the interpreter's bundled pip wheel once and link it into new venvs with a .pth file"""
+    
+    PTH_FILE = "_create_project_pip.pth"
+    
+    def __init__(self, root: Path):
+        # Absolute, since the .pth files outlive the current directory
+        self.root = (root / "pip").absolute()
+    
+    @staticmethod
+    def find_wheel() -> Optional[Path]:
+        """Get the pip wheel ensurepip would install, None when the interpreter ships without one"""
+        bundled = Path(ensurepip.__file__).parent / "_bundled"
+        wheels = sorted(bundled.glob("pip-*.whl"))
+        # Distributions that unbundle ensurepip point it at their own wheel directory
+        wheel_dir = getattr(ensurepip, '_WHEEL_PKG_DIR', None)
+        if not wheels and wheel_dir:
+            wheels = sorted(Path(wheel_dir).glob("pip-*.whl"))
+        return wheels[-1] if wheels else None
+    
+    def ensure(self) -> Optional[Path]:
+        """Get the extracted pip directory, extracting the wheel on first use"""
+        wheel = self.find_wheel()
+        if wheel is None:
+            return None
+        target = self.root / wheel.stem
+        if (target / "pip" / "__init__.py").exists():
+            record_access(self.root.parent, "pip", target / "pip" / "__init__.py", wheel.stat().st_size)
+            return target
+        record_access(self.root.parent, "pip", None)
+        if target.exists():
+            # Damaged copy: move it aside and extract again
+            broken = self.root / f".tmp-broken-{wheel.stem}-{os.getpid()}-{threading.get_ident()}"
+            try:
+                os.rename(target, broken)
+            except OSError:
+                pass
+            shutil.rmtree(broken, ignore_errors=True)
+        
+        staging = self.root / f".tmp-{wheel.stem}-{os.getpid()}-{threading.get_ident()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            with zipfile.ZipFile(wheel) as archive:
+                archive.extractall(staging)
+            os.rename(staging, target)
+        except OSError:
+            # Another run extracted the same wheel first
+            shutil.rmtree(staging, ignore_errors=True)
+            if not target.is_dir():
+                raise
+        return target
+    
+    def create_venv(self, venv_path: Path) -> bool:
+        """Create a pip-less venv for this interpreter in-process, False if it cannot be done here"""
+        if os.name != 'posix':
+            # pip.exe launchers cannot be written as scripts
+            return False
+        try:
+            pip_path = self.ensure()
+            if pip_path is None:
+                return False
+            _PiplessEnvBuilder(pip_path).create(str(venv_path))
+        except (OSError, zipfile.BadZipFile):
+            shutil.rmtree(venv_path, ignore_errors=True)
+            return False
+        return True
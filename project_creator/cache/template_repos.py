@@ -0,0 +1,124 @@
+"""
+Bare mirrors of git template repositories and one archive per commit
+"""
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import tarfile
+
+from . import mark_used, record_access
+from .locking import FileLock
+from ..utils.exceptions import TemplateNotFoundError
+from ..utils.process import CommandRunner
+
+FULL_SHA = re.compile(r"[0-9a-f]{40}")
+
+class TemplateRepoCache:
+    """Fetch template repositories incrementally into bare mirrors and archive each commit once"""
+    
+    ARCHIVE_PREFIX = "template/"
+    PINNED_FILE = "pinned.json"
+    REFSPECS = ["+HEAD:refs/remotes/origin/HEAD", "+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"]
+    
+    def __init__(self, root: Path, runner: Optional[CommandRunner] = None):
+        self.root = root / "template-repos"
+        self.runner = runner or CommandRunner()
+    
+    def get_key(self, url: str) -> str:
+        """Get key for a repository URL"""
+        return hashlib.sha256(url.encode()).hexdigest()[:32]
+    
+    def archive(self, url: str, ref: str = "HEAD") -> Path:
+        """Get a tar archive of a ref's tree, fetching only when the ref is not pinned to a cached commit"""
+        key = self.get_key(url)
+        repo = self.root / f"{key}.git"
+        with FileLock(self.root / f"{key}.lock"):
+            pinned = self._load_pinned(repo)
+            commit = ref if FULL_SHA.fullmatch(ref) else pinned.get(ref)
+            if commit and self._intact(self._archive_path(commit)):
+                # Tags and commit ids never move: no git at all
+                record_access(self.root.parent, "template-repos", self._archive_path(commit),
+                              self._archive_path(commit).stat().st_size)
+                return self._archive_path(commit)
+            record_access(self.root.parent, "template-repos", None)
+            
+            git = self.runner.resolve_tool('git', 'git')
+            commit = self._resolve(git, repo, url, ref)
+            mark_used(repo / "HEAD")
+            if FULL_SHA.fullmatch(ref) or self._is_tag(git, repo, ref):
+                pinned[ref] = commit
+                self._save_pinned(repo, pinned)
+            
+            path = self._archive_path(commit)
+            if not self._intact(path):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f".tmp-{commit}-{os.getpid()}.tar")
+                try:
+                    self.runner.run([git, "archive", "--format=tar",
+                                     f"--prefix={self.ARCHIVE_PREFIX}", "-o", tmp_path, commit], cwd=repo)
+                    os.replace(tmp_path, path)
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+            return path
+    
+    def _resolve(self, git: str, repo: Path, url: str, ref: str) -> str:
+        """Bring the mirror up to date with the remote and get the commit a ref points to"""
+        if not (repo / "HEAD").exists():
+            shutil.rmtree(repo, ignore_errors=True)
+            self.runner.run([git, "init", "--bare", "--quiet", repo], cwd=self.root)
+        
+        if not (FULL_SHA.fullmatch(ref) and self._rev_parse(git, repo, ref)):
+            try:
+                # Only objects the mirror lacks come over the wire
+                self.runner.run([git, "fetch", "--quiet", "--prune", url] + self.REFSPECS, cwd=repo)
+            except subprocess.CalledProcessError:
+                raise TemplateNotFoundError(f"Could not fetch template repository '{url}'")
+        
+        commit = self._rev_parse(git, repo, "refs/remotes/origin/HEAD" if ref == "HEAD" else ref)
+        if commit is None:
+            raise TemplateNotFoundError(f"Ref '{ref}' not found in template repository '{url}'")
+        return commit
+    
+    def _rev_parse(self, git: str, repo: Path, ref: str) -> Optional[str]:
+        """Get the commit a ref names in the mirror, None if it does not exist"""
+        result = self.runner.run([git, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+                                 cwd=repo, check=False, capture=True)
+        return result.stdout.strip() if result.returncode == 0 else None
+    
+    def _is_tag(self, git: str, repo: Path, ref: str) -> bool:
+        """Check if a ref is a tag"""
+        result = self.runner.run([git, "show-ref", "--verify", "--quiet", f"refs/tags/{ref}"],
+                                 cwd=repo, check=False, capture=True)
+        return result.returncode == 0
+    
+    @staticmethod
+    def _intact(archive: Path) -> bool:
+        """Check an archive exists and starts with a tar header"""
+        try:
+            return tarfile.is_tarfile(archive)
+        except OSError:
+            return False
+    
+    def _archive_path(self, commit: str) -> Path:
+        """Get the archive path for a commit"""
+        return self.root / "archives" / f"{commit}.tar"
+    
+    def _load_pinned(self, repo: Path) -> Dict[str, str]:
+        """Load the tags and commit ids already resolved in a mirror"""
+        try:
+            with open(repo / self.PINNED_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_pinned(self, repo: Path, pinned: Dict[str, str]) -> None:
+        """Store resolved tags and commit ids next to the mirror"""
+        tmp_file = repo / f"{self.PINNED_FILE}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(pinned, f, indent=2)
+        tmp_file.replace(repo / self.PINNED_FILE)
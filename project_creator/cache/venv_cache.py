@@ -0,0 +1,129 @@
+"""
+Virtual environment snapshot cache
+"""
+from pathlib import Path
+from typing import Iterable, Optional
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sys
+import time
+
+from . import record_access, tree_size
+from ..utils.file_ops import clone_tree
+
+class VenvCache:
+    """Snapshot fully installed virtual environments and clone them into new projects"""
+    
+    METADATA_FILE = "snapshot.json"
+    MAX_SCRIPT_SIZE = 1024 * 1024
+    
+    def __init__(self, root: Path):
+        self.root = root / "venvs"
+    
+    def get_key(self, packages: Iterable[str]) -> str:
+        """Get cache key for interpreter version plus package set"""
+        identity = {
+            'python': sys.version,
+            'executable': os.path.realpath(sys.executable),
+            'platform': f"{sys.platform}-{platform.machine()}",
+            'packages': sorted(set(packages))
+        }
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:32]
+    
+    def lookup(self, packages: Iterable[str]) -> Optional[Path]:
+        """Get snapshot directory for a package set if it exists"""
+        entry = self.root / self.get_key(packages)
+        if (entry / self.METADATA_FILE).exists():
+            return entry
+        return None
+    
+    def materialize(self, packages: Iterable[str], venv_path: Path) -> bool:
+        """Clone cached snapshot into venv_path, returning False on a cache miss"""
+        if venv_path.exists():
+            return False
+        entry = self.lookup(packages)
+        metadata = self._read_metadata(entry) if entry else None
+        if metadata is None:
+            record_access(self.root.parent, "venvs", None)
+            return False
+        
+        try:
+            clone_tree(entry / "venv", venv_path)
+            self.relocate(venv_path, metadata['prefix'], str(venv_path))
+        except OSError:
+            shutil.rmtree(venv_path, ignore_errors=True)
+            return False
+        record_access(self.root.parent, "venvs", entry / self.METADATA_FILE, metadata.get('size', 0))
+        return True
+    
+    def store(self, packages: Iterable[str], venv_path: Path) -> None:
+        """Snapshot an installed virtual environment into the cache"""
+        packages = sorted(set(packages))
+        entry = self.root / self.get_key(packages)
+        if (entry / self.METADATA_FILE).exists():
+            return
+        
+        staging = self.root / f".tmp-{entry.name}-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            clone_tree(venv_path, staging / "venv")
+            with open(staging / self.METADATA_FILE, 'w') as f:
+                json.dump({
+                    'prefix': str(venv_path),
+                    'python': sys.version,
+                    'packages': packages,
+                    'size': tree_size(staging / "venv"),
+                    'created': time.time()
+                }, f, indent=2)
+            # Publish atomically so concurrent runs never see a partial snapshot
+            os.rename(staging, entry)
+        except OSError:
+            # Another run published the same snapshot first
+            shutil.rmtree(staging, ignore_errors=True)
+            if not (entry / self.METADATA_FILE).exists():
+                raise
+    
+    def _read_metadata(self, entry: Path) -> Optional[dict]:
+        """Load a snapshot's metadata, discarding the snapshot when it is damaged"""
+        try:
+            with open(entry / self.METADATA_FILE) as f:
+                metadata = json.load(f)
+            if 'prefix' in metadata and (entry / "venv" / "pyvenv.cfg").exists():
+                return metadata
+        except (OSError, ValueError):
+            pass
+        # Renamed aside first so a concurrent store can publish again
+        doomed = self.root / f".tmp-broken-{entry.name}-{os.getpid()}"
+        try:
+            os.rename(entry, doomed)
+        except OSError:
+            return None
+        shutil.rmtree(doomed, ignore_errors=True)
+        return None
+    
+    def relocate(self, venv_path: Path, old_prefix: str, new_prefix: str) -> None:
+        """Rewrite absolute venv paths in scripts, activate files and pyvenv.cfg"""
+        if old_prefix == new_prefix:
+            return
+        
+        old, new = old_prefix.encode(), new_prefix.encode()
+        scripts_dir = venv_path / ("Scripts" if os.name == 'nt' else "bin")
+        candidates = [venv_path / "pyvenv.cfg"]
+        if scripts_dir.is_dir():
+            candidates.extend(scripts_dir.iterdir())
+        
+        for path in candidates:
+            if path.is_symlink() or not path.is_file() or path.stat().st_size > self.MAX_SCRIPT_SIZE:
+                continue
+            content = path.read_bytes()
+            if old not in content:
+                continue
+            mode = path.stat().st_mode
+            # Replace the file instead of writing in place so hardlinked
+            # snapshot files in the cache stay untouched
+            path.unlink()
+            path.write_bytes(content.replace(old, new))
+            os.chmod(path, mode)
@@ -0,0 +1,145 @@
+"""
+Pre-built virtual environments and node_modules trees kept ready by the daemon
+"""
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+from .node_store import NodeModulesStore
+from .venv_cache import VenvCache
+
+class WarmPool:
+    """Keep recently requested venvs and node_modules materialized so a project takes one by rename"""
+    
+    READY_FILE = "ready.json"
+    
+    def __init__(self, root: Path, venv_cache: Optional[VenvCache], node_store: Optional[NodeModulesStore],
+                 size: int = 1, ttl: float = 600.0):
+        self.root = root / "pool"
+        self.venv_cache = venv_cache
+        self.node_store = node_store
+        self.size = size
+        self.ttl = ttl
+        # slot name -> (builder, last time a project asked for it)
+        self._slots: Dict[str, Tuple[Callable[[Path], bool], float]] = {}
+        self._lock = threading.Lock()
+    
+    def clear(self) -> None:
+        """Remove every pooled entry, e.g. ones left behind by a previous daemon"""
+        shutil.rmtree(self.root, ignore_errors=True)
+    
+    def take_venv(self, packages: Iterable[str], venv_path: Path) -> bool:
+        """Move a pooled venv for a package set to venv_path, returning False on a miss"""
+        if self.venv_cache is None or venv_path.exists():
+            return False
+        packages = sorted(set(packages))
+        slot = f"venv-{self.venv_cache.get_key(packages)}"
+        self._want(slot, lambda entry: self.venv_cache.materialize(packages, entry / "venv"))
+        
+        entry = self._pop(slot)
+        if entry is None:
+            return False
+        try:
+            with open(entry / self.READY_FILE) as f:
+                # Where the venv was built, before _pop renamed the entry
+                prefix = str(Path(json.load(f)['path']) / "venv")
+            os.rename(entry / "venv", venv_path)
+            self.venv_cache.relocate(venv_path, prefix, str(venv_path))
+        except (OSError, ValueError, KeyError):
+            # Project on another filesystem, or the entry vanished: build it normally
+            shutil.rmtree(venv_path, ignore_errors=True)
+            return False
+        finally:
+            shutil.rmtree(entry, ignore_errors=True)
+        return True
+    
+    def take_node_modules(self, dependencies: Mapping[str, Any], project_path: Path) -> bool:
+        """Move a pooled node_modules tree and lockfile into project_path, returning False on a miss"""
+        if self.node_store is None or (project_path / "node_modules").exists():
+            return False
+        slot = f"node-{self.node_store.get_key(dependencies)}"
+        self._want(slot, lambda entry: self.node_store.materialize(dependencies, entry))
+        
+        entry = self._pop(slot)
+        if entry is None:
+            return False
+        names = ["node_modules"] + [name for name in self.node_store.EXTRA_FILES if (entry / name).exists()]
+        try:
+            for name in names:
+                os.rename(entry / name, project_path / name)
+        except OSError:
+            shutil.rmtree(project_path / "node_modules", ignore_errors=True)
+            for name in self.node_store.EXTRA_FILES:
+                (project_path / name).unlink(missing_ok=True)
+            return False
+        finally:
+            shutil.rmtree(entry, ignore_errors=True)
+        return True
+    
+    def maintain(self) -> None:
+        """Evict slots idle longer than the TTL and refill the rest to the pool size"""
+        now = time.time()
+        with self._lock:
+            idle = [slot for slot, (_, used) in self._slots.items() if now - used > self.ttl]
+            for slot in idle:
+                del self._slots[slot]
+            slots = dict(self._slots)
+        for slot in idle:
+            shutil.rmtree(self.root / slot, ignore_errors=True)
+        
+        for slot, (builder, _) in slots.items():
+            for _ in range(self.size - len(self._ready_entries(slot))):
+                if not self._build(slot, builder):
+                    # Not in the caches yet: the next creation stores it
+                    break
+    
+    def status(self) -> Dict[str, int]:
+        """Get the number of ready entries per slot"""
+        with self._lock:
+            slots = list(self._slots)
+        return {slot: len(self._ready_entries(slot)) for slot in slots}
+    
+    def _want(self, slot: str, builder: Callable[[Path], bool]) -> None:
+        """Record that a project asked for a slot"""
+        with self._lock:
+            self._slots[slot] = (builder, time.time())
+    
+    def _pop(self, slot: str) -> Optional[Path]:
+        """Claim a ready entry by renaming it out of the slot"""
+        for entry in self._ready_entries(slot):
+            claimed = entry.with_name(f".taken-{entry.name}")
+            try:
+                os.rename(entry, claimed)
+            except OSError:
+                # Another job claimed it first
+                continue
+            return claimed
+        return None
+    
+    def _ready_entries(self, slot: str) -> list:
+        """Get fully built entries of a slot"""
+        slot_dir = self.root / slot
+        if not slot_dir.is_dir():
+            return []
+        return [entry for entry in slot_dir.iterdir()
+                if not entry.name.startswith('.') and (entry / self.READY_FILE).exists()]
+    
+    def _build(self, slot: str, builder: Callable[[Path], bool]) -> bool:
+        """Materialize one entry in place, marking it ready last"""
+        entry = self.root / slot / uuid.uuid4().hex
+        entry.mkdir(parents=True)
+        try:
+            if not builder(entry):
+                shutil.rmtree(entry, ignore_errors=True)
+                return False
+            with open(entry / self.READY_FILE, 'w') as f:
+                json.dump({'path': str(entry), 'built': time.time()}, f)
+        except OSError:
+            shutil.rmtree(entry, ignore_errors=True)
+            return False
+        return True
@@ -0,0 +1,63 @@
+"""
+Local wheelhouse for offline Python dependency installs
+"""
+from pathlib import Path
+from typing import Iterable
+import hashlib
+import json
+import platform
+import sys
+import time
+
+from . import record_access
+from .locking import FileLock
+
+class Wheelhouse:
+    """Shared directory of built wheels, populated once per requirement set"""
+    
+    def __init__(self, root: Path):
+        self.path = root / "wheelhouse"
+        self.index_file = self.path / "index.json"
+        self.lock_file = root / "wheelhouse.lock"
+    
+    def lock(self, shared: bool = False) -> FileLock:
+        """Lock the wheelhouse; populate exclusively, install shared"""
+        return FileLock(self.lock_file, shared=shared)
+    
+    def get_key(self, requirements: Iterable[str]) -> str:
+        """Get key for a requirement set on this interpreter and platform"""
+        identity = {
+            'python': f"{sys.implementation.name}{sys.version_info[0]}{sys.version_info[1]}",
+            'platform': f"{sys.platform}-{platform.machine()}",
+            'requirements': sorted(set(requirements))
+        }
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:32]
+    
+    def has(self, requirements: Iterable[str]) -> bool:
+        """Check if a requirement set has been populated"""
+        populated = self.get_key(requirements) in self._load_index()
+        record_access(self.path.parent, "wheelhouse", self.index_file if populated else None)
+        return populated
+    
+    def record(self, requirements: Iterable[str]) -> None:
+        """Mark a requirement set as populated (caller holds the exclusive lock)"""
+        index = self._load_index()
+        index[self.get_key(requirements)] = {
+            'requirements': sorted(set(requirements)),
+            'populated': time.time()
+        }
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(index, f, indent=2)
+        tmp_file.replace(self.index_file)
+    
+    def _load_index(self) -> dict:
+        """Load populated requirement sets"""
+        if not self.index_file.exists():
+            return {}
+        try:
+            with open(self.index_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
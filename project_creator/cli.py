@@ -1,17 +1,40 @@
 """
 Command-line interface
 """
+from contextlib import nullcontext
 import click
 import sys
+import time
 from pathlib import Path
 from typing import Optional
 
-from .config.settings import Config
-from .main import ProjectCreator
+# Keep module imports light: --help and validation errors must not pay for
+# PyYAML, templates, generators or the creation pipeline
 from .utils.validation import ProjectValidator
 from .utils.exceptions import ProjectCreatorError
 
-@click.command()
+class DefaultCommandGroup(click.Group):
+    """Command group that runs a default command when no subcommand is given"""
+    
+    def __init__(self, *args, default_command: str = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+    
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = [self.default_command] + list(args)
+        return super().parse_args(ctx, args)
+
+@click.group(cls=DefaultCommandGroup, default_command='create', no_args_is_help=True)
+def cli():
+    """Create development projects with AI configuration.
+    
+    Runs 'create' when the first argument is not a subcommand,
+    so 'create-project my-app -t react' keeps working. A project named
+    like a subcommand needs the explicit form: 'create-project create sync'.
+    """
+
+@cli.command('create')
 @click.argument('project_name')
 @click.option('--type', '-t', 'project_type', 
               default='python', 
@@ -26,23 +49,47 @@ from .utils.exceptions import ProjectCreatorError
               help='Skip Git initialization')
 @click.option('--config', '-c', 'config_file',
               help='Custom configuration file')
+@click.option('--refresh-wheelhouse', is_flag=True,
+              help='Re-download wheels into the local wheelhouse')
+@click.option('--trace', 'trace_file', type=click.Path(dir_okay=False),
+              help='Write timing spans in Chrome trace-event format')
+@click.option('--profile', 'profile_file', type=click.Path(dir_okay=False),
+              help='Profile the run in-process and write pstats data to this file')
+@click.option('--daemon/--no-daemon', 'use_daemon', default=None,
+              help='Run in the background daemon (default: when one is running and no --config is given)')
 def create_project(project_name: str, 
                   project_type: str,
                   project_path: Optional[str],
                   force: bool,
                   no_deps: bool,
                   no_git: bool,
-                  config_file: Optional[str]):
+                  config_file: Optional[str],
+                  refresh_wheelhouse: bool,
+                  trace_file: Optional[str],
+                  profile_file: Optional[str],
+                  use_daemon: Optional[bool]):
     """Create a new development project with AI configuration"""
     
     try:
+        # Validation
+        ProjectValidator.validate_project_name(project_name)
+        
+        if profile_file and use_daemon:
+            raise ProjectCreatorError("--profile measures this process, it cannot run in the daemon")
+        if use_daemon is not False and not config_file and not profile_file:
+            full_project_path = _create_with_daemon(project_name, project_type, project_path, force, no_deps,
+                                                    no_git, refresh_wheelhouse, trace_file)
+            if full_project_path is not None:
+                _print_created(project_name, project_type, full_project_path, no_deps)
+                return
+        if use_daemon:
+            raise ProjectCreatorError("No create-project daemon is running (start one with 'create-project daemon start')")
+        
         # Load configuration
+        from .config.settings import Config
         config_path = Path(config_file) if config_file else None
         config = Config(config_path)
         
-        # Validation
-        ProjectValidator.validate_project_name(project_name)
-        
         # Determine project path
         base_path = Path(project_path or config.get('default_project_path'))
         full_project_path = base_path / project_name
@@ -50,36 +97,393 @@ def create_project(project_name: str,
         ProjectValidator.validate_project_path(full_project_path, force)
         
         # Create project
-        creator = ProjectCreator(config)
-        creator.create_project(
-            name=project_name,
-            project_type=project_type,
-            path=full_project_path,
-            install_deps=not no_deps,
-            init_git=not no_git,
-            force=force
-        )
+        from .main import ProjectCreator
+        from .utils.tracing import Tracer
+        tracer = Tracer()
+        creator = ProjectCreator(config, tracer=tracer)
+        profiler = None
+        if profile_file:
+            from .utils.profiling import Profiler
+            profiler = Profiler()
+        try:
+            with profiler or nullcontext():
+                creator.create_project(
+                    name=project_name,
+                    project_type=project_type,
+                    path=full_project_path,
+                    install_deps=not no_deps,
+                    init_git=not no_git,
+                    force=force,
+                    refresh_wheelhouse=refresh_wheelhouse
+                )
+        finally:
+            # Slow and failed runs are the ones worth a trace
+            if trace_file:
+                tracer.export_chrome_trace(Path(trace_file))
+                click.echo(f"📈 Trace written to {trace_file}")
+            if profiler:
+                profiler.dump_stats(Path(profile_file))
+                click.echo(profiler.report(tracer))
+                click.echo(f"🔬 Profile written to {profile_file} (load with pstats or snakeviz)")
         
-        click.echo(f"✅ Project '{project_name}' created successfully!")
-        click.echo(f"📁 Location: {full_project_path}")
+        _print_created(project_name, project_type, full_project_path, no_deps)
+    
+    except ProjectCreatorError as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"❌ Unexpected error: {e}", err=True)
+        sys.exit(1)
+
+def _create_with_daemon(project_name: str, project_type: str, project_path: Optional[str], force: bool,
+                        no_deps: bool, no_git: bool, refresh_wheelhouse: bool,
+                        trace_file: Optional[str]) -> Optional[Path]:
+    """Submit the project to a running daemon, returning None when there is none"""
+    import json
+    from .daemon import DaemonClient
+    
+    client = DaemonClient()
+    if not client.available():
+        return None
+    
+    path = Path(project_path).expanduser().resolve() / project_name if project_path else None
+    done = client.create(
+        on_progress=lambda current, total, message: click.echo(f"[{current}/{total}] {message}"),
+        name=project_name, project_type=project_type, path=path, install_deps=not no_deps,
+        init_git=not no_git, force=force, refresh_wheelhouse=refresh_wheelhouse, trace=bool(trace_file)
+    )
+    if trace_file:
+        Path(trace_file).write_text(json.dumps(done['trace']))
+        click.echo(f"📈 Trace written to {trace_file}")
+    return Path(done['path'])
+
+def _print_created(project_name: str, project_type: str, full_project_path: Path, no_deps: bool) -> None:
+    """Print the success message and next steps"""
+    click.echo(f"✅ Project '{project_name}' created successfully!")
+    click.echo(f"📁 Location: {full_project_path}")
+    
+    # Show next steps
+    click.echo(f"\nNext steps:")
+    if project_type in ['django', 'python', 'fullstack']:
+        click.echo(f"  cd {full_project_path}")
+        click.echo(f"  source venv/bin/activate")
+        if not no_deps:
+            click.echo(f"  pip install -r requirements.txt")
+    
+    if project_type in ['react', 'fullstack'] and not no_deps:
+        click.echo(f"  npm install")
+
+@cli.command()
+@click.argument('manifest', type=click.Path(exists=True, dir_okay=False))
+@click.option('--jobs', '-j', type=int,
+              help='Maximum number of projects created concurrently')
+@click.option('--config', '-c', 'config_file',
+              help='Custom configuration file')
+def batch(manifest: str, jobs: Optional[int], config_file: Optional[str]):
+    """Create many projects from a YAML manifest"""
+    from .batch import load_manifest, run_batch
+    from .config.settings import Config
+    
+    try:
+        config_path = Path(config_file) if config_file else None
+        config = Config(config_path)
+        specs = load_manifest(Path(manifest), config)
         
-        # Show next steps
-        click.echo(f"\nNext steps:")
-        if project_type in ['django', 'python', 'fullstack']:
-            click.echo(f"  cd {full_project_path}")
-            click.echo(f"  source venv/bin/activate")
-            if not no_deps:
-                click.echo(f"  pip install -r requirements.txt")
+        def report(result):
+            status = "✅" if result['ok'] else "❌"
+            click.echo(f"{status} {result['name']} ({result['type']}) in {result['seconds']:.1f}s")
         
-        if project_type in ['react', 'fullstack'] and not no_deps:
-            click.echo(f"  npm install")
+        start = time.perf_counter()
+        results = run_batch(specs, config_path, jobs or config.get('batch_concurrency'), report)
+        elapsed = time.perf_counter() - start
+    except ProjectCreatorError as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+    
+    succeeded = [r for r in results if r['ok']]
+    failed = [r for r in results if not r['ok']]
+    
+    click.echo(f"\nBatch summary:")
+    width = max(len(r['name']) for r in results) if results else 0
+    for result in results:
+        status = "ok" if result['ok'] else f"failed: {result['error']}"
+        click.echo(f"  {result['name']:<{width}}  {result['type']:<10} {result['seconds']:7.1f}s  {status}")
+    throughput = len(results) / elapsed * 60 if elapsed else 0.0
+    click.echo(f"\n{len(succeeded)} succeeded, {len(failed)} failed in {elapsed:.1f}s "
+               f"({throughput:.1f} projects/min)")
+    
+    if failed:
+        sys.exit(1)
+
+@cli.command()
+@click.argument('project_path', default='.', type=click.Path(exists=True, file_okay=False))
+@click.option('--type', '-t', 'project_type',
+              help='Template to apply (default: the one the project was created with)')
+@click.option('--no-deps', is_flag=True,
+              help='Skip dependency installation')
+@click.option('--force', '-f', is_flag=True,
+              help='Overwrite locally modified files with the template output')
+@click.option('--config', '-c', 'config_file',
+              help='Custom configuration file')
+def sync(project_path: str, project_type: Optional[str], no_deps: bool, force: bool,
+         config_file: Optional[str]):
+    """Re-apply the template to an existing project, rewriting only what changed"""
+    from .config.settings import Config
+    from .main import ProjectCreator
+    
+    try:
+        config = Config(Path(config_file) if config_file else None)
+        creator = ProjectCreator(config)
+        report = creator.sync_project(Path(project_path).resolve(), project_type,
+                                      install_deps=not no_deps, force=force)
+    except ProjectCreatorError as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+    
+    changed = len(report['added']) + len(report['updated']) + len(report['removed'])
+    click.echo(f"🔄 Synced {Path(report['path']).name} ({report['template']}) in {report['seconds']:.2f}s: "
+               f"{changed} changed, {report['unchanged']} unchanged, {len(report['conflicts'])} conflicts")
+    for kind in ('added', 'updated', 'removed'):
+        for relative_path in report[kind]:
+            click.echo(f"  {kind:<9} {relative_path}")
+    for relative_path in report['conflicts']:
+        click.echo(f"  conflict  {relative_path} (locally modified, kept; use --force to overwrite)")
+    for tool in report['installed']:
+        click.echo(f"  📦 {tool} install (dependencies changed)")
+    for tool in report['skipped']:
+        click.echo(f"  ⏭️  {tool} skipped (dependencies unchanged)")
+
+@cli.group()
+def lock():
+    """Manage cached npm lockfiles"""
+
+@lock.command('refresh')
+@click.option('--type', '-t', 'project_types', multiple=True,
+              help='Template to refresh (default: every template with frontend dependencies)')
+@click.option('--config', '-c', 'config_file',
+              help='Custom configuration file')
+def refresh_locks(project_types: tuple, config_file: Optional[str]):
+    """Re-resolve frontend dependency versions and refresh the cached lockfiles"""
+    import tempfile
+    from .cache import get_cache_root
+    from .cache.npm_locks import NpmLockCache
+    from .config.settings import Config
+    from .templates import get_template, list_templates
+    from .utils.file_ops import DependencyManager
+    from .utils.process import CommandRunner
+    
+    failed = False
+    try:
+        config = Config(Path(config_file) if config_file else None)
+        npm_locks = NpmLockCache(get_cache_root(config))
+        runner = CommandRunner(tools=config.get('tool_paths'), timeout=config.get('command_timeout', 1800))
         
+        for project_type in project_types or list_templates():
+            ProjectValidator.validate_template_name(project_type, list_templates())
+            frontend = get_template(project_type).artifacts.frontend_dependencies
+            if not frontend:
+                if project_types:
+                    click.echo(f"⏭️  {project_type} has no frontend dependencies")
+                continue
+            
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                resolve_path = Path(tmp_dir) / project_type
+                resolve_path.mkdir()
+                manager = DependencyManager(resolve_path, runner=runner, npm_locks=npm_locks)
+                entry = manager.resolve_node_lock(frontend)
+            
+            if entry is None:
+                click.echo(f"❌ {project_type}: npm did not resolve every dependency", err=True)
+                failed = True
+                continue
+            click.echo(f"✅ {project_type}: {len(entry['versions'])} packages pinned")
+            for package, version in sorted(entry['versions'].items()):
+                click.echo(f"  {package}@{version}")
     except ProjectCreatorError as e:
         click.echo(f"❌ Error: {e}", err=True)
         sys.exit(1)
-    except Exception as e:
-        click.echo(f"❌ Unexpected error: {e}", err=True)
+    
+    if failed:
+        sys.exit(1)
+
+@cli.group()
+def cache():
+    """Inspect and maintain the local caches"""
+
+def _cache_manager(config_file: Optional[str]):
+    """Get the cache manager for a configuration file"""
+    from .cache.manager import CacheManager
+    from .config.settings import Config
+    return CacheManager.from_config(Config(Path(config_file) if config_file else None))
+
+def _format_size(size: int) -> str:
+    """Format a byte count for display"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def _cache_names(ctx, param, value):
+    """Validate cache names against the known caches"""
+    from .cache.manager import DEFAULT_LIMITS_MB
+    names = list(DEFAULT_LIMITS_MB) + ['pool']
+    for name in value if isinstance(value, tuple) else filter(None, [value]):
+        if name not in names:
+            raise click.BadParameter(f"unknown cache '{name}', choose from {', '.join(names)}")
+    return value
+
+@cache.command('ls')
+@click.argument('name', required=False, callback=_cache_names)
+@click.option('--config', '-c', 'config_file',
+              help='Custom configuration file')
+def cache_ls(name: Optional[str], config_file: Optional[str]):
+    """List caches, or the entries of one cache by last use"""
+    manager = _cache_manager(config_file)
+    if name:
+        cache = manager.get(name)
+        now = time.time()
+        for entry in sorted(cache.entries(), key=lambda entry: entry.last_used, reverse=True):
+            click.echo(f"  {entry.name:<48} {_format_size(entry.size):>10}  "
+                       f"used {(now - entry.last_used) / 3600:.1f}h ago")
+        return
+    
+    click.echo(f"📦 Caches in {manager.root}")
+    for cache in manager.caches:
+        limit = manager.limit(cache)
+        budget = _format_size(limit) if limit and cache.prunable else "unlimited" if cache.prunable else "kept"
+        click.echo(f"  {cache.name:<16} {len(cache.entries()):>6} entries {_format_size(cache.size()):>10} "
+                   f"/ {budget:<10} {cache.description}")
+
+@cache.command('stats')
+@click.option('--config', '-c', 'config_file',
+              help='Custom configuration file')
+def cache_stats(config_file: Optional[str]):
+    """Show hit rates and bytes saved per cache"""
+    manager = _cache_manager(config_file)
+    stats = manager.stats()
+    click.echo(f"📊 {'cache':<16} {'hits':>8} {'misses':>8} {'hit rate':>9} {'saved':>10}")
+    for cache in manager.caches:
+        counts = stats.get(cache.name)
+        if not counts:
+            continue
+        lookups = counts['hits'] + counts['misses']
+        rate = f"{100 * counts['hits'] / lookups:.0f}%" if lookups else "-"
+        click.echo(f"   {cache.name:<16} {counts['hits']:>8} {counts['misses']:>8} {rate:>9} "
+                   f"{_format_size(counts['bytes_saved']):>10}")
+
+@cache.command('prune')
+@click.option('--cache', 'names', multiple=True, callback=_cache_names,
+              help='Cache to prune (default: all)')
+@click.option('--all', 'everything', is_flag=True, help='Remove every entry instead of fitting the budget')
+@click.option('--config', '-c', 'config_file',
+              help='Custom configuration file')
+def cache_prune(names: tuple, everything: bool, config_file: Optional[str]):
+    """Evict least recently used entries until each cache fits its budget"""
+    results = _cache_manager(config_file).prune(names, everything)
+    for name, removed, freed in results:
+        click.echo(f"🧹 {name:<16} {removed:>6} entries removed, {_format_size(freed)} freed")
+
+@cache.command('verify')
+@click.option('--cache', 'names', multiple=True, callback=_cache_names,
+              help='Cache to verify (default: all)')
+@click.option('--fix', is_flag=True, help='Remove broken entries')
+@click.option('--config', '-c', 'config_file',
+              help='Custom configuration file')
+def cache_verify(names: tuple, fix: bool, config_file: Optional[str]):
+    """Check the integrity of every cache entry"""
+    problems = _cache_manager(config_file).verify(names, fix)
+    for name, entry, problem in problems:
+        click.echo(f"❌ {name}/{entry.name}: {problem}{' (removed)' if fix else ''}", err=True)
+    if not problems:
+        click.echo("✅ All cache entries intact")
+    elif not fix:
+        sys.exit(1)
+
+@cli.group()
+def daemon():
+    """Run a background server that keeps templates and warm environments loaded"""
+
+@daemon.command('start')
+@click.option('--foreground', is_flag=True, help='Serve in this process instead of detaching')
+@click.option('--config', '-c', 'config_file',
+              help='Custom configuration file')
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False),
+              help='Unix socket to listen on (default: $CREATE_PROJECT_SOCKET or ~/.create_project/daemon.sock)')
+def start_daemon(foreground: bool, config_file: Optional[str], socket_path: Optional[str]):
+    """Start the daemon"""
+    import subprocess
+    from .daemon import DaemonClient, default_socket_path
+    
+    socket_path = Path(socket_path).expanduser() if socket_path else default_socket_path()
+    client = DaemonClient(socket_path)
+    if client.available():
+        click.echo(f"✅ Daemon already running on {socket_path}")
+        return
+    
+    if foreground:
+        from .config.settings import Config
+        from .daemon import DaemonServer
+        try:
+            server = DaemonServer(Config(Path(config_file) if config_file else None), socket_path)
+        except ProjectCreatorError as e:
+            click.echo(f"❌ Error: {e}", err=True)
+            sys.exit(1)
+        click.echo(f"🟢 Listening on {socket_path}")
+        try:
+            server.serve()
+        except KeyboardInterrupt:
+            pass
+        return
+    
+    command = [sys.executable, "-m", "project_creator.cli", "daemon", "start", "--foreground",
+               "--socket", str(socket_path)]
+    if config_file:
+        command += ["--config", str(Path(config_file).resolve())]
+    log_path = socket_path.with_suffix(".log")
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, 'ab') as log:
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                                   start_new_session=True)
+    
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if client.available():
+            click.echo(f"✅ Daemon started (pid {process.pid}) on {socket_path}, log: {log_path}")
+            return
+        if process.poll() is not None:
+            break
+        time.sleep(0.1)
+    click.echo(f"❌ Daemon did not start, see {log_path}", err=True)
+    sys.exit(1)
+
+@daemon.command('stop')
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False), help='Daemon socket')
+def stop_daemon(socket_path: Optional[str]):
+    """Stop the daemon after its running jobs"""
+    from .daemon import DaemonClient
+    
+    client = DaemonClient(Path(socket_path).expanduser() if socket_path else None)
+    if not client.available():
+        click.echo("⏹️  No daemon running")
+        return
+    client.shutdown()
+    click.echo("⏹️  Daemon stopping")
+
+@daemon.command('status')
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False), help='Daemon socket')
+def daemon_status(socket_path: Optional[str]):
+    """Show the daemon's jobs and warm pool"""
+    from .daemon import DaemonClient
+    
+    client = DaemonClient(Path(socket_path).expanduser() if socket_path else None)
+    if not client.available():
+        click.echo("⏹️  No daemon running")
         sys.exit(1)
+    status = client.status()
+    click.echo(f"🟢 Daemon pid {status['pid']} on {client.socket_path}, up {status['uptime']:.0f}s, "
+               f"{status['jobs']} running jobs")
+    for slot, ready in sorted(status['pool'].items()):
+        click.echo(f"  {slot:<40} {ready} ready")
 
 if __name__ == "__main__":
-    create_project()
+    cli()
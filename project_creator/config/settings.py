@@ -24,10 +24,35 @@ class Config:
         return {
             'default_project_path': str(Path.home() / "Development"),
             'preferred_package_manager': 'npm',
+            'python_installer': 'pip',
             'auto_install_dependencies': True,
             'create_git_repo': True,
             'ai_assistant_enabled': True,
-            'logging_level': 'INFO'
+            'logging_level': 'INFO',
+            'cache_dir': str(Path.home() / ".create_project" / "cache"),
+            'venv_cache_enabled': True,
+            'fast_venv_enabled': True,
+            'layered_venvs': False,
+            'node_store_enabled': True,
+            'npm_lock_cache_enabled': True,
+            'python_lock_cache_enabled': True,
+            'wheelhouse_enabled': True,
+            'cache_limits_mb': {
+                'venvs': 4096,
+                'node': 4096,
+                'npm-locks': 64,
+                'python-locks': 64,
+                'wheelhouse': 2048,
+                'template-repos': 1024
+            },
+            'cache_prune_interval': 86400,
+            'max_parallel_tasks': 4,
+            'max_heavy_commands': 2,
+            'command_timeout': 1800,
+            'daemon_pool_size': 1,
+            'daemon_pool_ttl': 600,
+            'fsync_files': False,
+            'git_backend': 'auto'
         }
     
     def get(self, key: str, default: Any = None) -> Any:
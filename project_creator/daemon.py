@@ -0,0 +1,271 @@
+"""
+Long-running creation server on a Unix socket, and the client the CLI and GUI use
+
+The protocol is newline-delimited JSON: one request line from the client,
+then event lines from the server until 'done' or 'error'. Closing the
+connection cancels the job.
+"""
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+
+from .utils import exceptions
+from .utils.exceptions import OperationCancelledError, ProjectCreatorError
+
+SOCKET_ENV = "CREATE_PROJECT_SOCKET"
+PING_TIMEOUT = 1.0
+
+def default_socket_path() -> Path:
+    """Get the daemon socket path, overridable through CREATE_PROJECT_SOCKET"""
+    return Path(os.environ.get(SOCKET_ENV) or Path.home() / ".create_project" / "daemon.sock").expanduser()
+
+class DaemonClient:
+    """Submit jobs to a running daemon and stream their events back"""
+    
+    def __init__(self, socket_path: Optional[Path] = None):
+        self.socket_path = Path(socket_path or default_socket_path())
+        self._socket: Optional[socket.socket] = None
+    
+    def available(self) -> bool:
+        """Check if a daemon answers on the socket"""
+        try:
+            return self.ping() is not None
+        except (OSError, ValueError):
+            return False
+    
+    def ping(self) -> Optional[Dict[str, Any]]:
+        """Get the daemon's pid and uptime"""
+        return next(self._request({'command': 'ping'}, PING_TIMEOUT), None)
+    
+    def status(self) -> Dict[str, Any]:
+        """Get the daemon's jobs and warm pool state"""
+        return next(self._request({'command': 'status'}, PING_TIMEOUT))
+    
+    def shutdown(self) -> None:
+        """Ask the daemon to exit once running jobs finish"""
+        for _ in self._request({'command': 'shutdown'}, PING_TIMEOUT):
+            pass
+    
+    def create(self, on_progress: Optional[Callable[[int, int, str], None]] = None,
+               on_output: Optional[Callable[[str], None]] = None, **create_kwargs) -> Dict[str, Any]:
+        """Create a project in the daemon, returning its 'done' event"""
+        request = {'command': 'create', **{key: str(value) if isinstance(value, Path) else value
+                                           for key, value in create_kwargs.items()}}
+        for event in self._request(request, None):
+            if event['event'] == 'progress' and on_progress:
+                on_progress(event['current'], event['total'], event['message'])
+            elif event['event'] == 'output' and on_output:
+                on_output(event['line'])
+            elif event['event'] == 'done':
+                return event
+            elif event['event'] == 'error':
+                error = getattr(exceptions, event.get('type', ''), None)
+                if not (isinstance(error, type) and issubclass(error, ProjectCreatorError)):
+                    error = ProjectCreatorError
+                raise error(event['message'])
+        raise ProjectCreatorError("Daemon closed the connection before the job finished")
+    
+    def cancel(self) -> None:
+        """Cancel the running job by closing its connection"""
+        sock = self._socket
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    
+    def _request(self, request: Dict[str, Any], timeout: Optional[float]) -> Iterator[Dict[str, Any]]:
+        """Send a request and yield the events it produces"""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        self._socket = sock
+        try:
+            sock.connect(str(self.socket_path))
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile('rb') as stream:
+                for line in stream:
+                    yield json.loads(line)
+        finally:
+            self._socket = None
+            sock.close()
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    """Serve one client request"""
+    
+    def setup(self):
+        super().setup()
+        self._send_lock = threading.Lock()
+        self._client_gone = False
+    
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline() or b'{}')
+        except ValueError:
+            request = {}
+        command = request.get('command')
+        
+        if command == 'ping':
+            self._send({'event': 'pong', 'pid': os.getpid(), 'uptime': time.time() - self.server.started})
+        elif command == 'status':
+            self._send({'event': 'status', 'pid': os.getpid(), 'uptime': time.time() - self.server.started,
+                        'jobs': self.server.active_jobs,
+                        'pool': self.server.pool.status() if self.server.pool else {}})
+        elif command == 'shutdown':
+            self._send({'event': 'bye'})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif command == 'create':
+            self._create(request)
+        else:
+            self._send({'event': 'error', 'type': 'ValidationError', 'message': f"Unknown command '{command}'"})
+    
+    def _create(self, request: Dict[str, Any]) -> None:
+        """Run a creation job, streaming progress and cancelling when the client goes away"""
+        from .main import ProjectCreator
+        from .utils.tracing import Tracer
+        
+        creator = ProjectCreator(
+            self.server.config,
+            progress_callback=lambda current, total, message: self._send(
+                {'event': 'progress', 'current': current, 'total': total, 'message': message}),
+            output_callback=lambda line: self._send({'event': 'output', 'line': line}),
+            tracer=Tracer(),
+            warm_pool=self.server.pool
+        )
+        self._creator = creator
+        finished = threading.Event()
+        
+        def watch_client():
+            # The client never writes after its request, so EOF means it went away
+            try:
+                self.rfile.read(1)
+            except (OSError, ValueError):
+                pass
+            if not finished.is_set():
+                self._client_gone = True
+                creator.cancel()
+        threading.Thread(target=watch_client, name="client-watch", daemon=True).start()
+        
+        path = Path(request.get('path') or Path(self.server.config.get('default_project_path')) / request['name'])
+        path = path.expanduser()
+        self.server.job_started()
+        try:
+            creator.create_project(
+                name=request['name'],
+                project_type=request.get('project_type', 'python'),
+                path=path,
+                install_deps=request.get('install_deps', True),
+                init_git=request.get('init_git', True),
+                force=request.get('force', False),
+                refresh_wheelhouse=request.get('refresh_wheelhouse', False)
+            )
+            event = {'event': 'done', 'path': str(path)}
+            if request.get('trace'):
+                event['trace'] = creator.tracer.to_chrome_trace()
+        except OperationCancelledError as e:
+            event = {'event': 'error', 'type': 'OperationCancelledError', 'message': str(e)}
+        except Exception as e:
+            if self._client_gone:
+                e = OperationCancelledError("Project creation was cancelled")
+            event = {'event': 'error', 'type': type(e).__name__, 'message': str(e)}
+        finally:
+            finished.set()
+            self.server.job_finished()
+        self._send(event)
+    
+    def _send(self, event: Dict[str, Any]) -> None:
+        """Write one event line; a vanished client cancels its job"""
+        with self._send_lock:
+            if self._client_gone:
+                return
+            try:
+                self.wfile.write(json.dumps(event).encode() + b"\n")
+                self.wfile.flush()
+                return
+            except OSError:
+                self._client_gone = True
+        creator = getattr(self, '_creator', None)
+        if creator is not None:
+            # Output events are sent from the command loop, which cancel() must not block
+            threading.Thread(target=creator.cancel, name="client-gone", daemon=True).start()
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Keep config, templates and a warm pool resident and create projects for clients"""
+    
+    daemon_threads = True
+    
+    def __init__(self, config: Any, socket_path: Optional[Path] = None):
+        from .cache import get_cache_root
+        from .cache.node_store import NodeModulesStore
+        from .cache.venv_cache import VenvCache
+        from .cache.warm_pool import WarmPool
+        from .templates import _TEMPLATES, get_template
+        
+        self.config = config
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.started = time.time()
+        self.active_jobs = 0
+        self._jobs_lock = threading.Lock()
+        self._wake = threading.Event()
+        
+        self.pool = None
+        if config.get('daemon_pool_size', 1) > 0:
+            root = get_cache_root(config)
+            self.pool = WarmPool(
+                root,
+                VenvCache(root) if config.get('venv_cache_enabled', True) else None,
+                NodeModulesStore(root) if config.get('node_store_enabled', True) else None,
+                config.get('daemon_pool_size', 1),
+                config.get('daemon_pool_ttl', 600)
+            )
+            self.pool.clear()
+        
+        # Import every template and build its artifacts once so jobs start warm
+        for name in list(_TEMPLATES):
+            get_template(name).artifacts
+        
+        if DaemonClient(self.socket_path).available():
+            raise ProjectCreatorError(f"A daemon is already listening on {self.socket_path}")
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        super().__init__(str(self.socket_path), _JobHandler)
+        os.chmod(self.socket_path, 0o600)
+    
+    def job_started(self) -> None:
+        """Count a running job"""
+        with self._jobs_lock:
+            self.active_jobs += 1
+    
+    def job_finished(self) -> None:
+        """Count a finished job and let the pool refill what it took"""
+        with self._jobs_lock:
+            self.active_jobs -= 1
+        self._wake.set()
+    
+    def serve(self) -> None:
+        """Serve until shutdown, maintaining the warm pool in the background"""
+        if self.pool is not None:
+            threading.Thread(target=self._maintain_pool, name="warm-pool", daemon=True).start()
+        try:
+            self.serve_forever()
+        finally:
+            self.server_close()
+            self.socket_path.unlink(missing_ok=True)
+            if self.pool is not None:
+                self.pool.clear()
+    
+    def _maintain_pool(self) -> None:
+        """Refill after every job and evict idle entries periodically"""
+        interval = min(max(self.pool.ttl / 4, 1.0), 30.0)
+        while True:
+            self._wake.wait(interval)
+            self._wake.clear()
+            try:
+                self.pool.maintain()
+            except OSError:
+                # Best effort: a failed refill just means a slower next job
+                pass
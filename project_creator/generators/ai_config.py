@@ -1,14 +1,14 @@
 """
 AI configuration generators
 """
-from pathlib import Path
 from ..templates.base import ProjectTemplate
+from ..utils.file_ops import FileManager
 
 class AIConfigGenerator:
     """Generate AI assistant configuration files"""
     
-    def __init__(self, project_path: Path):
-        self.project_path = project_path
+    def __init__(self, file_manager: FileManager):
+        self.file_manager = file_manager
     
     def create_cursor_rules(self, template: ProjectTemplate) -> None:
         """Create .cursorrules file with project-specific rules"""
@@ -74,8 +74,7 @@ class AIConfigGenerator:
         
         rules_content = base_rules + type_specific_rules.get(template.name, '')
         
-        with open(self.project_path / '.cursorrules', 'w') as f:
-            f.write(rules_content)
+        self.file_manager.add_file('.cursorrules', rules_content)
     
     def create_claude_ignore(self, template: ProjectTemplate) -> None:
         """Create .claudeignore file"""
@@ -101,5 +100,4 @@ class AIConfigGenerator:
                 "out/"
             ])
         
-        with open(self.project_path / '.claudeignore', 'w') as f:
-            f.write('\n'.join(ignore_patterns))
+        self.file_manager.add_file('.claudeignore', '\n'.join(ignore_patterns))
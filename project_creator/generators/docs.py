@@ -1,15 +1,15 @@
 """
 Documentation generators
 """
-from pathlib import Path
 import platform
 from ..templates.base import ProjectTemplate
+from ..utils.file_ops import FileManager
 
 class DocumentationGenerator:
     """Generate project documentation"""
     
-    def __init__(self, project_path: Path):
-        self.project_path = project_path
+    def __init__(self, file_manager: FileManager):
+        self.file_manager = file_manager
     
     def create_readme(self, project_name: str, template: ProjectTemplate) -> None:
         """Create comprehensive README with AI context"""
@@ -84,5 +84,4 @@ Dette projekt er et **{template.description}**.
 {"- TypeScript: `npm test` (setup required)" if template.has_frontend_dependencies() else ""}
 """
         
-        with open(self.project_path / 'README.md', 'w') as f:
-            f.write(readme_content)
+        self.file_manager.add_file('README.md', readme_content)
@@ -2,25 +2,27 @@
 Setup and initialization generators
 """
 from pathlib import Path
+from typing import Dict, Iterable, Optional
 import subprocess
 from ..templates.base import ProjectTemplate
+from ..cache.shared_pip import SharedPip
+from ..cache.venv_cache import VenvCache
+from ..utils.process import CommandRunner
+from ..utils.git_writer import NativeGitWriter
+from ..utils.exceptions import UnsupportedRepositoryError
 
 class SetupGenerator:
     """Generate setup and initialization files"""
     
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, venv_cache: Optional[VenvCache] = None,
+                 runner: Optional[CommandRunner] = None, shared_pip: Optional[SharedPip] = None):
         self.project_path = project_path
+        self.venv_cache = venv_cache
+        self.runner = runner or CommandRunner()
+        self.shared_pip = shared_pip
     
-    def create_git_setup(self) -> None:
-        """Initialize Git repository and create .gitignore"""
-        # Initialize Git (or reinitialize if exists)
-        try:
-            subprocess.run(["git", "init"], cwd=self.project_path, check=True)
-        except subprocess.CalledProcessError:
-            # Git repo might already exist, try to reinitialize
-            subprocess.run(["git", "init"], cwd=self.project_path, check=True)
-        
-        # Create .gitignore
+    def get_gitignore(self) -> str:
+        """Get .gitignore content"""
         gitignore_content = """
 # Dependencies
 node_modules/
@@ -53,21 +55,66 @@ Thumbs.db
 # Logs
 *.log
 """
-        with open(self.project_path / '.gitignore', 'w') as f:
-            f.write(gitignore_content.strip())
+        return gitignore_content.strip()
+    
+    def create_git_setup(self, known_files: Optional[Dict[str, bytes]] = None, backend: str = "auto") -> str:
+        """Initialize Git repository, creating .gitignore if missing, returning the backend used"""
+        gitignore = self.project_path / '.gitignore'
+        if not gitignore.exists():
+            with open(gitignore, 'w') as f:
+                f.write(self.get_gitignore())
+        
+        if backend != "subprocess":
+            try:
+                with self.runner.tracer.span("git initial commit", "command", backend="native"):
+                    NativeGitWriter(self.project_path).create_initial_commit("Initial commit", known_files)
+                return "native"
+            except UnsupportedRepositoryError:
+                if backend == "native":
+                    raise
+        
+        self._create_git_setup_subprocess()
+        return "subprocess"
+    
+    def _create_git_setup_subprocess(self) -> None:
+        """Initialize and commit by running git"""
+        git = self.runner.resolve_tool('git', "git")
+        
+        # Initialize Git (or reinitialize if exists)
+        try:
+            self.runner.run([git, "init"], cwd=self.project_path)
+        except subprocess.CalledProcessError:
+            # Git repo might already exist, try to reinitialize
+            self.runner.run([git, "init"], cwd=self.project_path)
         
         # Add and commit only if there are changes
         try:
-            subprocess.run(["git", "add", "."], cwd=self.project_path, check=True)
+            self.runner.run([git, "add", "."], cwd=self.project_path)
             # Check if there are changes to commit
-            result = subprocess.run(["git", "status", "--porcelain"], cwd=self.project_path, capture_output=True, text=True, check=True)
+            result = self.runner.run([git, "status", "--porcelain"], cwd=self.project_path, capture=True)
             if result.stdout.strip():
-                subprocess.run(["git", "commit", "-m", "Initial commit"], cwd=self.project_path, check=True)
+                self.runner.run([git, "commit", "-m", "Initial commit"], cwd=self.project_path)
         except subprocess.CalledProcessError:
             # Git operations might fail, but that's okay
             pass
     
-    def create_virtual_environment(self) -> None:
-        """Create Python virtual environment"""
+    def create_virtual_environment(self, packages: Iterable[str] = ()) -> bool:
+        """Create Python virtual environment, returning True when cloned from the cache"""
+        if self.venv_cache and self.venv_cache.materialize(packages, self.project_path / "venv"):
+            return True
+        
         import sys
-        subprocess.run([sys.executable, "-m", "venv", "venv"], cwd=self.project_path, check=True)
+        python = self.runner.resolve_tool('python', sys.executable)
+        if self.shared_pip and python == sys.executable:
+            # Same interpreter: skip the fork and ensurepip's per-venv pip install
+            with self.runner.tracer.span("venv in-process", "command") as span:
+                span.args['created'] = self.shared_pip.create_venv(self.project_path / "venv")
+            if span.args['created']:
+                return False
+        self.runner.run([python, "-m", "venv", "venv"], cwd=self.project_path, heavy=True)
+        return False
+    
+    def snapshot_virtual_environment(self, packages: Iterable[str] = ()) -> None:
+        """Store the project virtual environment in the cache for later projects"""
+        if self.venv_cache:
+            self.venv_cache.store(packages, self.project_path / "venv")
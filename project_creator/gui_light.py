@@ -6,32 +6,40 @@ from tkinter import ttk, messagebox, filedialog
 from pathlib import Path
 import sys
 import os
+import queue
 
 # Add the project root to the path so we can import our modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from project_creator.config.simple_settings import SimpleConfig
-from project_creator.main import ProjectCreator
 from project_creator.utils.validation import ProjectValidator
 from project_creator.utils.exceptions import ProjectCreatorError
 
+# Milliseconds between polls of the worker event queue
+POLL_INTERVAL = 100
+
 class ProjectCreatorLightGUI:
     """Light GUI application for creating projects"""
     
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Project Creator")
-        self.root.geometry("600x500")
+        self.root.geometry("600x720")
         self.root.resizable(True, True)
         
         # Configure style
         self.style = ttk.Style()
         self.style.theme_use('clam')
         
+        # Running creation, if any
+        self.worker = None
+        
         # Load configuration
         self.config = SimpleConfig()
         
         self.setup_ui()
+        # Closing the window must not leave installs running in their own sessions
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
     def setup_ui(self):
         """Setup the user interface"""
@@ -43,6 +51,7 @@ class ProjectCreatorLightGUI:
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
         main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(9, weight=1)
         
         # Title
         title_label = ttk.Label(main_frame, text="🚀 Project Creator", 
@@ -102,11 +111,11 @@ class ProjectCreatorLightGUI:
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=6, column=0, columnspan=2, pady=20)
         
-        create_btn = ttk.Button(button_frame, text="Create Project", 
-                               command=self.create_project, style="Accent.TButton")
-        create_btn.pack(side=tk.LEFT, padx=(0, 10))
+        self.create_btn = ttk.Button(button_frame, text="Create Project", 
+                                    command=self.create_project, style="Accent.TButton")
+        self.create_btn.pack(side=tk.LEFT, padx=(0, 10))
         
-        cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.root.quit)
+        cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.cancel)
         cancel_btn.pack(side=tk.LEFT)
         
         # Progress bar
@@ -114,6 +123,21 @@ class ProjectCreatorLightGUI:
         self.progress_label = ttk.Label(main_frame, textvariable=self.progress_var)
         self.progress_label.grid(row=7, column=0, columnspan=2, pady=(10, 0))
         
+        self.progress_bar = ttk.Progressbar(main_frame, mode='determinate', maximum=1)
+        self.progress_bar.grid(row=8, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
+        
+        # Log pane for streamed subprocess output
+        log_frame = ttk.Frame(main_frame)
+        log_frame.grid(row=9, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(10, 0))
+        log_frame.columnconfigure(0, weight=1)
+        log_frame.rowconfigure(0, weight=1)
+        
+        self.log_text = tk.Text(log_frame, height=10, state=tk.DISABLED, wrap=tk.NONE)
+        self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        log_scroll = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
+        log_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.log_text.configure(yscrollcommand=log_scroll.set)
+        
         # Focus on project name entry
         self.project_name_entry.focus()
         
@@ -124,7 +148,10 @@ class ProjectCreatorLightGUI:
             self.project_path_var.set(directory)
     
     def create_project(self):
-        """Create the project"""
+        """Validate the form and start creating the project in the background"""
+        if self.worker and self.worker.is_running():
+            return
+        
         try:
             # Get values
             project_name = self.project_name_var.get().strip()
@@ -140,52 +167,118 @@ class ProjectCreatorLightGUI:
                 messagebox.showerror("Error", "Please enter a project name")
                 return
             
-            # Update progress
-            self.progress_var.set("Validating project parameters...")
-            self.root.update()
-            
             # Validate project name and path
             ProjectValidator.validate_project_name(project_name)
             full_project_path = project_path / project_name
             ProjectValidator.validate_project_path(full_project_path, force)
             
-            # Update progress
-            self.progress_var.set("Creating project...")
-            self.root.update()
-            
-            # Create project
-            creator = ProjectCreator(self.config)
-            creator.create_project(
-                name=project_name,
-                project_type=project_type,
-                path=full_project_path,
-                install_deps=install_deps,
-                init_git=init_git,
-                force=force
-            )
+        except ProjectCreatorError as e:
+            messagebox.showerror("Error", str(e))
+            self.progress_var.set("Error occurred")
+            return
+        
+        # Create project off the Tk event loop; the pipeline is imported on
+        # first use so the window appears without waiting for it
+        from project_creator.gui_worker import ProjectCreationWorker
+        self.worker = ProjectCreationWorker(
+            self.config,
+            name=project_name,
+            project_type=project_type,
+            path=full_project_path,
+            install_deps=install_deps,
+            init_git=init_git,
+            force=force
+        )
+        self.project_name_created = project_name
+        self.project_path_created = full_project_path
+        
+        self.clear_log()
+        self.progress_bar.configure(value=0)
+        self.progress_var.set("Creating project...")
+        self.create_btn.configure(state=tk.DISABLED)
+        self.worker.start()
+        self.root.after(POLL_INTERVAL, self.poll_worker)
+    
+    def poll_worker(self):
+        """Drain worker events into the progress bar and log pane"""
+        finished = None
+        while True:
+            try:
+                event = self.worker.events.get_nowait()
+            except queue.Empty:
+                break
             
-            # Update progress
+            kind = event[0]
+            if kind == 'progress':
+                _, current, total, message = event
+                self.progress_bar.configure(maximum=total, value=current - 1)
+                self.progress_var.set(message)
+                self.append_log(f"[{current}/{total}] {message}")
+            elif kind == 'output':
+                self.append_log(event[1])
+            else:
+                finished = event
+        
+        if finished is None:
+            self.root.after(POLL_INTERVAL, self.poll_worker)
+            return
+        
+        self.create_btn.configure(state=tk.NORMAL)
+        kind = finished[0]
+        if kind == 'done':
+            self.progress_bar.configure(value=self.progress_bar['maximum'])
             self.progress_var.set("Project created successfully!")
-            self.root.update()
             
             # Show success message
             messagebox.showinfo("Success", 
-                              f"Project '{project_name}' created successfully!\n\n"
-                              f"Location: {full_project_path}\n\n"
+                              f"Project '{self.project_name_created}' created successfully!\n\n"
+                              f"Location: {self.project_path_created}\n\n"
                               f"Next steps:\n"
-                              f"1. cd {full_project_path}\n"
+                              f"1. cd {self.project_path_created}\n"
                               f"2. source venv/bin/activate (if Python project)\n"
                               f"3. Start coding!")
             
             # Clear form
             self.clear_form()
-            
-        except ProjectCreatorError as e:
-            messagebox.showerror("Error", str(e))
-            self.progress_var.set("Error occurred")
-        except Exception as e:
-            messagebox.showerror("Error", f"Unexpected error: {e}")
+        elif kind == 'cancelled':
+            self.progress_var.set("Project creation cancelled")
+        else:
+            error = finished[1]
+            if isinstance(error, ProjectCreatorError):
+                messagebox.showerror("Error", str(error))
+            else:
+                messagebox.showerror("Error", f"Unexpected error: {error}")
             self.progress_var.set("Error occurred")
+        self.worker = None
+    
+    def cancel(self):
+        """Cancel running creation, or quit when idle"""
+        if self.worker and self.worker.is_running():
+            self.progress_var.set("Cancelling...")
+            self.worker.cancel()
+        else:
+            self.root.quit()
+    
+    def on_close(self):
+        """Stop a running creation and its commands, then close the window"""
+        if self.worker and self.worker.is_running():
+            self.progress_var.set("Cancelling...")
+            self.root.update_idletasks()
+            self.worker.cancel(wait=True)
+        self.root.destroy()
+    
+    def append_log(self, line: str):
+        """Append a line to the log pane"""
+        self.log_text.configure(state=tk.NORMAL)
+        self.log_text.insert(tk.END, line + "\n")
+        self.log_text.see(tk.END)
+        self.log_text.configure(state=tk.DISABLED)
+    
+    def clear_log(self):
+        """Clear the log pane"""
+        self.log_text.configure(state=tk.NORMAL)
+        self.log_text.delete("1.0", tk.END)
+        self.log_text.configure(state=tk.DISABLED)
     
     def clear_form(self):
         """Clear the form"""
@@ -197,6 +290,7 @@ class ProjectCreatorLightGUI:
         self.init_git_var.set(True)
         self.force_var.set(False)
         self.progress_var.set("Ready to create project")
+        self.progress_bar.configure(value=0)
         self.project_name_entry.focus()
     
     def run(self):
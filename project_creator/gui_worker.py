@@ -0,0 +1,92 @@
+"""
+Background worker for running project creation from the GUI
+"""
+from typing import Any
+import queue
+import threading
+
+from project_creator.daemon import DaemonClient
+from project_creator.utils.exceptions import OperationCancelledError
+
+class ProjectCreationWorker:
+    """Run ProjectCreator on a background thread and report events through a queue
+    
+    Jobs go to the create-project daemon when one is running. Events are tuples:
+    ('progress', current, total, message), ('output', line), ('done',),
+    ('cancelled',) or ('error', exception).
+    """
+    
+    def __init__(self, config: Any, use_daemon: bool = True, **create_kwargs):
+        self.events: "queue.Queue[tuple]" = queue.Queue()
+        self.config = config
+        self.use_daemon = use_daemon
+        self.create_kwargs = create_kwargs
+        self.client = None
+        self.creator = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="project-creation", daemon=True)
+    
+    def start(self) -> None:
+        """Start creating the project"""
+        self._thread.start()
+    
+    def cancel(self, wait: bool = False) -> None:
+        """Request cancellation, terminating any running subprocess; wait blocks until they are gone"""
+        self._cancelled.set()
+        with self._lock:
+            client, creator = self.client, self.creator
+        if client is not None:
+            client.cancel()
+        elif creator is not None:
+            if wait:
+                creator.cancel()
+            else:
+                threading.Thread(target=creator.cancel, daemon=True).start()
+    
+    def is_running(self) -> bool:
+        """Check if the worker thread is still running"""
+        return self._thread.is_alive()
+    
+    def _on_progress(self, current: int, total: int, message: str) -> None:
+        """Queue a progress event"""
+        self.events.put(('progress', current, total, message))
+    
+    def _on_output(self, line: str) -> None:
+        """Queue a command output line"""
+        self.events.put(('output', line))
+    
+    def _connect(self) -> None:
+        """Pick the daemon or a local ProjectCreator; pinging and importing stay off the Tk thread"""
+        client = DaemonClient() if self.use_daemon else None
+        if client is not None and client.available():
+            with self._lock:
+                self.client = client
+            return
+        from project_creator.main import ProjectCreator
+        creator = ProjectCreator(
+            self.config,
+            progress_callback=self._on_progress,
+            output_callback=self._on_output
+        )
+        with self._lock:
+            self.creator = creator
+    
+    def _run(self) -> None:
+        """Thread body"""
+        try:
+            self._connect()
+            if self._cancelled.is_set():
+                raise OperationCancelledError("Project creation was cancelled")
+            if self.client is not None:
+                self.client.create(self._on_progress, self._on_output, **self.create_kwargs)
+            else:
+                self.creator.create_project(**self.create_kwargs)
+            self.events.put(('done',))
+        except OperationCancelledError:
+            self.events.put(('cancelled',))
+        except Exception as e:
+            if self._cancelled.is_set():
+                self.events.put(('cancelled',))
+            else:
+                self.events.put(('error', e))
@@ -2,28 +2,69 @@
 Main application class
 """
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, TYPE_CHECKING
+import os
 import subprocess
+import sys
+import tempfile
+import time
 
-from .config.settings import Config
-from .templates import get_template
+from .cache import get_cache_root
+from .cache.base_envs import BaseEnvironments
+from .cache.manager import CacheManager
+from .cache.node_store import NodeModulesStore
+from .cache.npm_locks import NpmLockCache
+from .cache.python_locks import PythonLockCache
+from .cache.shared_pip import SharedPip
+from .cache.venv_cache import VenvCache
+from .cache.wheelhouse import Wheelhouse
+from .templates import get_template, list_templates, register_template
+from .templates.filesystem import is_git_url
 from .generators.ai_config import AIConfigGenerator
 from .generators.docs import DocumentationGenerator
 from .generators.setup import SetupGenerator
 from .utils.file_ops import FileManager, DependencyManager
+from .utils.installers import select_node_installer, select_python_installer
 from .utils.validation import ProjectValidator
 from .utils.logging import ProjectLogger, ProgressTracker
-from .utils.exceptions import ProjectCreatorError
+from .utils.scheduler import TaskScheduler
+from .utils.process import CommandRunner
+from .utils.tracing import Tracer
+from .utils.project_manifest import (hash_dependencies, hash_file, hash_tree,
+                                     load_project_manifest, write_project_manifest)
+from .utils.exceptions import ProjectCreatorError, ValidationError
+
+if TYPE_CHECKING:
+    from .cache.warm_pool import WarmPool
+    from .config.settings import Config
 
 class ProjectCreator:
     """Main project creation class"""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: "Config",
+                 progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                 output_callback: Optional[Callable[[str], None]] = None,
+                 tracer: Optional[Tracer] = None,
+                 warm_pool: Optional["WarmPool"] = None):
         self.config = config
         self.logger = ProjectLogger(config.get('logging_level', 'INFO'))
+        self.progress_callback = progress_callback
+        self.tracer = tracer or Tracer()
+        self.warm_pool = warm_pool
+        self.runner = CommandRunner(output_callback, self.tracer, config.get('tool_paths'),
+                                    config.get('command_timeout', 1800), config.get('max_heavy_commands', 2),
+                                    get_cache_root(config) / "heavy-slots")
         self.file_manager = None
         self.dependency_manager = None
         self.setup_generator = None
+        self.template = None
+        self.venv_cache_hit = False
+        
+        for name, source in (config.get('custom_templates') or {}).items():
+            if is_git_url(str(source)):
+                register_template(name, str(source), get_cache_root(config), self.runner)
+            else:
+                register_template(name, Path(source))
     
     def create_project(self, 
                       name: str,
@@ -31,93 +72,386 @@ class ProjectCreator:
                       path: Path,
                       install_deps: bool = True,
                       init_git: bool = True,
-                      force: bool = False) -> None:
+                      force: bool = False,
+                      refresh_wheelhouse: bool = False) -> None:
         """Main project creation method"""
         
-        progress = ProgressTracker(6)  # Total steps
+        scheduler = self._build_pipeline(name, project_type, path, install_deps, init_git,
+                                         force, refresh_wheelhouse)
+        progress = ProgressTracker(len(scheduler.tasks), self.progress_callback)
+        
+        def on_start(task):
+            self.runner.check_cancelled()
+            progress.step(task.description)
+        scheduler.on_start = on_start
         
         try:
-            # Step 1: Validation
-            progress.step("Validating project parameters...")
-            self._validate_project(name, project_type, path, force)
-            
-            # Step 2: Initialize managers
-            progress.step("Initializing project managers...")
-            self._initialize_managers(path)
-            
-            # Step 3: Get template
-            progress.step("Loading project template...")
-            template = get_template(project_type)
-            
-            # Step 4: Create project structure
-            progress.step("Creating project structure...")
-            self._create_project_structure(template)
-            
-            # Step 5: Generate configuration
-            progress.step("Generating AI configuration...")
-            self._generate_configuration(template)
-            
-            # Step 6: Setup development environment
-            progress.step("Setting up development environment...")
-            self._setup_development_environment(template, install_deps, init_git)
-            
+            with self.tracer.span("create_project", "project", project=name, template=project_type):
+                try:
+                    scheduler.run()
+                except BaseException:
+                    # Never leave a half-created project behind
+                    if self.file_manager:
+                        self.file_manager.rollback()
+                    raise
+                self.file_manager.finalize()
             self.logger.info(f"Project '{name}' created successfully!")
-            
+            self._prune_caches()
+        
         except Exception as e:
             self.logger.error(f"Failed to create project: {e}")
             raise
     
+    def sync_project(self, path: Path, project_type: Optional[str] = None,
+                     install_deps: bool = True, force: bool = False) -> Dict[str, Any]:
+        """Re-apply the template to an existing project, rewriting only changed output"""
+        start = time.perf_counter()
+        manifest = load_project_manifest(path)
+        if manifest is None:
+            raise ValidationError(f"'{path}' has no create-project manifest, it cannot be synced")
+        project_type = project_type or manifest['template']
+        self._register_git_template(project_type)
+        ProjectValidator.validate_template_name(project_type, list_templates())
+        
+        with self.tracer.span("sync_project", "project", project=path.name, template=project_type):
+            self._initialize_managers(path)
+            self._load_template(project_type)
+            template = self.template
+            
+            report = {'path': str(path), 'template': project_type, 'added': [], 'updated': [],
+                      'removed': [], 'conflicts': [], 'unchanged': 0, 'installed': [], 'skipped': []}
+            # Render the current template output next to the project so changes move in by rename
+            with tempfile.TemporaryDirectory(dir=path.parent, prefix=f".{path.name}.sync-") as tmp_dir:
+                render_path = Path(tmp_dir) / path.name
+                files = self._sync_files(path, render_path, template, manifest, force, report)
+            
+            dependencies = dict(manifest.get('dependencies', {}))
+            if install_deps:
+                dependencies.update(self._sync_dependencies(template, manifest, report))
+            write_project_manifest(path, project_type, files, dependencies, manifest.get('created'))
+        
+        report['seconds'] = time.perf_counter() - start
+        self.logger.info(f"Project '{path.name}' synced in {report['seconds']:.2f}s")
+        return report
+    
+    def cancel(self) -> None:
+        """Cancel a running creation from another thread"""
+        self.runner.cancel()
+    
+    def _prune_caches(self) -> None:
+        """Keep caches within their budgets, checking at most once per cache_prune_interval"""
+        interval = self.config.get('cache_prune_interval', 86400)
+        if not interval:
+            return
+        try:
+            results = CacheManager.from_config(self.config).maybe_prune(interval)
+        except OSError as e:
+            self.logger.warning(f"Could not prune caches: {e}")
+            return
+        for cache, removed, freed in results or []:
+            if removed:
+                self.logger.info(f"Pruned {removed} {cache} cache entries ({freed // (1024 * 1024)} MB)")
+    
+    def _build_pipeline(self, name: str, project_type: str, path: Path, install_deps: bool,
+                        init_git: bool, force: bool, refresh_wheelhouse: bool) -> TaskScheduler:
+        """Build the creation pipeline as a task graph"""
+        scheduler = TaskScheduler(self.config.get('max_parallel_tasks', 4), on_interrupt=self.cancel,
+                                  tracer=self.tracer)
+        
+        scheduler.add('validate', lambda: self._validate_project(name, project_type, path, force),
+                      description="Validating project parameters...")
+        scheduler.add('managers', lambda: self._initialize_managers(path, refresh_wheelhouse),
+                      deps=['validate'], description="Initializing project managers...")
+        scheduler.add('template', lambda: self._load_template(project_type),
+                      deps=['validate'], description="Loading project template...")
+        # AI configuration and docs only plan files; structure writes the whole plan at once
+        scheduler.add('ai_config', lambda: self._generate_ai_configuration(self.template),
+                      deps=['managers', 'template'], description="Generating AI configuration...")
+        scheduler.add('docs', lambda: self._generate_documentation(self.template),
+                      deps=['managers', 'template'], description="Generating documentation...")
+        scheduler.add('structure', lambda: self._create_project_structure(self.template, init_git,
+                                                                          install_deps),
+                      deps=['ai_config', 'docs'], description="Creating project structure...")
+        scheduler.add('venv', lambda: self._create_virtual_environment(self.template, install_deps),
+                      deps=['structure'], description="Creating virtual environment...")
+        
+        git_deps = ['structure']
+        if install_deps:
+            scheduler.add('python_deps', lambda: self._install_python_dependencies(self.template),
+                          deps=['venv'], description="Installing Python dependencies...")
+            scheduler.add('node_deps', lambda: self._install_node_dependencies(self.template),
+                          deps=['structure'], description="Installing Node.js dependencies...")
+            git_deps += ['python_deps', 'node_deps']
+        
+        if init_git:
+            scheduler.add('git', self._initialize_git, deps=git_deps,
+                          description="Initializing Git repository...")
+        
+        return scheduler
+    
     def _validate_project(self, name: str, project_type: str, path: Path, force: bool = False) -> None:
         """Validate project parameters"""
         ProjectValidator.validate_project_name(name)
         ProjectValidator.validate_project_path(path, force)
-        ProjectValidator.validate_template_name(project_type, ['react', 'django', 'python', 'fullstack'])
+        self._register_git_template(project_type)
+        ProjectValidator.validate_template_name(project_type, list_templates())
+    
+    def _register_git_template(self, project_type: str) -> None:
+        """Register a git URL given as project type, backed by this run's cache and runner"""
+        if is_git_url(project_type):
+            # A fresh instance per run, so branches are fetched again
+            register_template(project_type, project_type, get_cache_root(self.config), self.runner)
     
-    def _initialize_managers(self, path: Path) -> None:
+    def _initialize_managers(self, path: Path, refresh_wheelhouse: bool = False) -> None:
         """Initialize file and dependency managers"""
-        self.file_manager = FileManager(path)
-        self.dependency_manager = DependencyManager(path)
-        self.setup_generator = SetupGenerator(path)
-    
-    def _create_project_structure(self, template) -> None:
-        """Create the basic project structure"""
-        # Create main directory
-        self.file_manager.project_path.mkdir(parents=True, exist_ok=True)
-        
-        # Create virtual environment for Python projects
-        if template.has_python_dependencies():
-            self.setup_generator.create_virtual_environment()
-        
-        # Create files from template
-        files = template.get_files()
-        for file_path, content in files.items():
-            self.file_manager.create_file(file_path, content)
-    
-    def _generate_configuration(self, template) -> None:
-        """Generate AI configuration and documentation"""
-        # Generate AI configuration
-        ai_generator = AIConfigGenerator(self.file_manager.project_path)
+        self.file_manager = FileManager(path, self.tracer, self.config.get('fsync_files', False))
+        wheelhouse = None
+        if self.config.get('wheelhouse_enabled', True):
+            wheelhouse = Wheelhouse(get_cache_root(self.config))
+        npm_locks = None
+        if self.config.get('npm_lock_cache_enabled', True):
+            npm_locks = NpmLockCache(get_cache_root(self.config))
+        python_locks = None
+        if self.config.get('python_lock_cache_enabled', True):
+            python_locks = PythonLockCache(get_cache_root(self.config))
+        python_installer = select_python_installer(self.config.get('python_installer', 'pip'), self.runner, path)
+        node_installer = select_node_installer(self.config.get('preferred_package_manager', 'npm'), self.runner)
+        self.dependency_manager = DependencyManager(path, wheelhouse, refresh_wheelhouse, self.runner,
+                                                    npm_locks, python_locks, python_installer, node_installer)
+        venv_cache = None
+        if self.config.get('venv_cache_enabled', True):
+            venv_cache = VenvCache(get_cache_root(self.config))
+        shared_pip = None
+        if self.config.get('fast_venv_enabled', True):
+            shared_pip = SharedPip(get_cache_root(self.config))
+        self.setup_generator = SetupGenerator(path, venv_cache, self.runner, shared_pip)
+        self.base_envs = None
+        if self.config.get('layered_venvs', False):
+            self.base_envs = BaseEnvironments(get_cache_root(self.config))
+        self.node_store = None
+        if self.config.get('node_store_enabled', True):
+            self.node_store = NodeModulesStore(get_cache_root(self.config))
+    
+    def _load_template(self, project_type: str) -> None:
+        """Load the project template"""
+        self.template = get_template(project_type)
+    
+    def _create_project_structure(self, template, init_git: bool = True, install_deps: bool = True) -> None:
+        """Create the project directory with every planned file and its manifest"""
+        self._plan_template_files(template, init_git)
+        self.file_manager.write_plan()
+        
+        path = self.file_manager.project_path
+        dependencies = self._dependency_hashes(template) if install_deps else {}
+        write_project_manifest(path, template.name, hash_tree(path), dependencies)
+    
+    def _plan_template_files(self, template, init_git: bool = True) -> None:
+        """Add template output and .gitignore to the file plan"""
+        variables = {'project_name': self.file_manager.project_path.name, 'template': template.name}
+        self.file_manager.add_tree(lambda root: template.materialize(root, variables))
+        self.file_manager.add_stream(template.iter_files(variables))
+        if init_git:
+            self.file_manager.add_file('.gitignore', self.setup_generator.get_gitignore())
+    
+    def _sync_files(self, path: Path, render_path: Path, template, manifest: Dict[str, Any],
+                    force: bool, report: Dict[str, Any]) -> Dict[str, str]:
+        """Move changed template output into the project, returning the new file hashes"""
+        project_file_manager = self.file_manager
+        self.file_manager = FileManager(render_path, self.tracer)
+        try:
+            self._generate_ai_configuration(template)
+            self._generate_documentation(template)
+            self._plan_template_files(template, '.gitignore' in manifest['files'])
+            self.file_manager.write_plan()
+        finally:
+            self.file_manager = project_file_manager
+        
+        recorded = manifest['files']
+        rendered = hash_tree(render_path)
+        files = {}
+        for relative_path, new_hash in rendered.items():
+            old_hash = recorded.get(relative_path)
+            current_hash = hash_file(path / relative_path)
+            files[relative_path] = new_hash
+            if current_hash == new_hash or (old_hash == new_hash and not force):
+                # Up to date, or the template did not change and local edits win
+                report['unchanged'] += 1
+                continue
+            if current_hash is not None and current_hash != old_hash and not force:
+                # Locally modified file the template also changed: keep the local version
+                report['conflicts'].append(relative_path)
+                if old_hash is None:
+                    del files[relative_path]
+                else:
+                    files[relative_path] = old_hash
+                continue
+            
+            target = path / relative_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(render_path / relative_path, target)
+            report['added' if current_hash is None else 'updated'].append(relative_path)
+        
+        for relative_path in sorted(set(recorded) - set(rendered)):
+            current_hash = hash_file(path / relative_path)
+            if current_hash is None:
+                continue
+            if current_hash == recorded[relative_path] or force:
+                (path / relative_path).unlink()
+                report['removed'].append(relative_path)
+            else:
+                report['conflicts'].append(relative_path)
+                files[relative_path] = recorded[relative_path]
+        return files
+    
+    def _sync_dependencies(self, template, manifest: Dict[str, Any], report: Dict[str, Any]) -> Dict[str, str]:
+        """Install only dependency sets whose hash differs from the recorded install"""
+        recorded = manifest.get('dependencies', {})
+        dependencies = self._dependency_hashes(template)
+        
+        if 'python' in dependencies:
+            if dependencies['python'] == recorded.get('python'):
+                report['skipped'].append(self.dependency_manager.python_installer.name)
+            else:
+                if not (self.file_manager.project_path / "venv").exists():
+                    self._create_virtual_environment(template)
+                self._install_python_dependencies(template)
+                report['installed'].append(self.dependency_manager.python_installer.name)
+        if 'frontend' in dependencies:
+            if dependencies['frontend'] == recorded.get('frontend'):
+                report['skipped'].append(self.dependency_manager.node_installer.name)
+            else:
+                self._install_node_dependencies(template)
+                report['installed'].append(self.dependency_manager.node_installer.name)
+        return dependencies
+    
+    def _dependency_hashes(self, template) -> Dict[str, str]:
+        """Get hashes of the template's Python and frontend dependency sets"""
+        hashes = {}
+        if template.artifacts.python_packages:
+            hashes['python'] = hash_dependencies(template.artifacts.python_packages)
+        if template.artifacts.frontend_dependencies:
+            hashes['frontend'] = hash_dependencies(template.artifacts.frontend_dependencies)
+        return hashes
+    
+    def _create_virtual_environment(self, template, install_deps: bool = True) -> None:
+        """Create virtual environment for Python projects, preferring the venv cache"""
+        if not template.has_python_dependencies():
+            return
+        
+        packages = self._get_venv_packages(template, install_deps)
+        if self.base_envs is not None and packages and self._layering_supported():
+            self._create_layered_environment(packages)
+            return
+        if self.warm_pool and self.warm_pool.take_venv(packages, self.file_manager.project_path / "venv"):
+            # Pooled venvs are venv cache snapshots, so the packages are already in
+            self.venv_cache_hit = True
+            self.logger.info("Virtual environment taken from warm pool")
+            return
+        self.venv_cache_hit = self.setup_generator.create_virtual_environment(packages)
+        if self.setup_generator.venv_cache:
+            status = "hit" if self.venv_cache_hit else "miss"
+            self.logger.info(f"Virtual environment cache {status}")
+        if not self.venv_cache_hit and not packages:
+            self._snapshot_virtual_environment(packages)
+    
+    def _create_layered_environment(self, packages: list) -> None:
+        """Create a thin project venv on top of the shared base environment for its package set"""
+        base_venv = self.base_envs.lookup(packages)
+        if base_venv is None:
+            self.logger.info("Building shared base environment")
+            base_venv = self.base_envs.ensure(packages, lambda entry: self._build_base_environment(entry, packages))
+        
+        self.setup_generator.create_virtual_environment([])
+        self.base_envs.link(base_venv, self.file_manager.project_path / "venv")
+        # The packages come from the base, pip only writes requirements.txt
+        self.venv_cache_hit = True
+        self.logger.info(f"Virtual environment layered on base {base_venv.parent.name}")
+    
+    def _layering_supported(self) -> bool:
+        """Check if project venvs use this interpreter, whose site-packages layout the .pth link assumes"""
+        return self.runner.resolve_tool('python', sys.executable) == sys.executable
+    
+    def _build_base_environment(self, entry: Path, packages: list) -> None:
+        """Create a base environment's venv and install the package set into it"""
+        SetupGenerator(entry, None, self.runner, self.setup_generator.shared_pip).create_virtual_environment([])
+        manager = self.dependency_manager
+        installer = select_python_installer(self.config.get('python_installer', 'pip'), self.runner, entry)
+        DependencyManager(entry, manager.wheelhouse, manager.refresh_wheelhouse, self.runner, None,
+                          manager.python_locks, installer).install_python_dependencies(packages)
+    
+    def _generate_ai_configuration(self, template) -> None:
+        """Generate AI configuration"""
+        ai_generator = AIConfigGenerator(self.file_manager)
         ai_generator.create_cursor_rules(template)
         ai_generator.create_claude_ignore(template)
-        
-        # Generate documentation
-        doc_generator = DocumentationGenerator(self.file_manager.project_path)
+    
+    def _generate_documentation(self, template) -> None:
+        """Generate documentation"""
+        doc_generator = DocumentationGenerator(self.file_manager)
         doc_generator.create_readme(self.file_manager.project_path.name, template)
     
-    def _setup_development_environment(self, template, install_deps: bool, init_git: bool) -> None:
-        """Setup development environment"""
-        if install_deps:
-            self._install_dependencies(template)
+    def _install_python_dependencies(self, template) -> None:
+        """Install Python dependencies"""
+        packages = template.artifacts.python_packages
+        if not packages:
+            return
         
-        if init_git:
-            self.setup_generator.create_git_setup()
+        if self.venv_cache_hit:
+            # Cloned venv already has the exact package set installed
+            self.dependency_manager.write_requirements(packages)
+            self.logger.info("Skipping pip install, packages restored from venv cache")
+        else:
+            self.dependency_manager.install_python_dependencies(packages)
+            self.logger.info(f"Installed Python dependencies with {self.dependency_manager.python_installer.name}")
+            self._snapshot_virtual_environment(packages)
     
-    def _install_dependencies(self, template) -> None:
-        """Install project dependencies"""
-        deps = template.get_dependencies()
+    def _install_node_dependencies(self, template) -> None:
+        """Install Node.js dependencies"""
+        frontend = template.artifacts.frontend_dependencies
+        if not frontend:
+            return
         
-        if deps.get('python', {}).get('packages'):
-            self.dependency_manager.install_python_dependencies(deps['python']['packages'])
+        if self.warm_pool and self.warm_pool.take_node_modules(self._node_store_key(frontend),
+                                                               self.file_manager.project_path):
+            self.dependency_manager.write_package_files(frontend)
+            self.logger.info("Skipping npm install, node_modules taken from warm pool")
+            return
+        if self.node_store and self.node_store.materialize(self._node_store_key(frontend),
+                                                           self.file_manager.project_path):
+            self.dependency_manager.write_package_files(frontend)
+            self.logger.info("Skipping npm install, node_modules linked from package store")
+            return
         
-        if deps.get('frontend'):
-            self.dependency_manager.install_node_dependencies(deps['frontend'])
+        self.dependency_manager.install_node_dependencies(frontend)
+        self.logger.info(f"Installed Node.js dependencies with {self.dependency_manager.node_installer.name}")
+        if self.node_store:
+            try:
+                self.node_store.store(self._node_store_key(frontend), self.file_manager.project_path)
+            except OSError as e:
+                self.logger.warning(f"Could not add node_modules to package store: {e}")
+    
+    def _node_store_key(self, frontend):
+        """Get the dependency set node_modules is stored under, pinned when a lock is cached"""
+        npm_locks = self.dependency_manager.npm_locks
+        pinned = npm_locks.pinned(frontend) if npm_locks else frontend
+        # Each installer leaves its own lockfile next to node_modules
+        return dict(pinned, installer=[self.dependency_manager.node_installer.name])
+    
+    def _initialize_git(self) -> None:
+        """Initialize Git repository with the initial commit"""
+        backend = self.setup_generator.create_git_setup(
+            self.file_manager.written_files, self.config.get('git_backend', 'auto'))
+        self.logger.debug(f"Git repository initialized with {backend} backend")
+    
+    def _get_venv_packages(self, template, install_deps: bool) -> list:
+        """Get the package set the project venv will contain"""
+        if not install_deps:
+            return []
+        return list(template.artifacts.python_packages)
+    
+    def _snapshot_virtual_environment(self, packages: list) -> None:
+        """Store venv snapshot, never failing the project on cache errors"""
+        try:
+            self.setup_generator.snapshot_virtual_environment(packages)
+        except OSError as e:
+            self.logger.warning(f"Could not store virtual environment snapshot: {e}")
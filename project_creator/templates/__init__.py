@@ -1,32 +1,68 @@
 """
 Template registry and management
 """
-from typing import Dict, Type
+from importlib import import_module
+from pathlib import Path
+from typing import Dict, Optional, Type, Union, TYPE_CHECKING
+import os
 from .base import ProjectTemplate
-from .react import ReactTemplate
-from .django import DjangoTemplate
-from .python import PythonTemplate
-from .fullstack import FullstackTemplate
 
-_TEMPLATES: Dict[str, Type[ProjectTemplate]] = {
-    'react': ReactTemplate,
-    'django': DjangoTemplate,
-    'python': PythonTemplate,
-    'fullstack': FullstackTemplate
+if TYPE_CHECKING:
+    from ..utils.process import CommandRunner
+
+# Built-in templates are registered as "module:Class" and imported on first use
+_TEMPLATES: Dict[str, Union[str, Type[ProjectTemplate]]] = {
+    'react': 'react:ReactTemplate',
+    'django': 'django:DjangoTemplate',
+    'python': 'python:PythonTemplate',
+    'fullstack': 'fullstack:FullstackTemplate'
 }
 
+# Templates are stateless, so one instance per name serves every project
+_INSTANCES: Dict[str, ProjectTemplate] = {}
+
 def get_template(template_name: str) -> ProjectTemplate:
-    """Get template by name"""
+    """Get template by name, or by git URL"""
+    if template_name not in _TEMPLATES:
+        from .filesystem import is_git_url
+        if is_git_url(template_name):
+            register_template(template_name, template_name)
     if template_name not in _TEMPLATES:
         from ..utils.exceptions import TemplateNotFoundError
         raise TemplateNotFoundError(f"Template '{template_name}' not found")
     
-    return _TEMPLATES[template_name]()
+    template = _INSTANCES.get(template_name)
+    if template is None:
+        template = _INSTANCES.setdefault(template_name, _resolve_template_class(template_name)())
+    return template
 
 def list_templates() -> list[str]:
     """List all available templates"""
     return list(_TEMPLATES.keys())
 
-def register_template(name: str, template_class: Type[ProjectTemplate]):
-    """Register a new template"""
-    _TEMPLATES[name] = template_class
+def register_template(name: str, template: Union[Type[ProjectTemplate], ProjectTemplate, os.PathLike, str],
+                      cache_root: Optional[Path] = None, runner: Optional["CommandRunner"] = None):
+    """Register a new template class, instance, directory/archive path, or git URL ('git+file:///repo#v1')"""
+    if isinstance(template, os.PathLike):
+        from .filesystem import load_filesystem_template
+        template = load_filesystem_template(name, Path(template))
+    elif isinstance(template, str):
+        from .filesystem import is_git_url, load_git_template
+        if is_git_url(template):
+            template = load_git_template(name, template, cache_root, runner)
+    
+    _INSTANCES.pop(name, None)
+    if isinstance(template, ProjectTemplate):
+        _TEMPLATES[name] = type(template)
+        _INSTANCES[name] = template
+    else:
+        _TEMPLATES[name] = template
+
+def _resolve_template_class(template_name: str) -> Type[ProjectTemplate]:
+    """Import a lazily registered template class"""
+    entry = _TEMPLATES[template_name]
+    if isinstance(entry, str):
+        module_name, class_name = entry.split(':')
+        entry = getattr(import_module(f".{module_name}", __name__), class_name)
+        _TEMPLATES[template_name] = entry
+    return entry
@@ -3,7 +3,37 @@ Base template class
 """
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, Iterator, List, Mapping, NamedTuple, Tuple
+
+# A file as a project path plus its content in chunks
+FileEntry = Tuple[str, Iterable[bytes]]
+
+class TemplateArtifacts(NamedTuple):
+    """Immutable data derived once from a template class"""
+    files: Mapping[str, bytes]
+    python_packages: Tuple[str, ...]
+    frontend_dependencies: Mapping[str, Tuple[str, ...]]
+    has_python: bool
+    has_frontend: bool
+    
+    @classmethod
+    def from_template(cls, template: "ProjectTemplate") -> "TemplateArtifacts":
+        """Build artifacts: encoded file bodies, dependency sets and capability flags"""
+        files = {path: content.encode('utf-8') for path, content in template.get_files().items()}
+        deps = template.get_dependencies()
+        python_packages = tuple(deps.get('python', {}).get('packages', []))
+        frontend = {key: tuple(value) for key, value in deps.get('frontend', {}).items()}
+        return cls(
+            files=MappingProxyType(files),
+            python_packages=python_packages,
+            frontend_dependencies=MappingProxyType(frontend),
+            has_python=bool(python_packages),
+            has_frontend=bool(frontend.get('packages'))
+        )
+
+# Artifacts per template class, shared by every instance and project in the process
+_ARTIFACTS: Dict[Any, TemplateArtifacts] = {}
 
 class ProjectTemplate(ABC):
     """Base class for all project templates"""
@@ -35,12 +65,43 @@ class ProjectTemplate(ABC):
         """Get initialization commands"""
         pass
     
+    @property
+    def artifacts(self) -> TemplateArtifacts:
+        """Precomputed files and dependencies, built on first use per class"""
+        key = self._artifacts_key()
+        artifacts = _ARTIFACTS.get(key)
+        if artifacts is None:
+            artifacts = _ARTIFACTS.setdefault(key, TemplateArtifacts.from_template(self))
+        return artifacts
+    
+    def _artifacts_key(self) -> Any:
+        """Get the key artifacts are shared under"""
+        return type(self)
+    
+    def iter_files(self, variables: Dict[str, str]) -> Iterator[FileEntry]:
+        """Yield (path, chunk iterator) entries; dict templates are adapted from get_files"""
+        for path, data in self.artifacts.files.items():
+            yield path, (data,)
+    
+    def materialize(self, target: Path, variables: Dict[str, str]) -> None:
+        """Write files kept outside get_files, such as on-disk trees, into target"""
+        pass
+    
     def has_python_dependencies(self) -> bool:
         """Check if template has Python dependencies"""
-        deps = self.get_dependencies()
-        return bool(deps.get('python', {}).get('packages', []))
+        return self.artifacts.has_python
     
     def has_frontend_dependencies(self) -> bool:
         """Check if template has frontend dependencies"""
-        deps = self.get_dependencies()
-        return bool(deps.get('frontend', {}).get('packages', []))
+        return self.artifacts.has_frontend
+
+class StreamingTemplate(ProjectTemplate):
+    """Base for templates that generate files lazily instead of returning a dict"""
+    
+    def get_files(self) -> Dict[str, str]:
+        return {}
+    
+    @abstractmethod
+    def iter_files(self, variables: Dict[str, str]) -> Iterator[FileEntry]:
+        """Yield (path, chunk iterator) entries, building each body only when it is written"""
+        pass
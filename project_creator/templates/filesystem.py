@@ -0,0 +1,306 @@
+"""
+Templates backed by a directory or a tar/zip archive
+"""
+from abc import abstractmethod
+from fnmatch import fnmatch
+from pathlib import Path, PurePosixPath
+from string import Template
+from typing import Any, BinaryIO, Dict, List, Optional, TYPE_CHECKING
+import json
+import os
+import posixpath
+import re
+import shutil
+import tarfile
+import threading
+import zipfile
+
+from .base import ProjectTemplate
+from ..utils.exceptions import InvalidTemplateError, TemplateNotFoundError
+from ..utils.file_ops import copy_file_data, copy_file_methods
+
+if TYPE_CHECKING:
+    from ..cache.template_repos import TemplateRepoCache
+    from ..utils.process import CommandRunner
+
+GIT_URL_PREFIXES = ('git+', 'git://', 'ssh://', 'file://', 'http://', 'https://')
+# user@host:path, as git accepts for ssh
+SCP_URL = re.compile(r"^[\w.-]+@[\w.-]+:")
+
+class FilesystemTemplate(ProjectTemplate):
+    """Template whose files live on disk, with template.json metadata and .tmpl/text_templates substitution"""
+    
+    MANIFEST_FILE = "template.json"
+    TEXT_SUFFIX = ".tmpl"
+    CHUNK_SIZE = 1024 * 1024
+    
+    def __init__(self, name: str, source: Path):
+        self._name = name
+        self.source = source
+        self._manifest: Optional[Dict[str, Any]] = None
+    
+    @property
+    def name(self) -> str:
+        return self._name
+    
+    @property
+    def description(self) -> str:
+        return self.manifest.get('description', f"Template from {self.source.name}")
+    
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        """Template metadata from template.json"""
+        if self._manifest is None:
+            self._manifest = self._load_manifest()
+        return self._manifest
+    
+    def get_dependencies(self) -> Dict[str, Any]:
+        dependencies = self.manifest.get('dependencies', {})
+        return {
+            'frontend': dependencies.get('frontend', {}),
+            'python': dependencies.get('python', {})
+        }
+    
+    def get_files(self) -> Dict[str, str]:
+        return {}
+    
+    def get_init_commands(self) -> List[str]:
+        return list(self.manifest.get('init_commands', []))
+    
+    def _artifacts_key(self) -> Any:
+        return (type(self), str(self.source))
+    
+    def is_text_template(self, relative_path: str) -> bool:
+        """Check if a file gets variable substitution"""
+        return (relative_path.endswith(self.TEXT_SUFFIX)
+                or any(fnmatch(relative_path, pattern) for pattern in self.manifest.get('text_templates', [])))
+    
+    def output_path(self, relative_path: str) -> str:
+        """Get the project path for a template file"""
+        if relative_path.endswith(self.TEXT_SUFFIX):
+            return relative_path[:-len(self.TEXT_SUFFIX)]
+        return relative_path
+    
+    def render(self, data: bytes, variables: Dict[str, str]) -> bytes:
+        """Substitute variables in a text template"""
+        return Template(data.decode('utf-8')).safe_substitute(variables).encode('utf-8')
+    
+    @abstractmethod
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load template.json, empty when absent"""
+        pass
+    
+    def _check_link(self, relative_path: str, link: str) -> None:
+        """Reject symlinks that point outside the project"""
+        resolved = posixpath.normpath(posixpath.join(posixpath.dirname(relative_path), link))
+        if posixpath.isabs(link) or resolved == '..' or resolved.startswith('../'):
+            raise InvalidTemplateError(f"Symlink '{relative_path}' in '{self.source}' escapes the project")
+    
+    def _parse_manifest(self, data: Optional[bytes]) -> Dict[str, Any]:
+        """Parse template.json content"""
+        if data is None:
+            return {}
+        try:
+            manifest = json.loads(data)
+        except ValueError as e:
+            raise InvalidTemplateError(f"Invalid {self.MANIFEST_FILE} in {self.source}: {e}")
+        if not isinstance(manifest, dict):
+            raise InvalidTemplateError(f"{self.MANIFEST_FILE} in {self.source} must be an object")
+        return manifest
+
+class DirectoryTemplate(FilesystemTemplate):
+    """Template copied from a directory tree"""
+    
+    def materialize(self, target: Path, variables: Dict[str, str]) -> None:
+        methods = copy_file_methods()
+        for root, dirs, files in os.walk(self.source):
+            rel_root = Path(root).relative_to(self.source)
+            if '.git' in dirs:
+                dirs.remove('.git')
+            for name in [d for d in dirs if os.path.islink(Path(root) / d)]:
+                dirs.remove(name)
+                files.append(name)
+            (target / rel_root).mkdir(parents=True, exist_ok=True)
+            
+            for name in files:
+                source = Path(root) / name
+                relative_path = (rel_root / name).as_posix()
+                if relative_path == self.MANIFEST_FILE:
+                    continue
+                output = target / self.output_path(relative_path)
+                if source.is_symlink():
+                    link = os.readlink(source)
+                    self._check_link(relative_path, link)
+                    os.symlink(link, output)
+                elif self.is_text_template(relative_path):
+                    output.write_bytes(self.render(source.read_bytes(), variables))
+                    shutil.copymode(source, output)
+                else:
+                    copy_file_data(source, output, methods)
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        manifest_file = self.source / self.MANIFEST_FILE
+        return self._parse_manifest(manifest_file.read_bytes() if manifest_file.exists() else None)
+
+class ArchiveTemplate(FilesystemTemplate):
+    """Template extracted from a tar or zip archive as a stream"""
+    
+    def __init__(self, name: str, source: Path):
+        super().__init__(name, source)
+        self.is_zip = zipfile.is_zipfile(source)
+        if not self.is_zip and not tarfile.is_tarfile(source):
+            raise InvalidTemplateError(f"Template archive '{source}' is not a tar or zip file")
+        self._prefix = ""
+    
+    def materialize(self, target: Path, variables: Dict[str, str]) -> None:
+        # Loading the manifest also finds the archive's top-level directory
+        self.manifest
+        if self.is_zip:
+            with zipfile.ZipFile(self.source) as archive:
+                for info in archive.infolist():
+                    relative_path = self._member_path(info.filename)
+                    if relative_path is None:
+                        continue
+                    if info.is_dir():
+                        (target / relative_path).mkdir(parents=True, exist_ok=True)
+                        continue
+                    with archive.open(info) as stream:
+                        self._write_member(stream, relative_path, target, variables,
+                                           (info.external_attr >> 16) & 0o777)
+            return
+        
+        with tarfile.open(self.source, 'r|*') as archive:
+            for member in archive:
+                relative_path = self._member_path(member.name)
+                if relative_path is None:
+                    continue
+                if member.isdir():
+                    (target / relative_path).mkdir(parents=True, exist_ok=True)
+                elif member.issym():
+                    self._check_link(relative_path, member.linkname)
+                    output = target / relative_path
+                    output.parent.mkdir(parents=True, exist_ok=True)
+                    os.symlink(member.linkname, output)
+                elif member.isfile():
+                    self._write_member(archive.extractfile(member), relative_path, target, variables,
+                                       member.mode & 0o777)
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        if self.is_zip:
+            with zipfile.ZipFile(self.source) as archive:
+                names = {self._normalize(name): name for name in archive.namelist()}
+                self._prefix = self._common_prefix(list(names))
+                manifest_name = names.get(self._prefix + self.MANIFEST_FILE)
+                return self._parse_manifest(archive.read(manifest_name) if manifest_name else None)
+        
+        with tarfile.open(self.source, 'r:*') as archive:
+            members = archive.getmembers()
+            self._prefix = self._common_prefix([member.name for member in members])
+            for member in members:
+                if member.isfile() and self._normalize(member.name) == self._prefix + self.MANIFEST_FILE:
+                    return self._parse_manifest(archive.extractfile(member).read())
+        return self._parse_manifest(None)
+    
+    @staticmethod
+    def _common_prefix(names: List[str]) -> str:
+        """Get a single top-level directory wrapping every member, as 'name/'"""
+        names = [ArchiveTemplate._normalize(name) for name in names]
+        tops = {PurePosixPath(name).parts[0] for name in names if PurePosixPath(name).parts}
+        if len(tops) == 1:
+            top = tops.pop()
+            if any(name.startswith(top + '/') for name in names):
+                return top + '/'
+        return ""
+    
+    @staticmethod
+    def _normalize(name: str) -> str:
+        """Drop leading './' components from a member name"""
+        while name.startswith('./'):
+            name = name[2:]
+        return '' if name == '.' else name
+    
+    def _member_path(self, name: str) -> Optional[str]:
+        """Get a member's path inside the template, None for the root and the manifest"""
+        name = self._normalize(name)
+        if not name.startswith(self._prefix):
+            return None
+        path = PurePosixPath(name[len(self._prefix):])
+        if path.is_absolute() or '..' in path.parts:
+            raise InvalidTemplateError(f"Unsafe path '{name}' in template archive '{self.source}'")
+        relative_path = path.as_posix()
+        if relative_path in ('', '.', self.MANIFEST_FILE):
+            return None
+        return relative_path
+    
+    def _write_member(self, stream: BinaryIO, relative_path: str, target: Path,
+                      variables: Dict[str, str], mode: int) -> None:
+        """Write one archive member, streaming unless it is a text template"""
+        output = target / self.output_path(relative_path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'wb') as f:
+            if self.is_text_template(relative_path):
+                f.write(self.render(stream.read(), variables))
+            else:
+                shutil.copyfileobj(stream, f, self.CHUNK_SIZE)
+        if mode:
+            os.chmod(output, mode)
+
+class GitTemplate(ArchiveTemplate):
+    """Template archived from a ref of a git repository, fetched on first use"""
+    
+    def __init__(self, name: str, url: str, ref: str, repos: "TemplateRepoCache"):
+        FilesystemTemplate.__init__(self, name, None)
+        self.url = url
+        self.ref = ref
+        self.repos = repos
+        self._checkout_lock = threading.Lock()
+        self.is_zip = False
+        self._prefix = ""
+    
+    @property
+    def description(self) -> str:
+        return self.manifest.get('description', f"Template from {self.url}#{self.ref}")
+    
+    def materialize(self, target: Path, variables: Dict[str, str]) -> None:
+        self._checkout()
+        super().materialize(target, variables)
+    
+    def _artifacts_key(self) -> Any:
+        # Keyed by the commit's archive, so a moved branch gets fresh artifacts
+        self._checkout()
+        return super()._artifacts_key()
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        self._checkout()
+        return super()._load_manifest()
+    
+    def _checkout(self) -> None:
+        """Resolve the ref to its commit archive once per instance"""
+        # ai_config and docs ask for the manifest concurrently
+        with self._checkout_lock:
+            if self.source is None:
+                self.source = self.repos.archive(self.url, self.ref)
+
+def is_git_url(source: str) -> bool:
+    """Check if a template source is a git repository URL"""
+    return (source.startswith(GIT_URL_PREFIXES) or SCP_URL.match(source) is not None)
+
+def load_git_template(name: str, source: str, cache_root: Optional[Path] = None,
+                      runner: Optional["CommandRunner"] = None) -> GitTemplate:
+    """Create a template for a git URL, with an optional '#ref' suffix (default HEAD)"""
+    from ..cache.template_repos import TemplateRepoCache
+    
+    url, _, ref = source.partition('#')
+    if url.startswith('git+'):
+        url = url[len('git+'):]
+    cache_root = cache_root or Path.home() / ".create_project" / "cache"
+    return GitTemplate(name, url, ref or "HEAD", TemplateRepoCache(Path(cache_root).expanduser(), runner))
+
+def load_filesystem_template(name: str, source: Path) -> FilesystemTemplate:
+    """Create a template for a directory or tar/zip archive"""
+    source = Path(source).expanduser().resolve()
+    if source.is_dir():
+        return DirectoryTemplate(name, source)
+    if source.is_file():
+        return ArchiveTemplate(name, source)
+    raise TemplateNotFoundError(f"Template source '{source}' not found")
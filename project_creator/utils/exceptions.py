@@ -25,3 +25,23 @@ class DependencyInstallError(ProjectCreatorError):
 class ValidationError(ProjectCreatorError):
     """Raised when validation fails"""
     pass
+
+class OperationCancelledError(ProjectCreatorError):
+    """Raised when project creation is cancelled"""
+    pass
+
+class UnsupportedRepositoryError(ProjectCreatorError):
+    """Raised when the native Git writer cannot reproduce what git would write"""
+    pass
+
+class InvalidTemplateError(ProjectCreatorError):
+    """Raised when a template directory or archive is malformed or unsafe"""
+    pass
+
+class ConfigurationError(ProjectCreatorError):
+    """Raised when a configuration value is invalid"""
+    pass
+
+class CommandTimeoutError(ProjectCreatorError):
+    """Raised when an external command runs past its timeout"""
+    pass
@@ -1,18 +1,125 @@
 """
 File operations and dependency management
 """
-from pathlib import Path
-from typing import Dict, Any, List
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
 import subprocess
 import shutil
 import json
-from .exceptions import DependencyInstallError
+import os
+import threading
+from .exceptions import DependencyInstallError, ValidationError
+from .installers import NodeInstaller, PythonInstaller, select_node_installer, select_python_installer
+from .process import CommandRunner
+from .tracing import Tracer
+
+if TYPE_CHECKING:
+    from ..cache.npm_locks import NpmLockCache
+    from ..cache.python_locks import PythonLockCache
+    from ..cache.wheelhouse import Wheelhouse
+
+# ioctl request number for FICLONE (Linux reflink)
+_FICLONE = 0x40049409
+
+def _reflink_file(src: Path, dst: Path) -> None:
+    """Copy-on-write clone a file, raising OSError when unsupported"""
+    import fcntl
+    try:
+        with open(src, 'rb') as source, open(dst, 'wb') as target:
+            fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+    except OSError:
+        dst.unlink(missing_ok=True)
+        raise
+    shutil.copystat(src, dst)
+
+def clone_tree(src: Path, dst: Path) -> str:
+    """Clone a directory tree by reflink, hardlink or copy, returning the method used"""
+    methods = ['reflink', 'hardlink', 'copy'] if os.name == 'posix' else ['hardlink', 'copy']
+    
+    def clone_file(source: Path, target: Path) -> None:
+        while True:
+            method = methods[0]
+            try:
+                if method == 'reflink':
+                    _reflink_file(source, target)
+                elif method == 'hardlink':
+                    os.link(source, target)
+                else:
+                    shutil.copy2(source, target)
+                return
+            except OSError:
+                if method == 'copy':
+                    raise
+                # Downgrade once for the whole tree instead of retrying per file
+                methods.pop(0)
+    
+    dst.mkdir(parents=True, exist_ok=True)
+    for root, dirs, files in os.walk(src):
+        rel_root = Path(root).relative_to(src)
+        target_root = dst / rel_root
+        for name in dirs + files:
+            source = Path(root) / name
+            target = target_root / name
+            if source.is_symlink():
+                os.symlink(os.readlink(source), target)
+            elif name in dirs:
+                target.mkdir(exist_ok=True)
+            else:
+                clone_file(source, target)
+    return methods[0]
+
+def copy_file_methods() -> List[str]:
+    """Get file copy methods to try, fastest first"""
+    methods = ['reflink'] if os.name == 'posix' else []
+    if hasattr(os, 'copy_file_range'):
+        methods.append('copy_file_range')
+    return methods + ['copy']
+
+def _copy_file_range(src: Path, dst: Path) -> None:
+    """Copy file data inside the kernel with copy_file_range"""
+    with open(src, 'rb') as source, open(dst, 'wb') as target:
+        remaining = os.fstat(source.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(source.fileno(), target.fileno(), remaining)
+            if not copied:
+                break
+            remaining -= copied
+
+def copy_file_data(src: Path, dst: Path, methods: List[str]) -> None:
+    """Copy a file without reading it into Python, downgrading methods once per caller"""
+    while True:
+        method = methods[0]
+        try:
+            if method == 'reflink':
+                _reflink_file(src, dst)
+            elif method == 'copy_file_range':
+                _copy_file_range(src, dst)
+            else:
+                shutil.copyfile(src, dst)
+            shutil.copymode(src, dst)
+            return
+        except OSError:
+            if method == 'copy':
+                raise
+            methods.pop(0)
 
 class FileManager:
     """Handle file and directory operations"""
     
-    def __init__(self, project_path: Path):
+    STREAM_BUFFER_SIZE = 64 * 1024
+    
+    def __init__(self, project_path: Path, tracer: Optional[Tracer] = None, fsync: bool = False):
         self.project_path = project_path
+        self.tracer = tracer or Tracer()
+        self.fsync = fsync
+        # Contents written through this manager, by relative path
+        self.written_files: Dict[str, bytes] = {}
+        self._plan: Dict[str, bytes] = {}
+        self._trees: List[Callable[[Path], None]] = []
+        self._streams: List[Iterable[Tuple[str, Iterable[bytes]]]] = []
+        self._plan_lock = threading.Lock()
+        self._created = False
+        self._backup: Optional[Path] = None
     
     def create_directory_structure(self, structure: Dict[str, Any]) -> None:
         """Create directory structure recursively"""
@@ -29,13 +136,173 @@ class FileManager:
                 with open(full_path, 'w') as f:
                     f.write(content)
     
-    def create_file(self, relative_path: str, content: str) -> None:
-        """Create a single file with content"""
-        file_path = self.project_path / relative_path
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+    def create_file(self, relative_path: str, content: Union[str, bytes]) -> None:
+        """Create a single file with text or pre-encoded content"""
+        with self.tracer.span(f"write {relative_path}", "file"):
+            file_path = self.project_path / relative_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            data = content.encode('utf-8') if isinstance(content, str) else content
+            with open(file_path, 'wb') as f:
+                f.write(data)
+            self.written_files[Path(relative_path).as_posix()] = data
+            self.tracer.add_bytes(len(data))
+    
+    def add_file(self, relative_path: str, content: Union[str, bytes]) -> None:
+        """Add a file to the plan written by write_plan"""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        with self._plan_lock:
+            self._plan[Path(relative_path).as_posix()] = data
+    
+    def add_tree(self, writer: Callable[[Path], None]) -> None:
+        """Add a writer that materializes files under the staging root before planned files"""
+        with self._plan_lock:
+            self._trees.append(writer)
+    
+    def add_stream(self, entries: Iterable[Tuple[str, Iterable[bytes]]]) -> None:
+        """Add (path, chunk iterator) entries that write_plan consumes one file at a time"""
+        with self._plan_lock:
+            self._streams.append(entries)
+    
+    def write_plan(self) -> None:
+        """Write all planned files in one pass to a staging directory and move it into place"""
+        with self._plan_lock:
+            plan, self._plan = self._plan, {}
+            trees, self._trees = self._trees, []
+            streams, self._streams = self._streams, []
         
-        with open(file_path, 'w') as f:
-            f.write(content)
+        staging = self.project_path.parent / f".{self.project_path.name}.staging-{os.getpid()}"
+        with self.tracer.span("write plan", "file", files=len(plan)) as span:
+            shutil.rmtree(staging, ignore_errors=True)
+            try:
+                staging.mkdir(parents=True)
+                for writer in trees:
+                    writer(staging)
+                streamed, streamed_files, streamed_bytes = self._write_streams(staging, streams)
+                span.args['streamed_files'] = streamed_files
+                self.tracer.add_bytes(streamed_bytes)
+                self._write_files(staging, plan)
+                if self.fsync:
+                    self._fsync_tree(staging)
+                self._move_into_place(staging)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+            # Tree writers clone files without reading them, so git reads those back from disk
+            self.written_files.update(streamed)
+            self.written_files.update(plan)
+            self.tracer.add_bytes(sum(len(data) for data in plan.values()))
+    
+    def rollback(self) -> None:
+        """Remove a project written by write_plan and restore the directory it replaced"""
+        if self._created:
+            shutil.rmtree(self.project_path, ignore_errors=True)
+            self._created = False
+        if self._backup is not None:
+            os.rename(self._backup, self.project_path)
+            self._backup = None
+    
+    def finalize(self) -> None:
+        """Drop the directory replaced by write_plan once the project is complete"""
+        self._created = False
+        if self._backup is not None:
+            shutil.rmtree(self._backup, ignore_errors=True)
+            self._backup = None
+    
+    def _write_files(self, root: Path, plan: Dict[str, bytes]) -> None:
+        """Create each distinct directory once, then write every file"""
+        for directory in sorted({Path(relative_path).parent for relative_path in plan}):
+            if directory.parts:
+                (root / directory).mkdir(parents=True, exist_ok=True)
+        
+        # Planned files override anything a tree writer put at the same path
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        for relative_path, data in plan.items():
+            fd = os.open(root / relative_path, flags, 0o666)
+            try:
+                self._write_all(fd, data)
+            finally:
+                os.close(fd)
+    
+    def _write_streams(self, root: Path, streams: List[Iterable[Tuple[str, Iterable[bytes]]]]
+                       ) -> Tuple[Dict[str, bytes], int, int]:
+        """Write streamed entries as they are produced, returning the small files' contents and file and byte counts"""
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        created_dirs = {root}
+        contents: Dict[str, bytes] = {}
+        files = size = 0
+        for entries in streams:
+            for relative_path, chunks in entries:
+                path = PurePosixPath(relative_path)
+                if path.is_absolute() or '..' in path.parts:
+                    raise ValidationError(f"Template file path '{relative_path}' escapes the project")
+                target = root / path
+                if target.parent not in created_dirs:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(target.parent)
+                
+                fd = os.open(target, flags, 0o666)
+                try:
+                    # Coalesce small chunks so memory stays bounded without a syscall per chunk
+                    buffer = bytearray()
+                    flushed = False
+                    for chunk in chunks:
+                        buffer += chunk
+                        size += len(chunk)
+                        if len(buffer) >= self.STREAM_BUFFER_SIZE:
+                            self._write_all(fd, buffer)
+                            buffer.clear()
+                            flushed = True
+                    self._write_all(fd, buffer)
+                finally:
+                    os.close(fd)
+                if flushed:
+                    # Too large to keep in memory: git reads it back from disk
+                    contents.pop(path.as_posix(), None)
+                else:
+                    contents[path.as_posix()] = bytes(buffer)
+                files += 1
+        return contents, files, size
+    
+    @staticmethod
+    def _write_all(fd: int, data: bytes) -> None:
+        """Write all of data to a file descriptor"""
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    
+    def _fsync_tree(self, root: Path) -> None:
+        """Flush every file under root, then the directories, to disk in one group"""
+        files, dirs = [], []
+        for current, _, names in os.walk(root):
+            dirs.append(Path(current))
+            files.extend(Path(current) / name for name in names if not os.path.islink(Path(current) / name))
+        self._fsync_paths(files + (dirs if os.name == 'posix' else []))
+    
+    def _fsync_paths(self, paths: List[Path]) -> None:
+        """Flush files and directories to disk"""
+        for path in paths:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+    
+    def _move_into_place(self, staging: Path) -> None:
+        """Rename staging to the project path, keeping a replaced directory as backup"""
+        if self.project_path.exists():
+            backup = self.project_path.parent / f".{self.project_path.name}.replaced-{os.getpid()}"
+            shutil.rmtree(backup, ignore_errors=True)
+            os.rename(self.project_path, backup)
+            self._backup = backup
+        try:
+            os.rename(staging, self.project_path)
+        except OSError:
+            self.rollback()
+            raise
+        self._created = True
+        if self.fsync and os.name == 'posix':
+            self._fsync_paths([self.project_path.parent])
     
     def copy_template_files(self, template_dir: Path) -> None:
         """Copy template files to project directory"""
@@ -45,31 +312,212 @@ class FileManager:
 class DependencyManager:
     """Handle dependency installation"""
     
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, wheelhouse: Optional["Wheelhouse"] = None,
+                 refresh_wheelhouse: bool = False, runner: Optional[CommandRunner] = None,
+                 npm_locks: Optional["NpmLockCache"] = None,
+                 python_locks: Optional["PythonLockCache"] = None,
+                 python_installer: Optional[PythonInstaller] = None,
+                 node_installer: Optional[NodeInstaller] = None):
         self.project_path = project_path
+        self.wheelhouse = wheelhouse
+        self.refresh_wheelhouse = refresh_wheelhouse
+        self.runner = runner or CommandRunner()
+        self.npm_locks = npm_locks
+        self.python_locks = python_locks
+        self.python_installer = python_installer or select_python_installer('pip', self.runner, project_path)
+        self.node_installer = node_installer or select_node_installer('npm', self.runner)
     
     def install_python_dependencies(self, requirements: List[str]) -> None:
         """Install Python dependencies"""
         if not requirements:
             return
         
+        self.write_requirements(requirements)
+        # Wheel building and lock resolution need pip itself whichever backend installs
+        pip = self.runner.resolve_tool('pip', f"{self.project_path}/venv/bin/pip")
+        
+        with self.runner.tracer.span("install python dependencies", "install",
+                                     installer=self.python_installer.name):
+            try:
+                if self.wheelhouse is None:
+                    self._install_requirements(pip, requirements, [])
+                else:
+                    self._install_from_wheelhouse(pip, requirements)
+            except subprocess.CalledProcessError as e:
+                raise DependencyInstallError(f"Failed to install Python dependencies: {e}")
+    
+    def _install_from_wheelhouse(self, pip: str, requirements: List[str]) -> None:
+        """Populate the wheelhouse if needed, then install without network access"""
+        refresh = self.refresh_wheelhouse
+        for attempt in range(2):
+            with self.wheelhouse.lock():
+                if refresh or not self.wheelhouse.has(requirements):
+                    self._populate_wheelhouse(pip, refresh)
+                    self.wheelhouse.record(requirements)
+                    refresh = False
+            
+            with self.wheelhouse.lock(shared=True):
+                try:
+                    self._install_requirements(pip, requirements,
+                                               ["--no-index", "--find-links", str(self.wheelhouse.path)])
+                    return
+                except subprocess.CalledProcessError:
+                    # Wheels missing from a recorded set, rebuild them once
+                    if attempt:
+                        raise
+                    refresh = True
+    
+    def _install_requirements(self, pip: str, requirements: List[str], index_args: List[str]) -> None:
+        """Install the hash-pinned lock without resolving, or requirements.txt when unpinnable"""
+        lock = None
+        if self.python_locks is not None:
+            # write_requirements already put a cached lock in place; one left by another set is stale
+            lock_file = self.project_path / "requirements.lock"
+            lock = lock_file.read_text() if lock_file.exists() else None
+            if lock is None or not self.python_locks.matches(lock, requirements):
+                lock = self._resolve_python_lock(pip, requirements, index_args)
+        
+        if lock is not None:
+            (self.project_path / "requirements.lock").write_text(lock)
+            try:
+                self.runner.run(self.python_installer.install_command("requirements.lock", index_args, hashes=True),
+                                cwd=self.project_path, heavy=True)
+                return
+            except subprocess.CalledProcessError:
+                # Stale lock, let pip resolve and pin again next time
+                self.python_locks.discard(requirements)
+                (self.project_path / "requirements.lock").unlink(missing_ok=True)
+        
+        self.runner.run(self.python_installer.install_command("requirements.txt", index_args),
+                        cwd=self.project_path, heavy=True)
+    
+    def _resolve_python_lock(self, pip: str, requirements: List[str], index_args: List[str]) -> Optional[str]:
+        """Let pip resolve requirements.txt without installing and cache the pinned result"""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report_file = Path(tmp_dir) / "report.json"
+            result = self.runner.run([
+                pip, "install", "--dry-run", "--ignore-installed", "--quiet",
+                "--report", str(report_file), *index_args, "-r", "requirements.txt"
+            ], cwd=self.project_path, check=False, capture=True, heavy=True)
+            if result.returncode or not report_file.exists():
+                # pip too old for --report, or resolution failed: install unpinned
+                return None
+            with open(report_file) as f:
+                report = json.load(f)
+        return self.python_locks.record_report(requirements, report)
+    
+    def _populate_wheelhouse(self, pip: str, refresh: bool) -> None:
+        """Download and build wheels for requirements.txt into the wheelhouse"""
+        command = [pip, "wheel", "-r", "requirements.txt", "--wheel-dir", str(self.wheelhouse.path)]
+        if not refresh:
+            # Reuse wheels other requirement sets already built
+            command += ["--find-links", str(self.wheelhouse.path)]
+        self.runner.run(command, cwd=self.project_path, heavy=True)
+    
+    def write_requirements(self, requirements: List[str]) -> None:
+        """Write requirements.txt without installing anything"""
         requirements_file = self.project_path / "requirements.txt"
         with open(requirements_file, 'w') as f:
             f.write('\n'.join(requirements))
         
-        try:
-            subprocess.run([
-                f"{self.project_path}/venv/bin/pip", 
-                "install", "-r", "requirements.txt"
-            ], cwd=self.project_path, check=True)
-        except subprocess.CalledProcessError as e:
-            raise DependencyInstallError(f"Failed to install Python dependencies: {e}")
+        lock = self.python_locks.lookup(requirements) if self.python_locks else None
+        if lock is not None:
+            (self.project_path / "requirements.lock").write_text(lock)
+        else:
+            # A lock for the previous requirement set must not be installed
+            (self.project_path / "requirements.lock").unlink(missing_ok=True)
     
     def install_node_dependencies(self, packages: Dict[str, list]) -> None:
-        """Install Node.js dependencies"""
+        """Install Node.js dependencies, frozen to the lockfile when a pinned lock is cached"""
         if not packages:
             return
         
+        installer = self.node_installer
+        if installer.import_command() is not None:
+            # Re-import from the cached npm lock rather than trust a lockfile for another dependency set
+            (self.project_path / installer.lockfile).unlink(missing_ok=True)
+        with self.runner.tracer.span("install node dependencies", "install", installer=installer.name):
+            try:
+                if self.write_package_files(packages) and self._import_package_lock():
+                    try:
+                        self.runner.run(installer.install_command(frozen=True), cwd=self.project_path, heavy=True)
+                        return
+                    except subprocess.CalledProcessError:
+                        # Cached lock no longer installs, resolve from scratch once
+                        (self.project_path / installer.lockfile).unlink(missing_ok=True)
+                        self.write_package_json(packages)
+                self.runner.run(installer.install_command(), cwd=self.project_path, heavy=True)
+            except subprocess.CalledProcessError as e:
+                raise DependencyInstallError(f"Failed to install Node.js dependencies: {e}")
+        if installer.import_command() is None:
+            # Only npm's package-lock.json can seed the lock cache
+            self._pin_node_dependencies(packages)
+    
+    def _import_package_lock(self) -> bool:
+        """Convert the cached package-lock.json to the installer's lockfile, False if it cannot"""
+        command = self.node_installer.import_command()
+        if command is None:
+            return True
+        lock_file = self.project_path / "package-lock.json"
+        result = self.runner.run(command, cwd=self.project_path, check=False, capture=True)
+        lock_file.unlink()
+        return result.returncode == 0
+    
+    def resolve_node_lock(self, packages: Dict[str, list]) -> Optional[Dict[str, Any]]:
+        """Re-resolve dependency versions without installing and refresh the cached lock"""
+        self.write_package_json(packages)
+        try:
+            self.runner.run([self.runner.resolve_tool('npm', "npm"), "install", "--package-lock-only"],
+                            cwd=self.project_path, heavy=True)
+        except subprocess.CalledProcessError as e:
+            raise DependencyInstallError(f"Failed to resolve Node.js dependencies: {e}")
+        return self._pin_node_dependencies(packages)
+    
+    def write_package_files(self, packages: Dict[str, list]) -> bool:
+        """Write package.json plus the cached package-lock.json, returning True when pinned"""
+        entry = self.npm_locks.lookup(packages) if self.npm_locks else None
+        if entry is None:
+            self.write_package_json(packages)
+            return False
+        
+        self.write_package_json(packages, entry['versions'])
+        if self.node_installer.lockfile == "package-lock.json" or not (
+                self.project_path / self.node_installer.lockfile).exists():
+            # Other installers import package-lock.json unless their lockfile is already in place
+            self._write_package_lock(entry['lock'])
+        return True
+    
+    def _pin_node_dependencies(self, packages: Dict[str, list]) -> Optional[Dict[str, Any]]:
+        """Record the versions npm resolved and pin package.json to them"""
+        lock_file = self.project_path / "package-lock.json"
+        if self.npm_locks is None or not lock_file.exists():
+            return None
+        
+        with open(lock_file) as f:
+            entry = self.npm_locks.record(packages, json.load(f))
+        if entry is not None:
+            self.write_package_json(packages, entry['versions'])
+            self._write_package_lock(entry['lock'])
+        return entry
+    
+    def _write_package_lock(self, lock: Dict[str, Any]) -> None:
+        """Write package-lock.json named after this project"""
+        lock = dict(lock, name=self.project_path.name)
+        if '' in lock.get('packages', {}):
+            lock['packages'] = dict(lock['packages'])
+            lock['packages'][''] = dict(lock['packages'][''], name=self.project_path.name)
+        # Replace rather than truncate: the file may be a hardlink into a cache
+        lock_file = self.project_path / "package-lock.json"
+        tmp_file = lock_file.with_name(f".{lock_file.name}.tmp-{os.getpid()}")
+        with open(tmp_file, 'w') as f:
+            json.dump(lock, f, indent=2)
+            f.write('\n')
+        os.replace(tmp_file, lock_file)
+    
+    def write_package_json(self, packages: Dict[str, list], versions: Optional[Dict[str, str]] = None) -> None:
+        """Write package.json without installing anything, pinned to exact versions if given"""
+        versions = versions or {}
         package_json = {
             "name": self.project_path.name,
             "version": "1.0.0",
@@ -79,14 +527,9 @@ class DependencyManager:
                 "build": "vite build",
                 "preview": "vite preview"
             },
-            "dependencies": {pkg: "*" for pkg in packages.get('packages', [])},
-            "devDependencies": {pkg: "*" for pkg in packages.get('dev_packages', [])}
+            "dependencies": {pkg: versions.get(pkg, "*") for pkg in packages.get('packages', [])},
+            "devDependencies": {pkg: versions.get(pkg, "*") for pkg in packages.get('dev_packages', [])}
         }
         
         with open(self.project_path / "package.json", 'w') as f:
             json.dump(package_json, f, indent=2)
-        
-        try:
-            subprocess.run(["npm", "install"], cwd=self.project_path, check=True)
-        except subprocess.CalledProcessError as e:
-            raise DependencyInstallError(f"Failed to install Node.js dependencies: {e}")
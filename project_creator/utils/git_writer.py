@@ -0,0 +1,336 @@
+"""
+In-process writer for a repository's initial commit
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import os
+import re
+import stat
+import struct
+import sys
+import time
+import zlib
+
+from .exceptions import UnsupportedRepositoryError
+
+# System-wide configuration of packaged git; GIT_CONFIG_SYSTEM overrides it
+SYSTEM_CONFIG = "/etc/gitconfig"
+
+class GitIgnore:
+    """Match paths against .gitignore patterns (no negation support)"""
+    
+    def __init__(self, lines: List[str]):
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+        for line in lines:
+            line = line.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('!'):
+                raise UnsupportedRepositoryError("Negated .gitignore patterns are not supported")
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            self.rules.append((re.compile(self._glob_to_regex(line.lstrip('/'))), dir_only, anchored))
+    
+    def is_ignored(self, relative_path: str, is_dir: bool) -> bool:
+        """Check a slash-separated path relative to the repository root"""
+        name = relative_path.rsplit('/', 1)[-1]
+        for pattern, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if pattern.fullmatch(relative_path if anchored else name):
+                return True
+        return False
+    
+    @staticmethod
+    def _glob_to_regex(glob: str) -> str:
+        """Translate a gitignore glob to a regex where * never crosses '/'"""
+        regex = ''
+        i = 0
+        while i < len(glob):
+            char = glob[i]
+            if glob.startswith('**/', i):
+                regex += '(?:.*/)?'
+                i += 3
+                continue
+            if glob.startswith('**', i):
+                regex += '.*'
+                i += 2
+                continue
+            if char == '*':
+                regex += '[^/]*'
+            elif char == '?':
+                regex += '[^/]'
+            elif char == '[':
+                end = glob.find(']', i + 1)
+                if end == -1:
+                    regex += re.escape(char)
+                else:
+                    regex += '[' + glob[i + 1:end].replace('!', '^', 1) + ']'
+                    i = end
+            else:
+                regex += re.escape(char)
+            i += 1
+        return regex
+
+class NativeGitWriter:
+    """Write .git, loose objects, index, refs and HEAD for an initial commit without forking git"""
+    
+    def __init__(self, repo_path: Path):
+        self.repo_path = repo_path
+        self.git_dir = repo_path / ".git"
+        self.settings = self._load_global_config()
+    
+    def create_initial_commit(self, message: str = "Initial commit",
+                              known_files: Optional[Dict[str, bytes]] = None) -> Optional[str]:
+        """Initialize the repository and commit all non-ignored files, returning the commit id"""
+        if self.git_dir.exists():
+            raise UnsupportedRepositoryError("Repository already exists")
+        self._check_supported()
+        author = self._get_identity()
+        committer = (os.environ.get('GIT_COMMITTER_NAME') or author[0],
+                     os.environ.get('GIT_COMMITTER_EMAIL') or author[1])
+        branch = self.settings.get('init.defaultbranch', 'master')
+        
+        entries = self._collect_entries(known_files or {})
+        self._init_layout(branch)
+        
+        index_entries = []
+        for relative_path, mode, data, path_stat in entries:
+            blob_id = self._write_object(b'blob', data)
+            index_entries.append((relative_path, mode, blob_id, path_stat))
+        
+        commit_id = None
+        if index_entries:
+            timestamp = int(time.time())
+            tree_id = self._write_tree(index_entries)
+            commit_id = self._write_commit(tree_id, author, committer, message, timestamp)
+            self._update_ref(branch, commit_id, committer, message, timestamp)
+        self._write_index(index_entries)
+        return commit_id
+    
+    def _check_supported(self) -> None:
+        """Fall back to git for settings that change what init/add/commit write"""
+        if self.settings.get('commit.gpgsign', 'false').lower() in ('true', 'yes', 'on', '1'):
+            raise UnsupportedRepositoryError("Signed commits require git")
+        if self.settings.get('core.autocrlf', 'false').lower() not in ('false', 'no', 'off', '0', 'input'):
+            raise UnsupportedRepositoryError("core.autocrlf requires git")
+        if 'init.templatedir' in self.settings or os.environ.get('GIT_TEMPLATE_DIR'):
+            raise UnsupportedRepositoryError("Custom init templates require git")
+        if any(os.environ.get(name) for name in ('GIT_AUTHOR_DATE', 'GIT_COMMITTER_DATE', 'GIT_DIR')):
+            raise UnsupportedRepositoryError("Git environment overrides require git")
+    
+    def _get_identity(self) -> Tuple[str, str]:
+        """Resolve author name and email the way git commit would"""
+        name = os.environ.get('GIT_AUTHOR_NAME') or self.settings.get('user.name')
+        email = os.environ.get('GIT_AUTHOR_EMAIL') or self.settings.get('user.email')
+        if not name or not email:
+            raise UnsupportedRepositoryError("No git identity configured")
+        return name, email
+    
+    def _load_global_config(self) -> Dict[str, str]:
+        """Read system and user-level git configuration as flat 'section.key' settings"""
+        if any(os.environ.get(name) for name in ('GIT_CONFIG', 'GIT_CONFIG_COUNT', 'GIT_CONFIG_PARAMETERS')):
+            raise UnsupportedRepositoryError("Git configuration from the environment requires git")
+        candidates = []
+        if not os.environ.get('GIT_CONFIG_NOSYSTEM'):
+            candidates.append(Path(os.environ.get('GIT_CONFIG_SYSTEM') or SYSTEM_CONFIG))
+        if os.environ.get('GIT_CONFIG_GLOBAL'):
+            candidates.append(Path(os.environ['GIT_CONFIG_GLOBAL']))
+        else:
+            xdg_home = Path(os.environ.get('XDG_CONFIG_HOME') or Path.home() / ".config")
+            candidates += [xdg_home / "git" / "config", Path.home() / ".gitconfig"]
+        
+        settings = {}
+        for path in candidates:
+            if path.is_file():
+                settings.update(self._parse_config(path.read_text(errors='replace')))
+        return settings
+    
+    @staticmethod
+    def _parse_config(text: str) -> Dict[str, str]:
+        """Parse git config syntax into 'section.key' settings"""
+        settings = {}
+        section = ''
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line[0] in '#;':
+                continue
+            if line.startswith('['):
+                section = line[1:line.index(']')].split()[0].lower() if ']' in line else ''
+                if section.startswith('include'):
+                    raise UnsupportedRepositoryError("Included git config files are not supported")
+                continue
+            key, _, value = line.partition('=')
+            value = re.split(r'\s[#;]', value.strip(), maxsplit=1)[0] if _ else 'true'
+            settings[f"{section}.{key.strip().lower()}"] = value.strip().strip('"')
+        return settings
+    
+    def _load_ignore(self) -> GitIgnore:
+        """Load repository and global ignore patterns"""
+        lines = []
+        excludes = self.settings.get('core.excludesfile')
+        xdg_home = Path(os.environ.get('XDG_CONFIG_HOME') or Path.home() / ".config")
+        global_ignore = Path(excludes).expanduser() if excludes else xdg_home / "git" / "ignore"
+        for path in (global_ignore, self.repo_path / ".gitignore"):
+            if path.is_file():
+                lines.extend(path.read_text().splitlines())
+        return GitIgnore(lines)
+    
+    def _collect_entries(self, known_files: Dict[str, bytes]) -> List[tuple]:
+        """Walk the tree honouring .gitignore, preferring in-memory contents"""
+        ignore = self._load_ignore()
+        entries = []
+        for root, dirs, files in os.walk(self.repo_path):
+            rel_root = os.path.relpath(root, self.repo_path).replace(os.sep, '/')
+            rel_root = '' if rel_root == '.' else rel_root + '/'
+            
+            if rel_root and '.gitignore' in files:
+                # Patterns relative to a subdirectory are not implemented
+                raise UnsupportedRepositoryError(f"Nested {rel_root}.gitignore requires git")
+            
+            kept_dirs = []
+            for name in dirs:
+                path = os.path.join(root, name)
+                if name == '.git':
+                    if rel_root:
+                        # git adds an embedded repository as a gitlink, not its files
+                        raise UnsupportedRepositoryError(f"Embedded repository {rel_root} requires git")
+                    continue
+                if ignore.is_ignored(rel_root + name, True):
+                    continue
+                if os.path.islink(path):
+                    files.append(name)
+                else:
+                    kept_dirs.append(name)
+            dirs[:] = kept_dirs
+            
+            for name in files:
+                relative_path = rel_root + name
+                if ignore.is_ignored(relative_path, False):
+                    continue
+                path = os.path.join(root, name)
+                path_stat = os.lstat(path)
+                if stat.S_ISLNK(path_stat.st_mode):
+                    mode = 0o120000
+                    data = os.fsencode(os.readlink(path))
+                else:
+                    mode = 0o100755 if path_stat.st_mode & stat.S_IXUSR else 0o100644
+                    data = known_files.get(relative_path)
+                    if data is None or len(data) != path_stat.st_size:
+                        with open(path, 'rb') as f:
+                            data = f.read()
+                entries.append((relative_path, mode, data, path_stat))
+        return entries
+    
+    def _init_layout(self, branch: str) -> None:
+        """Create the directory layout git init would"""
+        for directory in ("objects/info", "objects/pack", "refs/heads", "refs/tags", "hooks", "info"):
+            (self.git_dir / directory).mkdir(parents=True, exist_ok=True)
+        
+        core = [
+            "[core]",
+            "\trepositoryformatversion = 0",
+            "\tfilemode = true",
+            "\tbare = false",
+            "\tlogallrefupdates = true",
+        ]
+        if sys.platform == 'darwin':
+            core += ["\tignorecase = true", "\tprecomposeunicode = true"]
+        (self.git_dir / "config").write_text('\n'.join(core) + '\n')
+        (self.git_dir / "HEAD").write_text(f"ref: refs/heads/{branch}\n")
+        (self.git_dir / "description").write_text(
+            "Unnamed repository; edit this file 'description' to name the repository.\n")
+        (self.git_dir / "info" / "exclude").write_text(
+            "# git ls-files --others --exclude-from=.git/info/exclude\n"
+            "# Lines that start with '#' are comments.\n"
+            "# For a project mostly in C, the following would be a good set of\n"
+            "# exclude patterns (uncomment them if you want to use them):\n"
+            "# *.[oa]\n"
+            "# *~\n")
+    
+    def _write_object(self, kind: bytes, data: bytes) -> bytes:
+        """Write a loose object, returning its binary id"""
+        raw = kind + b' ' + str(len(data)).encode() + b'\0' + data
+        object_id = hashlib.sha1(raw).digest()
+        hex_id = object_id.hex()
+        path = self.git_dir / "objects" / hex_id[:2] / hex_id[2:]
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_name(f"tmp_{hex_id[2:]}")
+            tmp_path.write_bytes(zlib.compress(raw))
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, path)
+        return object_id
+    
+    def _write_tree(self, index_entries: List[tuple]) -> bytes:
+        """Write tree objects for the index entries, returning the root tree id"""
+        root: dict = {}
+        for relative_path, mode, blob_id, _ in index_entries:
+            node = root
+            parts = relative_path.split('/')
+            for part in parts[:-1]:
+                node = node.setdefault(part, {})
+            node[parts[-1]] = (mode, blob_id)
+        return self._write_tree_node(root)
+    
+    def _write_tree_node(self, node: dict) -> bytes:
+        """Write one tree level; git orders directories as if named 'name/'"""
+        items = []
+        for name, value in node.items():
+            if isinstance(value, dict):
+                items.append((name.encode() + b'/', b'40000', name.encode(), self._write_tree_node(value)))
+            else:
+                mode, blob_id = value
+                items.append((name.encode(), b'%o' % mode, name.encode(), blob_id))
+        items.sort(key=lambda item: item[0])
+        data = b''.join(mode + b' ' + name + b'\0' + object_id for _, mode, name, object_id in items)
+        return self._write_object(b'tree', data)
+    
+    def _signature(self, identity: Tuple[str, str], timestamp: int) -> str:
+        """Format 'Name <email> seconds +zone'"""
+        offset = time.localtime(timestamp).tm_gmtoff // 60
+        sign = '+' if offset >= 0 else '-'
+        zone = f"{sign}{abs(offset) // 60:02d}{abs(offset) % 60:02d}"
+        return f"{identity[0]} <{identity[1]}> {timestamp} {zone}"
+    
+    def _write_commit(self, tree_id: bytes, author: Tuple[str, str], committer: Tuple[str, str],
+                      message: str, timestamp: int) -> str:
+        """Write the root commit object"""
+        body = (f"tree {tree_id.hex()}\n"
+                f"author {self._signature(author, timestamp)}\n"
+                f"committer {self._signature(committer, timestamp)}\n"
+                f"\n{message}\n")
+        return self._write_object(b'commit', body.encode()).hex()
+    
+    def _update_ref(self, branch: str, commit_id: str, identity: Tuple[str, str], message: str,
+                    timestamp: int) -> None:
+        """Point the branch at the commit and record reflogs"""
+        (self.git_dir / "refs" / "heads" / branch).write_text(commit_id + "\n")
+        line = f"{'0' * 40} {commit_id} {self._signature(identity, timestamp)}\tcommit (initial): {message}\n"
+        for log in (self.git_dir / "logs" / "HEAD", self.git_dir / "logs" / "refs" / "heads" / branch):
+            log.parent.mkdir(parents=True, exist_ok=True)
+            log.write_text(line)
+    
+    def _write_index(self, index_entries: List[tuple]) -> None:
+        """Write a version 2 index with stat data so git status sees a clean tree"""
+        body = [b'DIRC', struct.pack('>II', 2, len(index_entries))]
+        for relative_path, mode, blob_id, st in sorted(index_entries, key=lambda entry: entry[0].encode()):
+            name = relative_path.encode()
+            entry = struct.pack(
+                '>IIIIIIIIII',
+                int(st.st_ctime) & 0xFFFFFFFF, st.st_ctime_ns % 1_000_000_000,
+                int(st.st_mtime) & 0xFFFFFFFF, st.st_mtime_ns % 1_000_000_000,
+                st.st_dev & 0xFFFFFFFF, st.st_ino & 0xFFFFFFFF,
+                mode, st.st_uid & 0xFFFFFFFF, st.st_gid & 0xFFFFFFFF,
+                st.st_size & 0xFFFFFFFF
+            ) + blob_id + struct.pack('>H', min(len(name), 0xFFF)) + name
+            # NUL-terminate and pad each entry to a multiple of eight bytes
+            entry += b'\0' * (8 - len(entry) % 8)
+            body.append(entry)
+        
+        content = b''.join(body)
+        tmp_path = self.git_dir / "index.lock"
+        tmp_path.write_bytes(content + hashlib.sha1(content).digest())
+        os.replace(tmp_path, self.git_dir / "index")
@@ -0,0 +1,137 @@
+"""
+Package installer backends for Python and Node.js dependencies
+"""
+from pathlib import Path
+from typing import List, Optional
+import os
+import shutil
+
+from .exceptions import ConfigurationError
+from .process import CommandRunner
+
+class PythonInstaller:
+    """Install requirement files into the project venv with pip"""
+    
+    name = "pip"
+    
+    def __init__(self, executable: str):
+        self.executable = executable
+    
+    def install_command(self, requirements_file: str, index_args: List[str], hashes: bool = False) -> List[str]:
+        """Get the command installing a requirements file, without resolving when hash-pinned"""
+        command = [self.executable, "install"]
+        if hashes:
+            command += ["--no-deps", "--require-hashes"]
+        return command + index_args + ["-r", requirements_file]
+
+class UvInstaller(PythonInstaller):
+    """Install requirement files into the project venv with uv's pip interface"""
+    
+    name = "uv"
+    
+    def __init__(self, executable: str, python: str):
+        super().__init__(executable)
+        self.python = python
+    
+    def install_command(self, requirements_file: str, index_args: List[str], hashes: bool = False) -> List[str]:
+        command = [self.executable, "pip", "install", "--python", self.python]
+        if hashes:
+            command += ["--no-deps", "--require-hashes"]
+        return command + index_args + ["-r", requirements_file]
+
+class NodeInstaller:
+    """Install package.json dependencies into a flat node_modules with npm"""
+    
+    name = "npm"
+    lockfile = "package-lock.json"
+    
+    def __init__(self, executable: str):
+        self.executable = executable
+    
+    def install_command(self, frozen: bool = False) -> List[str]:
+        """Get the install command, strictly following the lockfile when frozen"""
+        return [self.executable, "ci" if frozen else "install"]
+    
+    def import_command(self) -> Optional[List[str]]:
+        """Get the command converting package-lock.json to this tool's lockfile, None if native"""
+        return None
+
+class PnpmInstaller(NodeInstaller):
+    """Install with pnpm, hoisted so node_modules matches npm's layout"""
+    
+    name = "pnpm"
+    lockfile = "pnpm-lock.yaml"
+    
+    def install_command(self, frozen: bool = False) -> List[str]:
+        command = [self.executable, "install", "--config.node-linker=hoisted"]
+        return command + (["--frozen-lockfile"] if frozen else [])
+    
+    def import_command(self) -> Optional[List[str]]:
+        return [self.executable, "import"]
+
+class YarnInstaller(NodeInstaller):
+    """Install with Yarn 1's flat node_modules linker"""
+    
+    name = "yarn"
+    lockfile = "yarn.lock"
+    
+    def install_command(self, frozen: bool = False) -> List[str]:
+        return [self.executable, "install"] + (["--frozen-lockfile"] if frozen else [])
+    
+    def import_command(self) -> Optional[List[str]]:
+        return [self.executable, "import"]
+
+PYTHON_INSTALLERS = ['pip', 'uv']
+NODE_INSTALLERS = ['npm', 'pnpm', 'yarn']
+# Auto-detection preference, fastest first
+_NODE_PREFERENCE = ['pnpm', 'yarn', 'npm']
+
+def _find_tool(runner: CommandRunner, name: str) -> Optional[str]:
+    """Get a configured or PATH executable for a tool, None when unavailable"""
+    return runner.resolve_tool(name, shutil.which(name))
+
+def _venv_executable(project_path: Path, name: str) -> str:
+    """Get the path of an executable inside the project venv"""
+    if os.name == 'nt':
+        return str(project_path / "venv" / "Scripts" / f"{name}.exe")
+    return str(project_path / "venv" / "bin" / name)
+
+def select_python_installer(choice: str, runner: CommandRunner, project_path: Path) -> PythonInstaller:
+    """Get the Python installer from config ('auto', 'pip' or 'uv')"""
+    if choice not in PYTHON_INSTALLERS + ['auto']:
+        raise ConfigurationError(f"Unknown python_installer '{choice}', expected auto, {', '.join(PYTHON_INSTALLERS)}")
+    
+    if choice in ('auto', 'uv'):
+        uv = _find_tool(runner, 'uv')
+        if uv is not None:
+            return UvInstaller(uv, _venv_executable(project_path, "python"))
+        if choice == 'uv':
+            raise ConfigurationError("python_installer is 'uv' but uv was not found")
+    return PythonInstaller(runner.resolve_tool('pip', _venv_executable(project_path, "pip")))
+
+def _is_classic_yarn(runner: CommandRunner, executable: str) -> bool:
+    """Check a yarn executable is Yarn 1; Yarn 2+ defaults to Plug'n'Play and has no 'yarn import'"""
+    try:
+        result = runner.run([executable, "--version"], cwd=Path.cwd(), check=False, capture=True)
+    except OSError:
+        return False
+    return result.returncode == 0 and result.stdout.strip().startswith("1.")
+
+def select_node_installer(choice: str, runner: CommandRunner) -> NodeInstaller:
+    """Get the Node.js installer from config ('auto', 'npm', 'pnpm' or 'yarn')"""
+    installers = {'npm': NodeInstaller, 'pnpm': PnpmInstaller, 'yarn': YarnInstaller}
+    if choice not in NODE_INSTALLERS + ['auto']:
+        raise ConfigurationError(
+            f"Unknown preferred_package_manager '{choice}', expected auto, {', '.join(NODE_INSTALLERS)}")
+    
+    if choice == 'auto':
+        for name in _NODE_PREFERENCE:
+            executable = _find_tool(runner, name)
+            if executable is not None and (name != 'yarn' or _is_classic_yarn(runner, executable)):
+                return installers[name](executable)
+        # Let the install fail with npm's usual "not found" error
+        return NodeInstaller('npm')
+    executable = runner.resolve_tool(choice, choice)
+    if choice == 'yarn' and not _is_classic_yarn(runner, executable):
+        raise ConfigurationError("preferred_package_manager 'yarn' needs Yarn 1; Yarn 2+ is not supported")
+    return installers[choice](executable)
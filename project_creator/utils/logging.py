@@ -2,7 +2,8 @@
 Logging and progress tracking utilities
 """
 import logging
-from typing import Optional
+import threading
+from typing import Callable, Optional
 
 class ProjectLogger:
     """Centralized logging for project creator"""
@@ -23,6 +24,10 @@ class ProjectLogger:
         """Log info message"""
         self.logger.info(message)
     
+    def warning(self, message: str):
+        """Log warning message"""
+        self.logger.warning(message)
+    
     def error(self, message: str):
         """Log error message"""
         self.logger.error(message)
@@ -34,11 +39,16 @@ class ProjectLogger:
 class ProgressTracker:
     """Track progress of project creation"""
     
-    def __init__(self, total_steps: int):
+    def __init__(self, total_steps: int, callback: Optional[Callable[[int, int, str], None]] = None):
         self.total_steps = total_steps
         self.current_step = 0
+        self.callback = callback
+        self._lock = threading.Lock()
     
     def step(self, message: str):
         """Increment step and show progress"""
-        self.current_step += 1
-        print(f"[{self.current_step}/{self.total_steps}] {message}")
+        with self._lock:
+            self.current_step += 1
+            print(f"[{self.current_step}/{self.total_steps}] {message}")
+            if self.callback:
+                self.callback(self.current_step, self.total_steps, message)
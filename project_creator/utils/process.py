@@ -0,0 +1,323 @@
+"""
+External command execution
+"""
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import atexit
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import weakref
+
+try:
+    import fcntl
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    fcntl = resource = None
+
+from .exceptions import CommandTimeoutError, OperationCancelledError
+from .tracing import Span, Tracer
+
+# Seconds a terminated command gets to exit before it is killed
+TERMINATE_GRACE = 5.0
+# Lines of a failed command's streamed output repeated in the log
+FAILURE_TAIL = 20
+# Longest output line read in one piece
+LINE_LIMIT = 1024 * 1024
+# Seconds between attempts to claim a heavy-command slot held by another process
+SLOT_POLL = 0.05
+
+def _children_usage() -> Optional[Any]:
+    """Get resource usage of every reaped child process, None where unsupported"""
+    return resource.getrusage(resource.RUSAGE_CHILDREN) if resource else None
+
+class _LoopThread:
+    """A process-wide asyncio event loop running in a daemon thread"""
+    
+    _lock = threading.Lock()
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _pid: Optional[int] = None
+    _heavy: Optional[asyncio.Semaphore] = None
+    
+    @classmethod
+    def get(cls) -> asyncio.AbstractEventLoop:
+        """Get the shared loop, starting it on first use and after a fork"""
+        with cls._lock:
+            if cls._loop is None or cls._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="command-runner", daemon=True).start()
+                cls._loop, cls._pid, cls._heavy = loop, os.getpid(), None
+            return cls._loop
+    
+    @classmethod
+    def heavy_slots(cls, size: int) -> asyncio.Semaphore:
+        """Get the loop's heavy-command semaphore, shared by every runner; only call on the loop thread"""
+        if cls._heavy is None:
+            # Sized by the first runner that needs it
+            cls._heavy = asyncio.Semaphore(size)
+        return cls._heavy
+    
+    @classmethod
+    def on_loop(cls) -> bool:
+        """Check if the caller runs on the shared loop's thread"""
+        try:
+            return asyncio.get_running_loop() is cls._loop
+        except RuntimeError:
+            return False
+
+# Runners with commands that may still be running, killed when the interpreter exits
+_RUNNERS: "weakref.WeakSet[CommandRunner]" = weakref.WeakSet()
+
+@atexit.register
+def _kill_children() -> None:
+    """Kill the process groups of commands still running at exit; they run in sessions of their own"""
+    for runner in list(_RUNNERS):
+        runner.kill()
+
+class CommandRunner:
+    """Run external commands on a shared event loop with streaming, timeouts and cancellation"""
+    
+    def __init__(self, output_callback: Optional[Callable[[str], None]] = None,
+                 tracer: Optional[Tracer] = None, tools: Optional[Dict[str, str]] = None,
+                 timeout: Optional[float] = None, max_heavy: int = 2, slots_dir: Optional[Path] = None):
+        self.output_callback = output_callback
+        self.tracer = tracer or Tracer()
+        self.tools = dict(tools or {})
+        self.timeout = timeout or None
+        self.max_heavy = max(1, max_heavy)
+        # Lock files shared with other processes, so the heavy cap also holds across batch workers
+        self.slots_dir = slots_dir
+        self.logger = logging.getLogger("project_creator.commands")
+        self._processes = set()
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._terminations = set()
+    
+    @property
+    def cancelled(self) -> bool:
+        """Check if cancellation was requested"""
+        return self._cancelled.is_set()
+    
+    def resolve_tool(self, name: str, default: str) -> str:
+        """Get the executable for a tool, honouring configured overrides"""
+        return self.tools.get(name) or default
+    
+    def run(self, args: List[str], cwd: Path, check: bool = True, capture: bool = False,
+            timeout: Optional[float] = None, heavy: bool = False) -> subprocess.CompletedProcess:
+        """Run a command to completion; capture returns stdout instead of streaming it"""
+        self.check_cancelled()
+        
+        loop = _LoopThread.get()
+        with self.tracer.span(self._span_name(args), "command", argv=" ".join(str(arg) for arg in args)) as span:
+            future = asyncio.run_coroutine_threadsafe(self._execute(args, cwd, capture, timeout, heavy), loop)
+            try:
+                result, usage = future.result()
+            except BaseException:
+                # Interrupted while waiting: take the command down with us
+                future.cancel()
+                raise
+            span.args['returncode'] = result.returncode
+            span.args.update(usage)
+        
+        return self._check(result, check)
+    
+    async def run_async(self, args: List[str], cwd: Path, check: bool = True, capture: bool = False,
+                        timeout: Optional[float] = None, heavy: bool = False) -> subprocess.CompletedProcess:
+        """Run a command from a coroutine; cancelling the task kills the command"""
+        self.check_cancelled()
+        
+        span = Span(self._span_name(args), "command", {'argv': " ".join(str(arg) for arg in args)})
+        try:
+            result, usage = await self._execute(args, cwd, capture, timeout, heavy)
+            span.args['returncode'] = result.returncode
+            span.args.update(usage)
+        finally:
+            self.tracer.record(span)
+        
+        return self._check(result, check)
+    
+    @staticmethod
+    def _span_name(args: List[str]) -> str:
+        """Get a short span name from a command line"""
+        return " ".join([Path(args[0]).name] + [str(arg) for arg in args[1:3]])
+    
+    def _check(self, result: subprocess.CompletedProcess, check: bool) -> subprocess.CompletedProcess:
+        """Raise for cancellation or a failed checked command"""
+        self.check_cancelled()
+        if check and result.returncode:
+            raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
+        return result
+    
+    async def _execute(self, args: List[str], cwd: Path, capture: bool, timeout: Optional[float],
+                       heavy: bool) -> Tuple[subprocess.CompletedProcess, Dict[str, Any]]:
+        """Run a command, holding a heavy-command slot if asked"""
+        if not heavy:
+            return await self._spawn(args, cwd, capture, timeout)
+        # The loop's semaphore caps this process, daemon jobs included; slot files cap batch workers
+        async with _LoopThread.heavy_slots(self.max_heavy):
+            self.check_cancelled()
+            slot = await self._claim_slot()
+            try:
+                return await self._spawn(args, cwd, capture, timeout)
+            finally:
+                if slot is not None:
+                    os.close(slot)
+    
+    async def _claim_slot(self) -> Optional[int]:
+        """Lock one of max_heavy slot files shared between processes, None without slots_dir"""
+        if self.slots_dir is None or fcntl is None:
+            return None
+        self.slots_dir.mkdir(parents=True, exist_ok=True)
+        while True:
+            for index in range(self.max_heavy):
+                fd = os.open(self.slots_dir / f"slot-{index}", os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return fd
+                except BlockingIOError:
+                    os.close(fd)
+            await asyncio.sleep(SLOT_POLL)
+            self.check_cancelled()
+    
+    async def _spawn(self, args: List[str], cwd: Path, capture: bool,
+                     timeout: Optional[float]) -> Tuple[subprocess.CompletedProcess, Dict[str, Any]]:
+        """Start a command and wait for it, streaming or capturing its output, with its resource usage"""
+        kwargs = {}
+        if os.name == 'posix':
+            # Own process group so cancellation and timeouts reach grandchildren too
+            kwargs['start_new_session'] = True
+        before = _children_usage()
+        process = await asyncio.create_subprocess_exec(
+            *[str(arg) for arg in args], cwd=cwd, stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, limit=LINE_LIMIT, **kwargs)
+        with self._lock:
+            self._processes.add(process)
+            overlapped = len(self._processes) > 1
+        _RUNNERS.add(self)
+        if self.cancelled:
+            # cancel() ran between the check and the spawn
+            await self._terminate(process)
+        
+        timeout = timeout or self.timeout
+        try:
+            if capture:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+                return (subprocess.CompletedProcess(args, process.returncode, stdout.decode(errors='replace'),
+                                                    stderr.decode(errors='replace')),
+                        self._usage(before, overlapped))
+            
+            tail = deque(maxlen=FAILURE_TAIL)
+            await asyncio.wait_for(asyncio.gather(
+                self._stream(process.stdout, args, tail),
+                self._stream(process.stderr, args, tail),
+                process.wait()), timeout)
+            if process.returncode and not self.cancelled and self.output_callback is None and tail:
+                self.logger.warning(f"{self._span_name(args)} exited with {process.returncode}:\n" + "\n".join(tail))
+            return subprocess.CompletedProcess(args, process.returncode), self._usage(before, overlapped)
+        except asyncio.TimeoutError:
+            await self._terminate(process)
+            raise CommandTimeoutError(f"'{' '.join(str(arg) for arg in args)}' timed out after {timeout:g}s")
+        except asyncio.CancelledError:
+            await asyncio.shield(self._terminate(process))
+            raise
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+    
+    def _usage(self, before: Optional[Any], overlapped: bool) -> Dict[str, Any]:
+        """Get what the children reaped since before used: CPU seconds, peak RSS and block I/O"""
+        after = _children_usage()
+        if before is None or after is None:
+            return {}
+        with self._lock:
+            # This command is still registered
+            overlapped = overlapped or len(self._processes) > 1
+        usage = {
+            'child_user_s': round(after.ru_utime - before.ru_utime, 6),
+            'child_sys_s': round(after.ru_stime - before.ru_stime, 6),
+            'child_in_blocks': after.ru_inblock - before.ru_inblock,
+            'child_out_blocks': after.ru_oublock - before.ru_oublock,
+        }
+        if after.ru_maxrss > before.ru_maxrss:
+            # The peak of all reaped children, so only known when this command raised it
+            usage['child_max_rss_kb'] = after.ru_maxrss // 1024 if sys.platform == 'darwin' else after.ru_maxrss
+        if overlapped:
+            # Other commands ran at the same time and share the deltas
+            usage['child_usage_shared'] = True
+        return usage
+    
+    async def _stream(self, stream: asyncio.StreamReader, args: List[str], tail: deque) -> None:
+        """Forward output line by line to the output callback, or the log"""
+        tool = Path(args[0]).name
+        while True:
+            try:
+                line = await stream.readline()
+            except ValueError:
+                # readline dropped a line over LINE_LIMIT, go on with the next one
+                continue
+            if not line:
+                return
+            text = line.decode(errors='replace').rstrip('\r\n')
+            tail.append(text)
+            if self.output_callback is not None:
+                self.output_callback(text)
+            else:
+                self.logger.debug(f"{tool}: {text}")
+    
+    async def _terminate(self, process: asyncio.subprocess.Process, grace: float = TERMINATE_GRACE) -> None:
+        """Stop a command and its process group, killing it if it ignores SIGTERM"""
+        self._signal(process, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(process.wait(), grace)
+        except asyncio.TimeoutError:
+            self._signal(process, signal.SIGKILL if os.name == 'posix' else signal.SIGTERM)
+            await process.wait()
+    
+    def check_cancelled(self) -> None:
+        """Raise if cancellation was requested"""
+        if self._cancelled.is_set():
+            raise OperationCancelledError("Project creation was cancelled")
+    
+    def cancel(self, timeout: float = TERMINATE_GRACE) -> None:
+        """Cancel: terminate running commands and refuse to start new ones"""
+        self._cancelled.set()
+        with self._lock:
+            processes = list(self._processes)
+        
+        if _LoopThread.on_loop():
+            # Called from an output callback: waiting here would block the loop the termination needs
+            for process in processes:
+                task = asyncio.ensure_future(self._terminate(process, timeout))
+                # The loop only keeps weak references to tasks
+                self._terminations.add(task)
+                task.add_done_callback(self._terminations.discard)
+            return
+        
+        loop = _LoopThread.get()
+        futures = [asyncio.run_coroutine_threadsafe(self._terminate(process, timeout), loop)
+                   for process in processes]
+        for future in futures:
+            future.result()
+    
+    def kill(self) -> None:
+        """Cancel and kill running commands at once, without the event loop; for interpreter exit"""
+        self._cancelled.set()
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            self._signal(process, signal.SIGKILL if os.name == 'posix' else signal.SIGTERM)
+    
+    def _signal(self, process: asyncio.subprocess.Process, sig: int) -> None:
+        """Send a signal to a command and its process group"""
+        try:
+            if os.name == 'posix':
+                os.killpg(process.pid, sig)
+            else:
+                process.send_signal(sig)
+        except (ProcessLookupError, PermissionError):
+            pass
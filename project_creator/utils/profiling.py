@@ -0,0 +1,138 @@
+"""
+In-process profiling of a creation run: cProfile, tracemalloc and child resource usage
+"""
+from pathlib import Path
+from typing import Any, List, Optional
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from .tracing import Tracer
+
+class Profiler:
+    """Profile Python code on every thread started inside it, and sum what child processes used"""
+    
+    TOP_FUNCTIONS = 15
+    TOP_COMMANDS = 10
+    TOP_ALLOCATIONS = 10
+    
+    def __init__(self):
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._stats: Optional[pstats.Stats] = None
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._peak = 0
+        self._wall = 0.0
+        self._wall_start = 0.0
+        self._usage_start: Optional[dict] = None
+        self._usage = {}
+    
+    def __enter__(self) -> "Profiler":
+        self._usage_start = self._rusage()
+        self._wall_start = time.perf_counter()
+        tracemalloc.start()
+        if sys.version_info < (3, 12):
+            # cProfile only sees its own thread, so each new task thread gets a profile of its own
+            threading.setprofile(self._profile_thread)
+        # From 3.12 cProfile runs on sys.monitoring, which covers every thread and allows one profiler
+        self._start_profile()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        if sys.version_info < (3, 12):
+            threading.setprofile(None)
+        with self._lock:
+            profiles = list(self._profiles)
+        for profile in profiles:
+            profile.disable()
+        self._wall = time.perf_counter() - self._wall_start
+        self._snapshot = tracemalloc.take_snapshot()
+        self._peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        
+        usage_end = self._rusage()
+        if self._usage_start and usage_end:
+            self._usage = {key: usage_end[key] - self._usage_start[key] for key in usage_end}
+        
+        stats = pstats.Stats(profiles[0], stream=io.StringIO())
+        for profile in profiles[1:]:
+            stats.add(profile)
+        self._stats = stats
+    
+    def dump_stats(self, path: Path) -> None:
+        """Write the merged cProfile data as a pstats file"""
+        self._stats.dump_stats(str(path))
+    
+    def report(self, tracer: Optional[Tracer] = None) -> str:
+        """Build a ranked report: time split, slowest commands, hottest functions, largest allocations"""
+        lines = [f"Wall time {self._wall:.2f}s"]
+        if self._usage:
+            lines.append(f"  create-project CPU {self._usage['self_cpu']:.2f}s, "
+                         f"child processes CPU {self._usage['child_cpu']:.2f}s, "
+                         f"child block I/O {self._usage['child_in_blocks']} in / "
+                         f"{self._usage['child_out_blocks']} out")
+        
+        commands = [span for span in (tracer.spans if tracer else []) if span.category == "command"]
+        if commands:
+            lines += ["", "Slowest external commands:",
+                      f"  {'wall':>7} {'cpu':>7} {'max rss':>9} {'blocks in/out':>15}  command"]
+            for span in sorted(commands, key=lambda span: span.duration_ns, reverse=True)[:self.TOP_COMMANDS]:
+                args = span.args
+                cpu = args.get('child_user_s', 0) + args.get('child_sys_s', 0)
+                rss = f"{args['child_max_rss_kb'] // 1024} MB" if 'child_max_rss_kb' in args else "-"
+                io_blocks = f"{args.get('child_in_blocks', 0)}/{args.get('child_out_blocks', 0)}"
+                shared = " (ran alongside others)" if args.get('child_usage_shared') else ""
+                lines.append(f"  {span.wall_time:6.2f}s {cpu:6.2f}s {rss:>9} {io_blocks:>15}  {span.name}{shared}")
+        
+        lines += ["", "Hottest Python functions (cumulative):",
+                  f"  {'calls':>8} {'own':>8} {'cumul.':>8}  function"]
+        entries = sorted(self._stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        for (filename, lineno, function), (_, calls, own, cumulative, _) in entries[:self.TOP_FUNCTIONS]:
+            location = f"{Path(filename).name}:{lineno}({function})" if lineno else function
+            lines.append(f"  {calls:>8} {own:7.3f}s {cumulative:7.3f}s  {location}")
+        
+        lines += ["", f"Largest Python allocations still held (peak {self._peak / 1024 / 1024:.1f} MB):"]
+        for stat in self._snapshot.statistics('lineno')[:self.TOP_ALLOCATIONS]:
+            frame = stat.traceback[0]
+            lines.append(f"  {stat.size / 1024:9.1f} KB {stat.count:>7} blocks  "
+                         f"{Path(frame.filename).name}:{frame.lineno}")
+        return "\n".join(lines)
+    
+    def _start_profile(self) -> None:
+        """Start a profile on the current thread"""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active: that one already sees this thread
+            return
+        with self._lock:
+            self._profiles.append(profile)
+    
+    def _profile_thread(self, frame: Any, event: str, arg: Any) -> None:
+        """threading.setprofile hook: replace itself with a cProfile profile on first call"""
+        sys.setprofile(None)
+        self._start_profile()
+    
+    @staticmethod
+    def _rusage() -> Optional[dict]:
+        """Get CPU and block I/O of this process and its reaped children"""
+        if resource is None:
+            return None
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return {
+            'self_cpu': own.ru_utime + own.ru_stime,
+            'child_cpu': children.ru_utime + children.ru_stime,
+            'child_in_blocks': children.ru_inblock,
+            'child_out_blocks': children.ru_oublock,
+        }
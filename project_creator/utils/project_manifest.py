@@ -0,0 +1,71 @@
+"""
+Content-hash manifest of what a project was generated with
+"""
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+import hashlib
+import json
+import os
+import time
+
+MANIFEST_FILE = ".create_project.json"
+CHUNK_SIZE = 1024 * 1024
+
+def hash_file(path: Path) -> Optional[str]:
+    """Get the sha256 of a file, or of a symlink's target path; None if missing"""
+    try:
+        if path.is_symlink():
+            return "link:" + hashlib.sha256(os.readlink(path).encode()).hexdigest()
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+
+def hash_tree(root: Path) -> Dict[str, str]:
+    """Hash every file under root by relative path, skipping the manifest"""
+    hashes = {}
+    for current, dirs, files in os.walk(root):
+        rel_root = Path(current).relative_to(root)
+        for name in dirs + files:
+            path = Path(current) / name
+            if name in dirs and not path.is_symlink():
+                continue
+            relative_path = (rel_root / name).as_posix()
+            if relative_path != MANIFEST_FILE:
+                hashes[relative_path] = hash_file(path)
+    return hashes
+
+def hash_dependencies(packages: Any) -> str:
+    """Get a stable hash for a dependency set (a package list or a kind-to-list mapping)"""
+    if isinstance(packages, Mapping):
+        identity = {kind: sorted(set(names)) for kind, names in packages.items()}
+    else:
+        identity = sorted(set(packages))
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+def load_project_manifest(project_path: Path) -> Optional[Dict[str, Any]]:
+    """Load the manifest of a generated project"""
+    try:
+        with open(project_path / MANIFEST_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_project_manifest(project_path: Path, template: str, files: Dict[str, str],
+                           dependencies: Dict[str, str], created: Optional[float] = None) -> None:
+    """Write the manifest of a generated project"""
+    manifest = {
+        'template': template,
+        'created': created or time.time(),
+        'updated': time.time(),
+        'dependencies': dependencies,
+        'files': dict(sorted(files.items()))
+    }
+    tmp_file = project_path / f"{MANIFEST_FILE}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    tmp_file.replace(project_path / MANIFEST_FILE)
@@ -0,0 +1,98 @@
+"""
+Dependency-graph task scheduling
+"""
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterable, Optional
+
+from .tracing import Tracer
+
+class Task:
+    """A unit of work with declared dependencies"""
+    
+    def __init__(self, name: str, func: Callable[[], None], deps: Iterable[str] = (), description: str = ""):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.description = description or name
+
+class TaskScheduler:
+    """Run tasks as soon as their dependencies finish, on a bounded worker pool"""
+    
+    def __init__(self, max_workers: int = 4, on_start: Optional[Callable[[Task], None]] = None,
+                 on_interrupt: Optional[Callable[[], None]] = None, tracer: Optional[Tracer] = None):
+        self.max_workers = max(1, max_workers)
+        self.on_start = on_start
+        self.on_interrupt = on_interrupt
+        self.tracer = tracer or Tracer()
+        self.tasks: Dict[str, Task] = {}
+    
+    def add(self, name: str, func: Callable[[], None], deps: Iterable[str] = (), description: str = "") -> Task:
+        """Register a task"""
+        if name in self.tasks:
+            raise ValueError(f"Task '{name}' already registered")
+        task = Task(name, func, deps, description)
+        self.tasks[name] = task
+        return task
+    
+    def run(self) -> None:
+        """Run all tasks, re-raising the first failure once the tasks still running are stopped"""
+        self._check_graph()
+        
+        remaining = {name: set(task.deps) for name, task in self.tasks.items()}
+        running = {}
+        error: Optional[BaseException] = None
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="task") as pool:
+            try:
+                while remaining or running:
+                    if error is None:
+                        for name in [n for n, deps in remaining.items() if not deps]:
+                            del remaining[name]
+                            running[pool.submit(self._run_task, self.tasks[name])] = name
+                    
+                    if not running:
+                        break
+                    
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        if future.exception() is not None:
+                            if error is None and running and self.on_interrupt:
+                                # Their work is rolled back anyway: stop running commands now
+                                self.on_interrupt()
+                            error = error or future.exception()
+                            continue
+                        for deps in remaining.values():
+                            deps.discard(name)
+            except BaseException:
+                # KeyboardInterrupt: stop running tasks before the pool waits on them
+                if self.on_interrupt:
+                    self.on_interrupt()
+                raise
+        
+        if error is not None:
+            raise error
+    
+    def _run_task(self, task: Task) -> None:
+        """Run a single task"""
+        with self.tracer.span(task.name, "task", description=task.description):
+            if self.on_start:
+                self.on_start(task)
+            task.func()
+    
+    def _check_graph(self) -> None:
+        """Reject unknown dependencies and cycles"""
+        for task in self.tasks.values():
+            for dep in task.deps:
+                if dep not in self.tasks:
+                    raise ValueError(f"Task '{task.name}' depends on unknown task '{dep}'")
+        
+        remaining = {name: set(task.deps) for name, task in self.tasks.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Task graph has a cycle: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
@@ -0,0 +1,122 @@
+"""
+Span-based timing instrumentation
+"""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import json
+import os
+import threading
+import time
+
+class Span:
+    """A timed region of work"""
+    
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.thread_id = threading.get_ident()
+        self.thread_name = threading.current_thread().name
+        self.start_ns = time.perf_counter_ns()
+        self.cpu_start = time.thread_time()
+        self.duration_ns = 0
+        self.cpu_time = 0.0
+        self.bytes_written = 0
+    
+    @property
+    def wall_time(self) -> float:
+        """Wall time in seconds"""
+        return self.duration_ns / 1e9
+    
+    def finish(self) -> None:
+        """Stop the clocks"""
+        self.duration_ns = time.perf_counter_ns() - self.start_ns
+        self.cpu_time = time.thread_time() - self.cpu_start
+
+class Tracer:
+    """Record nested spans per thread and export them as Chrome trace events"""
+    
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+    
+    @contextmanager
+    def span(self, name: str, category: str = "step", **args) -> Iterator[Span]:
+        """Time a region; spans opened inside it on the same thread nest under it"""
+        stack = self._stack()
+        span = Span(name, category, args)
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.finish()
+            stack.pop()
+            if stack:
+                stack[-1].bytes_written += span.bytes_written
+            with self._lock:
+                self.spans.append(span)
+    
+    def record(self, span: Span) -> None:
+        """Finish and keep a span timed outside span(), e.g. across a coroutine's awaits"""
+        span.finish()
+        with self._lock:
+            self.spans.append(span)
+    
+    def add_bytes(self, count: int) -> None:
+        """Attribute bytes written to the innermost open span"""
+        stack = self._stack()
+        if stack:
+            stack[-1].bytes_written += count
+    
+    def current(self) -> Optional[Span]:
+        """Get the innermost open span on this thread"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+    
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Build a Chrome trace-event document"""
+        pid = os.getpid()
+        events = []
+        threads = {}
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+        
+        for span in spans:
+            threads.setdefault(span.thread_id, span.thread_name)
+            events.append({
+                'name': span.name,
+                'cat': span.category,
+                'ph': 'X',
+                'ts': (span.start_ns - self._origin_ns) / 1000,
+                'dur': span.duration_ns / 1000,
+                'pid': pid,
+                'tid': span.thread_id,
+                'args': dict(span.args, cpu_ms=round(span.cpu_time * 1000, 3),
+                             bytes_written=span.bytes_written)
+            })
+        
+        for thread_id, thread_name in threads.items():
+            events.append({
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': pid,
+                'tid': thread_id,
+                'args': {'name': thread_name}
+            })
+        
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+    
+    def export_chrome_trace(self, path: Path) -> None:
+        """Write spans in Chrome trace-event format"""
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+    
+    def _stack(self) -> List[Span]:
+        """Get the open span stack for the current thread"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
@@ -34,7 +34,7 @@ setup(
     install_requires=requirements,
     entry_points={
         "console_scripts": [
-            "create-project=project_creator.cli:create_project",
+            "create-project=project_creator.cli:cli",
         ],
     },
 )
@@ -0,0 +1,32 @@
+"""
+Shared fixtures: an isolated configuration with stand-in tools
+"""
+from pathlib import Path
+import json
+
+import pytest
+
+from benchmarks.stand_ins import create_stand_ins
+from project_creator.config.simple_settings import SimpleConfig
+from project_creator.utils.validation import ProjectValidator
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch) -> Path:
+    """A scratch directory projects may be created in, although it lies under /tmp"""
+    monkeypatch.setattr(ProjectValidator, 'validate_project_path', staticmethod(lambda path, force=False: None))
+    return tmp_path
+
+@pytest.fixture
+def make_config(workdir):
+    """Build a configuration in the work directory, with stand-ins for every tool"""
+    def make(**settings) -> SimpleConfig:
+        config_path = workdir / "config.json"
+        config_path.write_text(json.dumps({
+            'default_project_path': str(workdir / "projects"),
+            'cache_dir': str(workdir / "cache"),
+            'logging_level': 'WARNING',
+            'tool_paths': create_stand_ins(workdir / "bin"),
+            **settings
+        }))
+        return SimpleConfig(config_path)
+    return make
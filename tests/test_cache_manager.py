@@ -0,0 +1,23 @@
+"""
+Cache budgets and eviction
+"""
+import subprocess
+
+import pytest
+from click.testing import CliRunner
+
+from project_creator.cache.shared_pip import SharedPip
+from project_creator.cli import cli
+
+def test_prune_all_keeps_shared_pip_of_existing_venvs(workdir, make_config):
+    config = make_config()
+    shared_pip = SharedPip(workdir / "cache")
+    if not shared_pip.create_venv(workdir / "venv"):
+        pytest.skip("interpreter cannot create in-process venvs")
+    
+    result = CliRunner().invoke(cli, ['cache', 'prune', '--all', '--config', str(config.config_path)])
+    assert result.exit_code == 0, result.output
+    
+    imported = subprocess.run([str(workdir / "venv" / "bin" / "python"), "-c", "import pip"],
+                              capture_output=True, text=True)
+    assert imported.returncode == 0, imported.stderr
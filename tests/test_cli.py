@@ -0,0 +1,13 @@
+"""
+Command-line routing
+"""
+from click.testing import CliRunner
+
+from project_creator.cli import cli
+
+def test_explicit_create_accepts_subcommand_names(workdir, make_config):
+    config = make_config()
+    result = CliRunner().invoke(cli, ['create', 'batch', '--no-deps', '--no-git',
+                                      '--config', str(config.config_path)])
+    assert result.exit_code == 0, result.output
+    assert (workdir / "projects" / "batch" / "README.md").is_file()
@@ -0,0 +1,63 @@
+"""
+Daemon job handling
+"""
+from pathlib import Path
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+from project_creator.daemon import DaemonServer
+
+# Streams output forever and ignores SIGTERM, so only a kill stops it
+NOISY_PIP = '''#!{python}
+import signal, sys, time
+from pathlib import Path
+signal.signal(signal.SIGTERM, signal.SIG_IGN)
+Path({pid_file!r}).write_text(str(__import__("os").getpid()))
+while True:
+    print("Collecting something", flush=True)
+    time.sleep(0.01)
+'''
+
+def _wait_for(condition, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return condition()
+
+def _running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+def test_client_disconnect_during_output_cancels_job(workdir, make_config):
+    config = make_config(python_installer='pip', venv_cache_enabled=False, daemon_pool_size=0)
+    pid_file = workdir / "pip.pid"
+    pip = Path(config.get('tool_paths')['pip'])
+    pip.write_text(NOISY_PIP.format(python=sys.executable, pid_file=str(pid_file)))
+    
+    server = DaemonServer(config, workdir / "daemon.sock")
+    threading.Thread(target=server.serve, daemon=True).start()
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.settimeout(30)
+        client.connect(str(server.socket_path))
+        client.sendall(json.dumps({'command': 'create', 'name': 'demo', 'project_type': 'python',
+                                   'init_git': False}).encode() + b"\n")
+        with client.makefile('rb') as stream:
+            for line in stream:
+                if json.loads(line)['event'] == 'output':
+                    break
+        client.close()
+        
+        assert _wait_for(lambda: server.active_jobs == 0, 15), "job still counted as running"
+        assert not _running(int(pid_file.read_text())), "pip was not killed"
+    finally:
+        server.shutdown()
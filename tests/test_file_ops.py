@@ -0,0 +1,84 @@
+"""
+Staged project writes
+"""
+import pytest
+
+from project_creator.utils.exceptions import ValidationError
+from project_creator.utils.file_ops import FileManager
+
+def _staging_dirs(path):
+    return [p.name for p in path.parent.iterdir() if p.name.startswith(f".{path.name}.")]
+
+def test_plan_is_written_in_one_pass(tmp_path):
+    path = tmp_path / "demo"
+    manager = FileManager(path)
+    manager.add_tree(lambda root: (root / "tree.txt").write_text("from tree"))
+    manager.add_stream([("pkg/streamed.py", [b"a = ", b"1\n"])])
+    manager.add_file("README.md", "# demo\n")
+    manager.add_file("tree.txt", "planned")
+    assert not path.exists()
+    
+    manager.write_plan()
+    manager.finalize()
+    
+    assert (path / "README.md").read_text() == "# demo\n"
+    assert (path / "pkg" / "streamed.py").read_text() == "a = 1\n"
+    assert (path / "tree.txt").read_text() == "planned"
+    assert manager.written_files == {'README.md': b"# demo\n", 'pkg/streamed.py': b"a = 1\n",
+                                     'tree.txt': b"planned"}
+    assert _staging_dirs(path) == []
+
+def test_rollback_restores_the_replaced_directory(tmp_path):
+    path = tmp_path / "demo"
+    path.mkdir()
+    (path / "old.txt").write_text("keep me")
+    manager = FileManager(path)
+    manager.add_file("new.txt", "new")
+    
+    manager.write_plan()
+    assert not (path / "old.txt").exists()
+    manager.rollback()
+    
+    assert (path / "old.txt").read_text() == "keep me"
+    assert not (path / "new.txt").exists()
+    assert _staging_dirs(path) == []
+
+def test_finalize_drops_the_replaced_directory(tmp_path):
+    path = tmp_path / "demo"
+    path.mkdir()
+    (path / "old.txt").write_text("replaced")
+    manager = FileManager(path)
+    manager.add_file("new.txt", "new")
+    
+    manager.write_plan()
+    manager.finalize()
+    manager.rollback()
+    
+    assert sorted(p.name for p in path.iterdir()) == ["new.txt"]
+    assert _staging_dirs(path) == []
+
+@pytest.mark.parametrize("relative_path", ["../outside.txt", "/etc/outside.txt", "pkg/../../outside.txt"])
+def test_streamed_paths_cannot_escape_the_project(tmp_path, relative_path):
+    path = tmp_path / "demo"
+    manager = FileManager(path)
+    manager.add_stream([(relative_path, [b"x"])])
+    
+    with pytest.raises(ValidationError):
+        manager.write_plan()
+    assert not path.exists()
+    assert not (tmp_path / "outside.txt").exists()
+    assert _staging_dirs(path) == []
+
+def test_failed_tree_writer_leaves_nothing_behind(tmp_path):
+    path = tmp_path / "demo"
+    manager = FileManager(path)
+    
+    def broken(root):
+        (root / "partial.txt").write_text("partial")
+        raise RuntimeError("template failed")
+    manager.add_tree(broken)
+    
+    with pytest.raises(RuntimeError):
+        manager.write_plan()
+    assert not path.exists()
+    assert _staging_dirs(path) == []
@@ -0,0 +1,77 @@
+"""
+In-process initial commits compared with git itself
+"""
+from pathlib import Path
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from project_creator.utils.exceptions import UnsupportedRepositoryError
+from project_creator.utils.git_writer import NativeGitWriter
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+@pytest.fixture
+def git_home(tmp_path, monkeypatch) -> Path:
+    """An isolated HOME with a git identity and no system configuration"""
+    home = tmp_path / "home"
+    home.mkdir()
+    (home / ".gitconfig").write_text("[user]\n\tname = Test User\n\temail = test@example.com\n")
+    monkeypatch.setenv('HOME', str(home))
+    monkeypatch.setenv('XDG_CONFIG_HOME', str(home / ".config"))
+    monkeypatch.setenv('GIT_CONFIG_NOSYSTEM', '1')
+    for name in ('GIT_CONFIG_GLOBAL', 'GIT_CONFIG_SYSTEM', 'GIT_AUTHOR_NAME', 'GIT_AUTHOR_EMAIL',
+                 'GIT_COMMITTER_NAME', 'GIT_COMMITTER_EMAIL', 'GIT_DIR'):
+        monkeypatch.delenv(name, raising=False)
+    return home
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout.strip()
+
+def _project(path: Path) -> Path:
+    (path / "src" / "pkg").mkdir(parents=True)
+    (path / "README.md").write_text("# Demo\n")
+    (path / "src" / "pkg" / "__init__.py").write_text("")
+    (path / "src" / "pkg" / "main.py").write_text("print('hi')\n")
+    (path / "run.sh").write_text("#!/bin/sh\necho run\n")
+    (path / "run.sh").chmod(0o755)
+    os.symlink("src/pkg/main.py", path / "main.py")
+    (path / "debug.log").write_text("ignored\n")
+    (path / "build").mkdir()
+    (path / "build" / "out.txt").write_text("ignored\n")
+    (path / ".gitignore").write_text("*.log\nbuild/\n")
+    return path
+
+def test_native_commit_matches_git(tmp_path, git_home):
+    native = _project(tmp_path / "native")
+    reference = _project(tmp_path / "reference")
+    known = {"README.md": b"# Demo\n"}
+    
+    commit = NativeGitWriter(native).create_initial_commit("Initial commit", known)
+    _git(reference, "init", "--quiet")
+    _git(reference, "add", ".")
+    
+    assert _git(native, "rev-parse", "HEAD") == commit
+    assert _git(native, "rev-parse", "HEAD^{tree}") == _git(reference, "write-tree")
+    assert _git(native, "status", "--porcelain") == ""
+    _git(native, "fsck", "--strict", "--no-dangling")
+
+def test_system_config_sets_the_default_branch(tmp_path, git_home, monkeypatch):
+    system = tmp_path / "gitconfig"
+    system.write_text("[init]\n\tdefaultBranch = trunk\n")
+    monkeypatch.delenv('GIT_CONFIG_NOSYSTEM')
+    monkeypatch.setenv('GIT_CONFIG_SYSTEM', str(system))
+    repo = _project(tmp_path / "repo")
+    
+    NativeGitWriter(repo).create_initial_commit()
+    assert _git(repo, "symbolic-ref", "HEAD") == "refs/heads/trunk"
+
+def test_nested_gitignore_falls_back_to_git(tmp_path, git_home):
+    repo = _project(tmp_path / "repo")
+    (repo / "src" / ".gitignore").write_text("keep.txt\n")
+    
+    with pytest.raises(UnsupportedRepositoryError):
+        NativeGitWriter(repo).create_initial_commit()
+    assert not (repo / ".git").exists()
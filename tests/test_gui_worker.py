@@ -0,0 +1,24 @@
+"""
+Background worker behind the GUIs
+"""
+import pytest
+
+from project_creator import gui_worker
+from project_creator.gui_worker import ProjectCreationWorker
+
+def test_constructing_a_worker_does_no_blocking_work(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("ran on the Tk thread")
+    monkeypatch.setattr(gui_worker.DaemonClient, 'available', fail)
+    
+    ProjectCreationWorker(config=None, name="demo")
+
+def test_cancel_before_start_reports_cancelled(workdir, make_config):
+    worker = ProjectCreationWorker(make_config(), use_daemon=False, name="demo", project_type="python",
+                                   path=workdir / "projects" / "demo", install_deps=False, init_git=False)
+    worker.cancel()
+    worker.start()
+    worker._thread.join(30)
+    
+    assert worker.events.get_nowait() == ('cancelled',)
+    assert not (workdir / "projects" / "demo").exists()
@@ -0,0 +1,33 @@
+"""
+Installer backend selection
+"""
+from pathlib import Path
+import stat
+import sys
+
+import pytest
+
+from project_creator.utils.exceptions import ConfigurationError
+from project_creator.utils.installers import YarnInstaller, select_node_installer
+from project_creator.utils.process import CommandRunner
+
+def _yarn(bin_dir: Path, version: str) -> str:
+    bin_dir.mkdir()
+    yarn = bin_dir / "yarn"
+    yarn.write_text(f"#!{sys.executable}\nprint({version!r})\n")
+    yarn.chmod(yarn.stat().st_mode | stat.S_IXUSR)
+    return str(yarn)
+
+def test_classic_yarn_is_selected(tmp_path):
+    runner = CommandRunner(tools={'yarn': _yarn(tmp_path / "bin", "1.22.22")})
+    assert isinstance(select_node_installer('yarn', runner), YarnInstaller)
+
+def test_yarn_berry_is_refused(tmp_path):
+    runner = CommandRunner(tools={'yarn': _yarn(tmp_path / "bin", "4.1.0")})
+    with pytest.raises(ConfigurationError):
+        select_node_installer('yarn', runner)
+
+def test_auto_skips_yarn_berry(tmp_path, monkeypatch):
+    monkeypatch.setenv('PATH', str(tmp_path / "empty"))
+    runner = CommandRunner(tools={'yarn': _yarn(tmp_path / "bin", "4.1.0")})
+    assert select_node_installer('auto', runner).name == "npm"
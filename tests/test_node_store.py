@@ -0,0 +1,39 @@
+"""
+Content-addressed node_modules store
+"""
+import json
+import os
+
+from project_creator.cache.node_store import NodeModulesStore
+from project_creator.utils.file_ops import DependencyManager
+
+DEPENDENCIES = {'packages': ['react'], 'dev_packages': []}
+
+def _installed_project(path):
+    (path / "node_modules" / "react").mkdir(parents=True)
+    (path / "node_modules" / "react" / "index.js").write_text("module.exports = {}\n")
+    (path / "package-lock.json").write_text(json.dumps({'name': path.name, 'lockfileVersion': 3}))
+    return path
+
+def test_materialized_lockfile_is_not_shared_with_the_store(tmp_path):
+    store = NodeModulesStore(tmp_path / "cache")
+    alpha = _installed_project(tmp_path / "alpha")
+    store.store(DEPENDENCIES, alpha)
+    
+    beta = tmp_path / "beta"
+    beta.mkdir()
+    assert store.materialize(DEPENDENCIES, beta)
+    assert (beta / "node_modules" / "react" / "index.js").samefile(alpha / "node_modules" / "react" / "index.js")
+    assert not (beta / "package-lock.json").samefile(alpha / "package-lock.json")
+    
+    DependencyManager(beta)._write_package_lock({'name': 'beta', 'lockfileVersion': 3})
+    assert json.loads((alpha / "package-lock.json").read_text())['name'] == 'alpha'
+    assert json.loads((beta / "package-lock.json").read_text())['name'] == 'beta'
+
+def test_package_lock_write_replaces_a_hardlinked_file(tmp_path):
+    shared = tmp_path / "shared.json"
+    shared.write_text('{"name": "alpha"}')
+    os.link(shared, tmp_path / "package-lock.json")
+    
+    DependencyManager(tmp_path)._write_package_lock({'name': 'alpha', 'lockfileVersion': 3})
+    assert json.loads(shared.read_text()) == {'name': 'alpha'}
@@ -0,0 +1,45 @@
+"""
+Cached npm lockfiles
+"""
+from project_creator.cache.npm_locks import NpmLockCache
+
+DEPENDENCIES = {'packages': ['react'], 'dev_packages': ['vite']}
+
+def _lock():
+    return {
+        'lockfileVersion': 3,
+        'packages': {
+            '': {'dependencies': {'react': '^18.0.0'}, 'devDependencies': {'vite': 'latest'}},
+            'node_modules/react': {'version': '18.3.1'},
+            'node_modules/vite': {'version': '5.4.0'}
+        }
+    }
+
+def test_recorded_lock_pins_versions(tmp_path):
+    cache = NpmLockCache(tmp_path)
+    assert cache.lookup(DEPENDENCIES) is None
+    assert cache.pinned(DEPENDENCIES) == DEPENDENCIES
+    
+    cache.record(DEPENDENCIES, _lock())
+    
+    entry = cache.lookup({'dev_packages': ['vite'], 'packages': ['react', 'react']})
+    assert entry['versions'] == {'react': '18.3.1', 'vite': '5.4.0'}
+    assert entry['lock']['packages']['']['devDependencies'] == {'vite': '5.4.0'}
+    assert cache.pinned(DEPENDENCIES) == {'packages': ['react@18.3.1'], 'dev_packages': ['vite@5.4.0']}
+
+def test_lock_missing_a_direct_dependency_is_not_recorded(tmp_path):
+    cache = NpmLockCache(tmp_path)
+    lock = _lock()
+    del lock['packages']['node_modules/vite']
+    
+    assert cache.record(DEPENDENCIES, lock) is None
+    assert cache.lookup(DEPENDENCIES) is None
+
+def test_damaged_entry_is_discarded(tmp_path):
+    cache = NpmLockCache(tmp_path)
+    cache.record(DEPENDENCIES, _lock())
+    entry_file = cache.root / f"{cache.get_key(DEPENDENCIES)}.json"
+    entry_file.write_text('{"versions": ')
+    
+    assert cache.lookup(DEPENDENCIES) is None
+    assert not entry_file.exists()
@@ -0,0 +1,67 @@
+"""
+External command execution
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from project_creator.utils.exceptions import OperationCancelledError
+from project_creator.utils.process import CommandRunner
+
+def _run_heavy(slots_dir: str) -> tuple:
+    runner = CommandRunner(max_heavy=1, slots_dir=Path(slots_dir))
+    start = time.time()
+    runner.run(["sleep", "0.3"], cwd=Path("."), heavy=True)
+    return start, time.time()
+
+def test_heavy_cap_holds_across_processes(tmp_path):
+    with ProcessPoolExecutor(3) as pool:
+        spans = list(pool.map(_run_heavy, [str(tmp_path)] * 3))
+    
+    # One slot: the three sleeps run one after another
+    assert max(end for _, end in spans) - min(start for start, _ in spans) >= 0.85
+
+def test_cancel_from_output_callback_does_not_block():
+    runner = None
+    
+    def cancel_on_output(line: str) -> None:
+        runner.cancel(timeout=0.5)
+    
+    runner = CommandRunner(output_callback=cancel_on_output)
+    start = time.monotonic()
+    with pytest.raises(OperationCancelledError):
+        runner.run(["sh", "-c", "trap '' TERM; echo started; sleep 30"], cwd=Path("."))
+    assert time.monotonic() - start < 5
+
+def test_commands_are_killed_when_the_interpreter_exits(tmp_path):
+    pid_file = tmp_path / "child.pid"
+    script = f"""
+import sys, threading, time
+from pathlib import Path
+from project_creator.utils.process import CommandRunner
+runner = CommandRunner()
+threading.Thread(target=runner.run, args=(["sh", "-c", "echo $$ > {pid_file}; exec sleep 30"], Path(".")),
+                 daemon=True).start()
+while not Path("{pid_file}").exists() or not Path("{pid_file}").read_text().strip():
+    time.sleep(0.02)
+sys.exit(0)
+"""
+    subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).parent.parent, check=True, timeout=20)
+    
+    pid = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and _alive(pid):
+        time.sleep(0.05)
+    assert not _alive(pid)
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
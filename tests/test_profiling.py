@@ -0,0 +1,23 @@
+"""
+In-process profiling
+"""
+import time
+
+from project_creator.utils.profiling import Profiler
+from project_creator.utils.scheduler import TaskScheduler
+
+def _slow_task():
+    time.sleep(0.05)
+
+def test_profiler_covers_scheduler_threads():
+    scheduler = TaskScheduler(max_workers=2)
+    scheduler.add("first", _slow_task)
+    scheduler.add("second", _slow_task)
+    scheduler.add("third", _slow_task, deps=["first", "second"])
+    
+    with Profiler() as profiler:
+        scheduler.run()
+    
+    calls = {function: stats[1] for (_, _, function), stats in profiler._stats.stats.items()}
+    assert calls.get('_slow_task') == 3
+    assert "Hottest Python functions" in profiler.report()
@@ -0,0 +1,57 @@
+"""
+Cached hash-pinned Python locks
+"""
+import hashlib
+
+from project_creator.cache.python_locks import PythonLockCache
+
+REQUIREMENTS = ['requests', 'pytest']
+
+def _item(name, version, **download_info):
+    return {'metadata': {'name': name, 'version': version}, 'download_info': download_info}
+
+def test_report_is_recorded_as_a_hash_pinned_lock(tmp_path):
+    wheel = tmp_path / "pytest-8.0.0-py3-none-any.whl"
+    wheel.write_bytes(b"wheel")
+    report = {'install': [
+        _item('requests', '2.32.0', archive_info={'hashes': {'sha256': 'abc'}}),
+        _item('pytest', '8.0.0', url=wheel.as_uri(), archive_info={})
+    ]}
+    cache = PythonLockCache(tmp_path)
+    
+    content = cache.record_report(REQUIREMENTS, report)
+    
+    assert content.splitlines() == [
+        "# Resolved by create-project for: pytest requests",
+        "pytest==8.0.0 \\",
+        f"    --hash=sha256:{hashlib.sha256(b'wheel').hexdigest()}",
+        "requests==2.32.0 \\",
+        "    --hash=sha256:abc"
+    ]
+    assert cache.lookup(['pytest', 'requests']) == content
+
+def test_unpinnable_report_is_not_recorded(tmp_path):
+    cache = PythonLockCache(tmp_path)
+    report = {'install': [_item('local', '0.1', url='file:///src/local', dir_info={})]}
+    
+    assert cache.record_report(REQUIREMENTS, report) is None
+    assert cache.lookup(REQUIREMENTS) is None
+
+def test_lock_matches_only_its_requirement_set(tmp_path):
+    cache = PythonLockCache(tmp_path)
+    content = cache.record_report(REQUIREMENTS, {'install': []})
+    
+    assert cache.matches(content, ['pytest', 'requests', 'pytest'])
+    assert not cache.matches(content, ['pytest'])
+    assert not cache.matches(content, REQUIREMENTS + ['django'])
+
+def test_foreign_and_discarded_locks_are_not_returned(tmp_path):
+    cache = PythonLockCache(tmp_path)
+    cache.record_report(REQUIREMENTS, {'install': []})
+    cache.discard(REQUIREMENTS)
+    assert cache.lookup(REQUIREMENTS) is None
+    
+    lock_file = cache.root / f"{cache.get_key(REQUIREMENTS)}.txt"
+    lock_file.write_text("requests==2.32.0\n")
+    assert cache.lookup(REQUIREMENTS) is None
+    assert not lock_file.exists()
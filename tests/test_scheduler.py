@@ -0,0 +1,70 @@
+"""
+Dependency-graph task scheduling
+"""
+from pathlib import Path
+import threading
+import time
+
+import pytest
+
+from project_creator.utils.process import CommandRunner
+from project_creator.utils.scheduler import TaskScheduler
+
+def test_tasks_start_after_their_dependencies():
+    order = []
+    lock = threading.Lock()
+    
+    def record(name):
+        def run():
+            with lock:
+                order.append(name)
+        return run
+    
+    scheduler = TaskScheduler(max_workers=4)
+    scheduler.add("structure", record("structure"), deps=["ai_config", "docs"])
+    scheduler.add("ai_config", record("ai_config"), deps=["validate"])
+    scheduler.add("docs", record("docs"), deps=["validate"])
+    scheduler.add("validate", record("validate"))
+    scheduler.run()
+    
+    assert order[0] == "validate"
+    assert order[-1] == "structure"
+    assert set(order[1:3]) == {"ai_config", "docs"}
+
+def test_independent_tasks_run_in_parallel():
+    barrier = threading.Barrier(2, timeout=5)
+    scheduler = TaskScheduler(max_workers=2)
+    scheduler.add("venv", barrier.wait)
+    scheduler.add("node", barrier.wait)
+    scheduler.run()
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    scheduler = TaskScheduler()
+    scheduler.add("a", lambda: None, deps=["b"])
+    scheduler.add("b", lambda: None, deps=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        scheduler.run()
+    
+    scheduler = TaskScheduler()
+    scheduler.add("a", lambda: None, deps=["missing"])
+    with pytest.raises(ValueError, match="unknown"):
+        scheduler.run()
+
+def test_first_failure_stops_running_commands():
+    runner = CommandRunner()
+    ran = []
+    
+    def fail():
+        time.sleep(0.2)
+        raise RuntimeError("template failed")
+    
+    scheduler = TaskScheduler(max_workers=2, on_interrupt=runner.cancel)
+    scheduler.add("install", lambda: runner.run(["sleep", "30"], cwd=Path("."), heavy=True))
+    scheduler.add("template", fail)
+    scheduler.add("after", lambda: ran.append("after"), deps=["template"])
+    
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="template failed"):
+        scheduler.run()
+    assert time.monotonic() - start < 5
+    assert ran == []
@@ -0,0 +1,60 @@
+"""
+Syncing existing projects with their template
+"""
+import pytest
+
+from project_creator.main import ProjectCreator
+from project_creator.utils.exceptions import ValidationError
+
+def _create(config, path, project_type='python'):
+    creator = ProjectCreator(config, output_callback=lambda line: None)
+    creator.create_project(name=path.name, project_type=project_type, path=path, init_git=False)
+    return creator
+
+def test_sync_to_another_template_resolves_its_requirements(workdir, make_config):
+    config = make_config(python_installer='pip')
+    path = workdir / "projects" / "service"
+    _create(config, path)
+    assert "pytest" in (path / "requirements.lock").read_text()
+    
+    report = ProjectCreator(config, output_callback=lambda line: None).sync_project(path, 'django')
+    
+    lock = (path / "requirements.lock").read_text()
+    assert "django" in lock.lower()
+    assert lock.splitlines()[0].endswith(" ".join(sorted((path / "requirements.txt").read_text().split())))
+    assert 'pip' in report['installed']
+
+def test_resync_of_an_unchanged_project_rewrites_nothing(workdir, make_config):
+    config = make_config()
+    path = workdir / "projects" / "service"
+    _create(config, path)
+    
+    report = ProjectCreator(config, output_callback=lambda line: None).sync_project(path)
+    
+    assert report['added'] == report['updated'] == report['removed'] == report['conflicts'] == []
+    assert report['unchanged'] > 0
+    assert report['installed'] == [] and report['skipped'] == ['pip']
+
+def test_local_edits_are_kept_unless_forced(workdir, make_config):
+    config = make_config()
+    path = workdir / "projects" / "service"
+    _create(config, path)
+    original = (path / "README.md").read_text()
+    (path / "README.md").write_text("# my notes\n")
+    
+    report = ProjectCreator(config, output_callback=lambda line: None).sync_project(path, 'django',
+                                                                                    install_deps=False)
+    assert 'README.md' in report['conflicts']
+    assert (path / "README.md").read_text() == "# my notes\n"
+    
+    report = ProjectCreator(config, output_callback=lambda line: None).sync_project(path, 'django',
+                                                                                    install_deps=False, force=True)
+    assert 'README.md' in report['updated']
+    assert (path / "README.md").read_text() not in ("# my notes\n", original)
+
+def test_project_without_manifest_cannot_be_synced(workdir, make_config):
+    path = workdir / "projects" / "plain"
+    path.mkdir(parents=True)
+    
+    with pytest.raises(ValidationError):
+        ProjectCreator(make_config(), output_callback=lambda line: None).sync_project(path)
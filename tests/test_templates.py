@@ -0,0 +1,36 @@
+"""
+Directory, archive and git templates
+"""
+import os
+
+import pytest
+
+from project_creator.templates.filesystem import DirectoryTemplate, FilesystemTemplate
+from project_creator.utils.exceptions import InvalidTemplateError
+
+def _template_dir(path):
+    (path / "src").mkdir(parents=True)
+    (path / "src" / "app.py").write_text("print('$project_name')\n")
+    (path / "README.md.tmpl").write_text("# $project_name\n")
+    return path
+
+def test_directory_template_renders_and_keeps_internal_links(tmp_path):
+    source = _template_dir(tmp_path / "template")
+    os.symlink("src/app.py", source / "app.py")
+    target = tmp_path / "out"
+    
+    DirectoryTemplate("demo", source).materialize(target, {'project_name': "demo"})
+    assert (target / "README.md").read_text() == "# demo\n"
+    assert os.readlink(target / "app.py") == "src/app.py"
+
+@pytest.mark.parametrize("link", ["/etc", "../..", "src/../../outside"])
+def test_directory_template_rejects_escaping_links(tmp_path, link):
+    source = _template_dir(tmp_path / "template")
+    os.symlink(link, source / "link")
+    
+    with pytest.raises(InvalidTemplateError):
+        DirectoryTemplate("demo", source).materialize(tmp_path / "out", {})
+
+def test_filesystem_template_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        FilesystemTemplate("demo", tmp_path)